@@ -1,5 +1,5 @@
 # create by lesomras on 2025-12-18
-from .dict_checking import is_value, list_of, matching
+from .dict_checking import is_value, list_of, matching, compile_pattern, collect, Violation
 from .exceptions import CommandException, UnsupportedArgument, MissingArgument, MalformedArgument
 from .string import tokenize_template
 
@@ -7,6 +7,9 @@ __all__ = [
     "is_value",
     "list_of",
     "matching",
+    "compile_pattern",
+    "collect",
+    "Violation",
     "CommandException",
     "UnsupportedArgument",
     "MalformedArgument",
@@ -2,6 +2,7 @@
 
 from .exceptions import MissingArgument, UnsupportedArgument, MalformedArgument
 from collections.abc import Callable
+from typing import NamedTuple, Optional, Union
 
 def is_value(d: dict, key: str, data_type: type) -> bool:
     """检查一个字典中是否有指定的键, 且该键指向的类型为data_type"""
@@ -125,4 +126,307 @@ def _type_checking(pat_value, data_value, key, stack) -> None:
         return
     # 错误情况
     else:
-        raise MissingArgument(f"Invalid pattern for parameter '{key}'")
\ No newline at end of file
+        raise MissingArgument(f"Invalid pattern for parameter '{key}'")
+
+# ========== 预编译的模板 ==========
+
+# compile_pattern 的缓存: 冻结后的模板 -> 校验函数
+_COMPILED: dict = {}
+_COMPILED_SIZE = 256
+
+def compile_pattern(pattern: dict) -> Callable[[dict], None]:
+    """
+    将字典模板pattern预编译为校验函数, validate(dictionary) 等价于 matching(dictionary, pattern)
+
+    编译时即确定每个键的检查方式, 校验时不再逐项分派模板;
+    抛出的异常 (类型、信息与先后顺序) 与matching完全一致. 结构相同的模板共享同一个编译结果
+    """
+    if not isinstance(pattern, dict):
+        raise TypeError("Both arguments must be dictionaries")
+    try:
+        key = _freeze(pattern)
+    except TypeError:
+        # 模板中含有不可哈希的值, 不缓存
+        return _compile_root(pattern)
+
+    if (validate := _COMPILED.get(key)) is None:
+        if len(_COMPILED) >= _COMPILED_SIZE:
+            del _COMPILED[next(iter(_COMPILED))]
+        validate = _COMPILED[key] = _compile_root(pattern)
+    return validate
+
+def _freeze(pattern):
+    if isinstance(pattern, dict):
+        return (dict, tuple((i, _freeze(j)) for i, j in pattern.items()))
+    if isinstance(pattern, (list, tuple)):
+        return (type(pattern), tuple(_freeze(i) for i in pattern))
+    hash(pattern)
+    return pattern
+
+_MISSING = object()
+
+def _compile_root(pattern: dict) -> Callable[[dict], None]:
+    return _compile_dict(pattern, root = True)
+
+def _compile_dict(pattern: dict, root: bool = False) -> Callable[[dict], None]:
+    """
+    编译一层字典模板
+
+    matching 用栈延迟检查嵌套字典: 一层检查完 (包括多余键) 之后才按后进先出的顺序检查其中的子字典,
+    这里等价地在本层检查完后倒序递归检查收集到的子字典
+    """
+    # (键, 直接检查的类型, 错误信息, 其他检查函数)
+    checks: list[tuple] = []
+    nested = False
+    for key, value in pattern.items():
+        if value is str:
+            checks.append((key, str, f"Parameter '{key}' must be a string", None))
+        elif value == "number":
+            checks.append((key, (int, float), f"Parameter '{key}' must be a number (int or float)", None))
+        elif value is int:
+            checks.append((key, int, f"Parameter '{key}' must be an integer", None))
+        elif value is float:
+            checks.append((key, float, f"Parameter '{key}' must be a float", None))
+        else:
+            checks.append((key, None, None, _compile_value(value)))
+            nested = nested or _may_nest(value)
+    keys = frozenset(pattern)
+    size = len(pattern)
+
+    def unexpected(data: dict) -> None:
+        extra_keys = set(data.keys()) - keys
+        raise MalformedArgument(f"Unexpected parameter(s): {', '.join(extra_keys)}")
+
+    if not nested and all(i[3] is None for i in checks):
+        # 只有类型检查的扁平模板 (rawtext元素均属此类)
+        flat = [i[:3] for i in checks]
+
+        def check_flat(data: dict) -> None:
+            if root and not isinstance(data, dict):
+                raise TypeError("Both arguments must be dictionaries")
+            for key, types, message in flat:
+                if (value := data.get(key, _MISSING)) is _MISSING:
+                    raise MissingArgument(f"Missing required parameter: '{key}'")
+                if not isinstance(value, types):
+                    raise UnsupportedArgument(message)
+            if len(data) != size:
+                unexpected(data)
+        return check_flat
+
+    def check(data: dict) -> None:
+        if root and not isinstance(data, dict):
+            raise TypeError("Both arguments must be dictionaries")
+        pending: Optional[list] = [] if nested else None
+        for key, types, message, checker in checks:
+            if (value := data.get(key, _MISSING)) is _MISSING:
+                raise MissingArgument(f"Missing required parameter: '{key}'")
+            if types is None:
+                checker(value, key, pending)
+            elif not isinstance(value, types):
+                raise UnsupportedArgument(message)
+        if len(data) != size:
+            unexpected(data)
+        if pending:
+            for child, value in reversed(pending):
+                child(value)
+    return check
+
+def _may_nest(pattern) -> bool:
+    """该模板项是否会产生需要延迟检查的子字典"""
+    if isinstance(pattern, dict):
+        return True
+    if isinstance(pattern, list):
+        return any(_may_nest(i) for i in pattern)
+    return False
+
+def _compile_value(pattern) -> Callable:
+    """将单个模板项编译为 checker(data_value, key, pending), 分支顺序与_type_checking一致"""
+    if isinstance(pattern, dict):
+        child = _compile_dict(pattern)
+
+        def check_dict(data_value, key, pending) -> None:
+            if not isinstance(data_value, dict):
+                raise MissingArgument(f"Invalid pattern for parameter '{key}'")
+            pending.append((child, data_value))
+        return check_dict
+
+    if pattern is str or pattern == "number" or pattern is int or pattern is float:
+        names: dict[object, tuple[Union[type, tuple[type, ...]], str]] = {
+            str: (str, "a string"),
+            int: (int, "an integer"),
+            float: (float, "a float"),
+        }
+        types, expected = names.get(pattern, ((int, float), "a number (int or float)"))
+
+        def check_type(data_value, key, pending) -> None:
+            if not isinstance(data_value, types):
+                raise UnsupportedArgument(f"Parameter '{key}' must be {expected}")
+        return check_type
+
+    if callable(pattern):
+        def check_callable(data_value, key, pending) -> None:
+            if not pattern(data_value, key):
+                raise MalformedArgument(f"Callable Return Invalid Value Signal local(data_value::{data_value}, key::{key})")
+        return check_callable
+
+    if isinstance(pattern, list):
+        items = [_compile_value(i) for i in pattern]
+        length = len(pattern)
+
+        def check_list(data_value, key, pending) -> None:
+            if not isinstance(data_value, list):
+                raise UnsupportedArgument(f"Parameter '{key}' must be a list")
+            if len(data_value) != length:
+                raise MalformedArgument(f"List '{key}' must have exactly {length} items")
+            for checker, d in zip(items, data_value):
+                checker(d, key, pending)
+        return check_list
+
+    if isinstance(pattern, tuple):
+        return _compile_tuple(pattern)
+
+    def invalid(data_value, key, pending) -> None:
+        raise MissingArgument(f"Invalid pattern for parameter '{key}'")
+    return invalid
+
+def _compile_tuple(pattern: tuple) -> Callable:
+    def check_list(data_value, key) -> None:
+        if not isinstance(data_value, list):
+            raise UnsupportedArgument(f"Parameter '{key}' must be a list")
+
+    if len(pattern) == 0:
+        def check_empty(data_value, key, pending) -> None:
+            check_list(data_value, key)
+            raise ValueError("Tuple pattern must contain at least one type")
+        return check_empty
+
+    p = pattern[0]
+    if callable(p):
+        def check_callable(data_value, key, pending) -> None:
+            check_list(data_value, key)
+            if not p(data_value, key):
+                raise MalformedArgument(f"Callable Return Invalid Value Signal local(data_value::{data_value}, key::{key})")
+        return check_callable
+
+    if isinstance(p, type) or p == "number":
+        types, expected = (p, p.__name__) if isinstance(p, type) else ((int, float), "number (int or float)")
+
+        def check_items(data_value, key, pending) -> None:
+            check_list(data_value, key)
+            if any(not isinstance(i, types) for i in data_value):
+                raise UnsupportedArgument(f"All items in list '{key}' must be of type {expected}")
+        return check_items
+
+    def invalid(data_value, key, pending) -> None:
+        check_list(data_value, key)
+        raise ValueError("Tuple pattern must contain at least one type")
+    return invalid
+
+
+# ========== 收集所有不匹配项 ==========
+
+class Violation(NamedTuple):
+    """一处不匹配: path为json路径 (如 rawtext[412].score.name), error为对应的异常类型"""
+    path: str
+    error: type
+    message: str
+
+    def __str__(self) -> str:
+        return f"{self.path or '<root>'}: {self.message}"
+
+def join_path(path: str, key) -> str:
+    """在json路径path后追加字典键key"""
+    return f"{path}.{key}" if path else str(key)
+
+def collect(dictionary: dict, pattern: dict, path: str = "", out: Optional[list[Violation]] = None) -> list[Violation]:
+    """
+    将dictionary与模板pattern做完整匹配, 返回所有不匹配项 (不抛出异常), 全部匹配时返回空列表
+
+    与matching使用相同的模板和错误信息, 但不会在第一个错误处停止:
+    缺少的键、类型错误、多余的键以及嵌套字典/列表中的错误都会以 Violation 记录下来
+    args:
+        path: dictionary自身的json路径, 作为所有路径的前缀
+        out: 若给出, 不匹配项追加到其中并返回它
+    """
+    if not isinstance(pattern, dict):
+        raise TypeError("Both arguments must be dictionaries")
+    out = [] if out is None else out
+    if not isinstance(dictionary, dict):
+        out.append(Violation(path, TypeError, "Both arguments must be dictionaries"))
+    else:
+        _collect_dict(dictionary, pattern, path, out)
+    return out
+
+def _collect_dict(data: dict, pattern: dict, path: str, out: list[Violation]) -> None:
+    for key, pat_value in pattern.items():
+        if key not in data:
+            out.append(Violation(join_path(path, key), MissingArgument, f"Missing required parameter: '{key}'"))
+        else:
+            _collect_value(data[key], pat_value, key, join_path(path, key), out)
+    if len(data) != len(pattern) and (extra_keys := set(data.keys()) - set(pattern.keys())):
+        out.append(Violation(path, MalformedArgument, f"Unexpected parameter(s): {', '.join(extra_keys)}"))
+
+def _collect_value(data_value, pat_value, key, path: str, out: list[Violation]) -> None:
+    """与_type_checking的分支一一对应"""
+    if isinstance(pat_value, dict):
+        if isinstance(data_value, dict):
+            _collect_dict(data_value, pat_value, path, out)
+        else:
+            out.append(Violation(path, MissingArgument, f"Invalid pattern for parameter '{key}'"))
+
+    elif pat_value is str:
+        if not isinstance(data_value, str):
+            out.append(Violation(path, UnsupportedArgument, f"Parameter '{key}' must be a string"))
+
+    elif pat_value == "number":
+        if not isinstance(data_value, (int, float)):
+            out.append(Violation(path, UnsupportedArgument, f"Parameter '{key}' must be a number (int or float)"))
+
+    elif pat_value is int:
+        if not isinstance(data_value, int):
+            out.append(Violation(path, UnsupportedArgument, f"Parameter '{key}' must be an integer"))
+
+    elif pat_value is float:
+        if not isinstance(data_value, float):
+            out.append(Violation(path, UnsupportedArgument, f"Parameter '{key}' must be a float"))
+
+    elif callable(pat_value):
+        if not pat_value(data_value, key):
+            out.append(Violation(path, MalformedArgument, f"Callable Return Invalid Value Signal local(data_value::{data_value}, key::{key})"))
+
+    elif isinstance(pat_value, list):
+        if not isinstance(data_value, list):
+            out.append(Violation(path, UnsupportedArgument, f"Parameter '{key}' must be a list"))
+            return
+        if len(data_value) != len(pat_value):
+            out.append(Violation(path, MalformedArgument, f"List '{key}' must have exactly {len(pat_value)} items"))
+        for i, (p, d) in enumerate(zip(pat_value, data_value)):
+            _collect_value(d, p, key, f"{path}[{i}]", out)
+
+    elif isinstance(pat_value, tuple):
+        if not isinstance(data_value, list):
+            out.append(Violation(path, UnsupportedArgument, f"Parameter '{key}' must be a list"))
+            return
+        if len(pat_value) == 0:
+            raise ValueError("Tuple pattern must contain at least one type")
+
+        p = pat_value[0]
+        if callable(p):
+            if not p(data_value, key):
+                out.append(Violation(path, MalformedArgument, f"Callable Return Invalid Value Signal local(data_value::{data_value}, key::{key})"))
+            return
+
+        if isinstance(p, type):
+            expected_type = p.__name__
+        elif p == "number":
+            expected_type = "number (int or float)"
+            p = (int, float)
+        else:
+            raise ValueError("Tuple pattern must contain at least one type")
+
+        for i, item in enumerate(data_value):
+            if not isinstance(item, p):
+                out.append(Violation(f"{path}[{i}]", UnsupportedArgument, f"All items in list '{key}' must be of type {expected_type}"))
+
+    else:
+        out.append(Violation(path, MissingArgument, f"Invalid pattern for parameter '{key}'"))
@@ -4,7 +4,14 @@ from typing import Union, Optional, TypeAlias
 import math
 
 class Int32:
-    """32位有符号整数类"""
+    """
+    32位有符号整数类
+
+    * 运算的快速路径:
+    右值为int时直接取原始整数参与运算, 结果通过 _raw 构造, 不再为右值和中间结果创建Int32;
+    原地运算直接修改 value, 不分配任何对象.
+    Int32 会被原地运算修改 (计分板依赖这一点), 因此不对小整数做驻留缓存
+    """
     __slots__ = ("value", )
 
     # 32位整数范围
@@ -14,75 +21,50 @@ class Int32:
 
     def __init__(self, value: Union[Int32, int] = 0):
         """初始化，将值限制在32位范围内"""
-        self.value: int = 0
-
         if isinstance(value, Int32):
-            self.value = value.value & self.MASK
+            self.value: int = value.value
         else:
-            self.value = int(value) & self.MASK
-
-        if self.value & 0x80000000:
-            self.value = self.value - 0x100000000
+            self.value = wrap32(int(value))
 
     def copy(self) -> Int32:
         """拷贝一个新的Int32"""
-        return Int32(self.value)
+        return _raw(self.value)
 
     # ========== 算术运算 ==========
 
     def __add__(self, other: Union[Int32, int]) -> Int32:
         """加法运算"""
-        if not isinstance(other, Int32):
-            other = Int32(other)
-        result = (self.value + other.value) & self.MASK
-
-        if result & 0x80000000:
-            result -= 0x100000000
-        return Int32(result)
+        o = other.value if isinstance(other, Int32) else int(other)
+        return _raw(wrap32(self.value + o))
 
     def __sub__(self, other: Union[Int32, int]) -> Int32:
         """减法运算"""
-        if not isinstance(other, Int32):
-            other = Int32(other)
-        result = (self.value - other.value) & self.MASK
-
-        if result & 0x80000000:
-            result -= 0x100000000
-        return Int32(result)
+        o = other.value if isinstance(other, Int32) else int(other)
+        return _raw(wrap32(self.value - o))
 
     def __mul__(self, other: Union[Int32, int]) -> Int32:
         """乘法运算"""
-        if not isinstance(other, Int32):
-            other = Int32(other)
-        result = (self.value * other.value) & self.MASK
-
-        if result & 0x80000000:
-            result -= 0x100000000
-        return Int32(result)
+        o = other.value if isinstance(other, Int32) else int(other)
+        return _raw(wrap32(self.value * o))
 
     def __truediv__(self, other: Union[Int32, int]) -> float:
         """真除法，返回浮点数"""
-        if not isinstance(other, Int32):
-            other = Int32(other)
-        return self.value / other.value
+        o = other.value if isinstance(other, Int32) else wrap32(int(other))
+        return self.value / o
 
     def __floordiv__(self, other: Union[Int32, int]) -> Int32:
         """整除运算"""
-        if not isinstance(other, Int32):
-            other = Int32(other)
-        if other.value == 0:
+        o = other.value if isinstance(other, Int32) else wrap32(int(other))
+        if o == 0:
             raise ZeroDivisionError("division by zero")
-        result = self.value // other.value
-        return Int32(result)
+        return _raw(wrap32(self.value // o))
 
     def __mod__(self, other: Union[Int32, int]) -> Int32:
         """取模运算"""
-        if not isinstance(other, Int32):
-            other = Int32(other)
-        if other.value == 0:
+        o = other.value if isinstance(other, Int32) else wrap32(int(other))
+        if o == 0:
             raise ZeroDivisionError("modulo by zero")
-        result = self.value % other.value
-        return Int32(result)
+        return _raw(self.value % o)
 
     def __divmod__(self, other: Union[Int32, int]) -> tuple[Int32, Int32]:
         """返回 (商, 余数)"""
@@ -90,13 +72,12 @@ class Int32:
 
     def __pow__(self, other: Union[Int32, int], mod: Optional[int] = None) -> Int32:
         """幂运算"""
-        if not isinstance(other, Int32):
-            other = Int32(other)
+        o = other.value if isinstance(other, Int32) else wrap32(int(other))
 
         if mod is not None:
-            result = pow(self.value, other.value, mod)
+            result = pow(self.value, o, mod)
         else:
-            result = pow(self.value, other.value)
+            result = pow(self.value, o)
 
         return Int32(result)
 
@@ -108,9 +89,8 @@ class Int32:
 
     def __rsub__(self, other: Union[Int32, int]) -> Int32:
         """反向减法"""
-        if not isinstance(other, Int32):
-            other = Int32(other)
-        return other - self
+        o = other.value if isinstance(other, Int32) else int(other)
+        return _raw(wrap32(o - self.value))
 
     def __rmul__(self, other: Union[Int32, int]) -> Int32:
         """反向乘法"""
@@ -118,29 +98,30 @@ class Int32:
 
     def __rfloordiv__(self, other: Union[Int32, int]) -> Int32:
         """反向整除"""
-        if not isinstance(other, Int32):
-            other = Int32(other)
-        return other // self
+        o = other.value if isinstance(other, Int32) else wrap32(int(other))
+        if self.value == 0:
+            raise ZeroDivisionError("division by zero")
+        return _raw(wrap32(o // self.value))
 
     def __rmod__(self, other: Union[Int32, int]) -> Int32:
         """反向取模"""
-        if not isinstance(other, Int32):
-            other = Int32(other)
-        return other % self
+        o = other.value if isinstance(other, Int32) else wrap32(int(other))
+        if self.value == 0:
+            raise ZeroDivisionError("modulo by zero")
+        return _raw(o % self.value)
 
     def __rdivmod__(self, other: Union[Int32, int]) -> tuple[Int32, Int32]:
         """反向divmod"""
-        return divmod(other, self)
+        return divmod(Int32(other), self)
 
     def __rpow__(self, other: Union[Int32, int], mod: Optional[int] = None) -> Int32:
         """反向幂运算"""
-        if not isinstance(other, Int32):
-            other = Int32(other)
+        o = other.value if isinstance(other, Int32) else wrap32(int(other))
 
         if mod is not None:
-            result = pow(other.value, self.value, mod)
+            result = pow(o, self.value, mod)
         else:
-            result = pow(other.value, self.value)
+            result = pow(o, self.value)
 
         return Int32(result)
 
@@ -148,73 +129,59 @@ class Int32:
 
     def __and__(self, other: Union[Int32, int]) -> Int32:
         """位与运算"""
-        if not isinstance(other, Int32):
-            other = Int32(other)
-        return Int32(self.value & other.value)
+        o = other.value if isinstance(other, Int32) else wrap32(int(other))
+        return _raw(self.value & o)
 
     def __or__(self, other: Union[Int32, int]) -> Int32:
         """位或运算"""
-        if not isinstance(other, Int32):
-            other = Int32(other)
-        return Int32(self.value | other.value)
+        o = other.value if isinstance(other, Int32) else wrap32(int(other))
+        return _raw(self.value | o)
 
     def __xor__(self, other: Union[Int32, int]) -> Int32:
         """位异或运算"""
-        if not isinstance(other, Int32):
-            other = Int32(other)
-        return Int32(self.value ^ other.value)
+        o = other.value if isinstance(other, Int32) else wrap32(int(other))
+        return _raw(self.value ^ o)
 
     def __lshift__(self, n: int) -> Int32:
         """左移运算"""
-        n = n & 0x1F  # 限制在0-31位
-        result = (self.value << n) & self.MASK
-
-        if result & 0x80000000:
-            result -= 0x100000000
-        return Int32(result)
+        n = int(n) & 0x1F  # 限制在0-31位
+        return _raw(wrap32(self.value << n))
 
     def __rshift__(self, n: int) -> Int32:
         """算术右移（保持符号位）"""
-        n = n & 0x1F  # 限制在0-31位
-        return Int32(self.value >> n)
+        n = int(n) & 0x1F  # 限制在0-31位
+        return _raw(self.value >> n)
 
     # ========== 反向位运算 ==========
 
     def __rand__(self, other: Union[Int32, int]) -> Int32:
         """反向位与"""
-        if not isinstance(other, Int32):
-            other = Int32(other)
-        return other & self
+        return self & other
 
     def __ror__(self, other: Union[Int32, int]) -> Int32:
         """反向位或"""
-        if not isinstance(other, Int32):
-            other = Int32(other)
-        return other | self
+        return self | other
 
     def __rxor__(self, other: Union[Int32, int]) -> Int32:
         """反向位异或"""
-        if not isinstance(other, Int32):
-            other = Int32(other)
-        return other ^ self
+        return self ^ other
 
     def __rlshift__(self, other: Union[Int32, int]) -> Int32:
         """反向左移"""
-        if not isinstance(other, Int32):
-            other = Int32(other)
-        return other << self.value
+        o = other.value if isinstance(other, Int32) else int(other)
+        n = self.value & 0x1F
+        return _raw(wrap32(o << n))
 
     def __rrshift__(self, other: Union[Int32, int]) -> Int32:
         """反向右移"""
-        if not isinstance(other, Int32):
-            other = Int32(other)
-        return other >> self.value
+        o = other.value if isinstance(other, Int32) else wrap32(int(other))
+        return _raw(o >> (self.value & 0x1F))
 
     # ========== 一元操作 ==========
 
     def __neg__(self) -> Int32:
         """取负"""
-        return Int32(-self.value)
+        return _raw(wrap32(-self.value))
 
     def __pos__(self) -> Int32:
         """取正"""
@@ -222,41 +189,39 @@ class Int32:
 
     def __abs__(self) -> Int32:
         """绝对值"""
-        return Int32(abs(self.value))
+        return _raw(wrap32(abs(self.value)))
 
     def __invert__(self) -> Int32:
         """按位取反"""
-        return Int32(~self.value)
+        return _raw(~self.value)
 
     # ========== 比较运算 ==========
 
     def __eq__(self, other: object) -> bool:
-        if not isinstance(other, (Int32, int)):
-            return False
-        return self.value == Int32(other).value
+        if isinstance(other, Int32):
+            return self.value == other.value
+        if isinstance(other, int):
+            return self.value == wrap32(other)
+        return False
 
     def __ne__(self, other: object) -> bool:
         return not self.__eq__(other)
 
     def __lt__(self, other: Union[Int32, int]) -> bool:
-        if not isinstance(other, Int32):
-            other = Int32(other)
-        return self.value < other.value
+        o = other.value if isinstance(other, Int32) else wrap32(int(other))
+        return self.value < o
 
     def __le__(self, other: Union[Int32, int]) -> bool:
-        if not isinstance(other, Int32):
-            other = Int32(other)
-        return self.value <= other.value
+        o = other.value if isinstance(other, Int32) else wrap32(int(other))
+        return self.value <= o
 
     def __gt__(self, other: Union[Int32, int]) -> bool:
-        if not isinstance(other, Int32):
-            other = Int32(other)
-        return self.value > other.value
+        o = other.value if isinstance(other, Int32) else wrap32(int(other))
+        return self.value > o
 
     def __ge__(self, other: Union[Int32, int]) -> bool:
-        if not isinstance(other, Int32):
-            other = Int32(other)
-        return self.value >= other.value
+        o = other.value if isinstance(other, Int32) else wrap32(int(other))
+        return self.value >= o
 
     # ========== 类型转换 ==========
 
@@ -289,32 +254,36 @@ class Int32:
 
     def __iadd__(self, other: Union[Int32, int]) -> Int32:
         """原地加法"""
-        result = self + other
-        self.value = result.value
+        o = other.value if isinstance(other, Int32) else int(other)
+        self.value = wrap32(self.value + o)
         return self
 
     def __isub__(self, other: Union[Int32, int]) -> Int32:
         """原地减法"""
-        result = self - other
-        self.value = result.value
+        o = other.value if isinstance(other, Int32) else int(other)
+        self.value = wrap32(self.value - o)
         return self
 
     def __imul__(self, other: Union[Int32, int]) -> Int32:
         """原地乘法"""
-        result = self * other
-        self.value = result.value
+        o = other.value if isinstance(other, Int32) else int(other)
+        self.value = wrap32(self.value * o)
         return self
 
     def __ifloordiv__(self, other: Union[Int32, int]) -> Int32:
         """原地整除"""
-        result = self // other
-        self.value = result.value
+        o = other.value if isinstance(other, Int32) else wrap32(int(other))
+        if o == 0:
+            raise ZeroDivisionError("division by zero")
+        self.value = wrap32(self.value // o)
         return self
 
     def __imod__(self, other: Union[Int32, int]) -> Int32:
         """原地取模"""
-        result = self % other
-        self.value = result.value
+        o = other.value if isinstance(other, Int32) else wrap32(int(other))
+        if o == 0:
+            raise ZeroDivisionError("modulo by zero")
+        self.value = self.value % o
         return self
 
     def __ipow__(self, other: Union[Int32, int], mod: Optional[int] = None) -> Int32:
@@ -325,32 +294,27 @@ class Int32:
 
     def __iand__(self, other: Union[Int32, int]) -> Int32:
         """原位与"""
-        result = self & other
-        self.value = result.value
+        self.value &= other.value if isinstance(other, Int32) else wrap32(int(other))
         return self
 
     def __ior__(self, other: Union[Int32, int]) -> Int32:
         """原位或"""
-        result = self | other
-        self.value = result.value
+        self.value |= other.value if isinstance(other, Int32) else wrap32(int(other))
         return self
 
     def __ixor__(self, other: Union[Int32, int]) -> Int32:
         """原位异或"""
-        result = self ^ other
-        self.value = result.value
+        self.value ^= other.value if isinstance(other, Int32) else wrap32(int(other))
         return self
 
     def __ilshift__(self, n: int) -> Int32:
         """原地左移"""
-        result = self << n
-        self.value = result.value
+        self.value = wrap32(self.value << (int(n) & 0x1F))
         return self
 
     def __irshift__(self, n: int) -> Int32:
         """原地右移"""
-        result = self >> n
-        self.value = result.value
+        self.value >>= int(n) & 0x1F
         return self
 
     # ========== 特殊方法 ==========
@@ -388,11 +352,10 @@ class Int32:
 
     def truncdiv(self, other: Union[Int32, int]) -> Int32:
         """整除运算 (向零取整)"""
-        if not isinstance(other, Int32):
-            other = Int32(other)
-        if other.value == 0:
+        o = other.value if isinstance(other, Int32) else wrap32(int(other))
+        if o == 0:
             raise ZeroDivisionError("division by zero")
-        return Int32(math.trunc(self.value / other.value))
+        return _raw(wrap32(math.trunc(self.value / o)))
 
     # ========== 兼容性方法 ==========
 
@@ -407,6 +370,14 @@ class Int32:
             self.value -= 0x100000000
 
 
+_new = object.__new__
+
+def _raw(value: int) -> Int32:
+    """由已处于32位范围内的原始整数直接构造Int32, 跳过__init__中的类型判断与回绕"""
+    obj = _new(Int32)
+    obj.value = value
+    return obj
+
 def checking32(value: Union[Int32, int]) -> bool:
     if isinstance(value, Int32):
         return True
@@ -417,7 +388,11 @@ def build32(value: Union[Int32, int]) -> Int32:
         return value
     return Int32(value)
 
+def wrap32(value: int) -> int:
+    """将任意整数按32位有符号整数的规则回绕, 不创建Int32对象"""
+    return ((value + 0x80000000) & 0xFFFFFFFF) - 0x80000000
+
 Integer: TypeAlias = Union[Int32, int]
 
 const_min = Int32(Int32.MIN)
-const_max = Int32(Int32.MAX)
\ No newline at end of file
+const_max = Int32(Int32.MAX)
@@ -0,0 +1,304 @@
+# create by lesomras on 2026-10-17
+from __future__ import annotations
+from array import array
+from typing import Union, Iterable, Iterator, Callable, overload
+import math
+
+from .int32 import Int32, Integer, wrap32
+from .exceptions import UnsupportedArgument, MalformedArgument, MalformedException
+
+# array('i') 在所有主流平台上均为32位; 'l' 在LP64平台上为64位, 不能作为替代
+TYPECODE = "i"
+if array(TYPECODE).itemsize != 4:
+    raise ImportError(f"array('{TYPECODE}') is not 32-bit on this platform")
+
+Operand = Union["Int32Array", Int32, int, Iterable[Integer]]
+
+def _truncdiv(a: int, b: int) -> int:
+    return wrap32(math.trunc(a / b))
+
+class Int32Array:
+    """
+    具有Minecraft int32语义的整数向量
+
+    数据紧凑地存放在 array('i') 中, 逐元素运算的回绕与截断规则与 Int32 完全一致;
+    operation() 则复刻 Scoreboard.players_operation 的语义 (包括 /= 与 %= 除零时不修改)
+    """
+    __slots__ = ("data", )
+
+    def __init__(self, values: Iterable[Integer] = ()) -> None:
+        """由整数序列构造, 超出范围的值按32位回绕"""
+        self.data: array[int]
+        if isinstance(values, Int32Array):
+            self.data = array(TYPECODE, values.data)
+        else:
+            self.data = array(TYPECODE, [wrap32(int(v)) for v in values])
+
+    @classmethod
+    def zeros(cls, length: int) -> Int32Array:
+        """构造长度为length的全0向量"""
+        if not isinstance(length, int) or length < 0:
+            raise UnsupportedArgument(f"'length' must be a non-negative integer, but received {length!r}")
+        return cls._from_array(array(TYPECODE, bytes(length * array(TYPECODE).itemsize)))
+
+    @classmethod
+    def full(cls, length: int, value: Integer) -> Int32Array:
+        """构造长度为length且每个元素都为value的向量"""
+        if not isinstance(length, int) or length < 0:
+            raise UnsupportedArgument(f"'length' must be a non-negative integer, but received {length!r}")
+        return cls._from_array(array(TYPECODE, [wrap32(int(value))]) * length)
+
+    @classmethod
+    def _from_array(cls, data: array) -> Int32Array:
+        """直接接管一个已处于32位范围内的array, 不做复制与检查"""
+        obj = object.__new__(cls)
+        obj.data = data
+        return obj
+
+    # ========== 运算辅助 ==========
+
+    def _operand(self, other: Operand) -> Union[int, array]:
+        """将右值转换为原始整数 (标量) 或与自身等长的array (向量)"""
+        if isinstance(other, Int32):
+            return other.value
+        if isinstance(other, int):
+            return wrap32(other)
+        if not isinstance(other, Int32Array):
+            try:
+                other = Int32Array(other)
+            except TypeError as e:
+                raise UnsupportedArgument(f"unsupported operand type: {type(other).__name__}") from e
+        if len(other.data) != len(self.data):
+            raise MalformedArgument(f"length mismatch: {len(self.data)} and {len(other.data)}")
+        return other.data
+
+    def _map(self, b: Union[int, array], kernel: Callable[[int, int], int]) -> array:
+        """对已转换的右值逐元素应用kernel"""
+        if isinstance(b, int):
+            return array(TYPECODE, [kernel(a, b) for a in self.data])
+        return array(TYPECODE, [kernel(a, y) for a, y in zip(self.data, b)])
+
+    def _check_divisor(self, b: Union[int, array]) -> None:
+        if (b == 0) if isinstance(b, int) else (0 in b):
+            raise ZeroDivisionError("division by zero")
+
+    # ========== 算术运算 ==========
+
+    def __add__(self, other: Operand) -> Int32Array:
+        """逐元素加法 (回绕)"""
+        b = self._operand(other)
+        if isinstance(b, int):
+            return self._from_array(array(TYPECODE, [((a + b + 0x80000000) & 0xFFFFFFFF) - 0x80000000 for a in self.data]))
+        return self._from_array(array(TYPECODE, [((a + y + 0x80000000) & 0xFFFFFFFF) - 0x80000000 for a, y in zip(self.data, b)]))
+
+    def __sub__(self, other: Operand) -> Int32Array:
+        """逐元素减法 (回绕)"""
+        b = self._operand(other)
+        if isinstance(b, int):
+            return self._from_array(array(TYPECODE, [((a - b + 0x80000000) & 0xFFFFFFFF) - 0x80000000 for a in self.data]))
+        return self._from_array(array(TYPECODE, [((a - y + 0x80000000) & 0xFFFFFFFF) - 0x80000000 for a, y in zip(self.data, b)]))
+
+    def __mul__(self, other: Operand) -> Int32Array:
+        """逐元素乘法 (回绕)"""
+        b = self._operand(other)
+        if isinstance(b, int):
+            return self._from_array(array(TYPECODE, [((a * b + 0x80000000) & 0xFFFFFFFF) - 0x80000000 for a in self.data]))
+        return self._from_array(array(TYPECODE, [((a * y + 0x80000000) & 0xFFFFFFFF) - 0x80000000 for a, y in zip(self.data, b)]))
+
+    def __floordiv__(self, other: Operand) -> Int32Array:
+        """逐元素整除 (向下取整), 除数含0时抛出ZeroDivisionError"""
+        b = self._operand(other)
+        self._check_divisor(b)
+        return self._from_array(self._map(b, lambda a, y: wrap32(a // y)))
+
+    def __mod__(self, other: Operand) -> Int32Array:
+        """逐元素取模 (结果与除数同号), 除数含0时抛出ZeroDivisionError"""
+        b = self._operand(other)
+        self._check_divisor(b)
+        return self._from_array(self._map(b, lambda a, y: a % y))
+
+    def truncdiv(self, other: Operand) -> Int32Array:
+        """逐元素整除 (向零取整), 除数含0时抛出ZeroDivisionError"""
+        b = self._operand(other)
+        self._check_divisor(b)
+        return self._from_array(self._map(b, _truncdiv))
+
+    def __lshift__(self, n: Operand) -> Int32Array:
+        """逐元素左移, 位移量限制在0-31位"""
+        return self._from_array(self._map(self._operand(n), lambda a, y: wrap32(a << (y & 0x1F))))
+
+    def __rshift__(self, n: Operand) -> Int32Array:
+        """逐元素算术右移, 位移量限制在0-31位"""
+        return self._from_array(self._map(self._operand(n), lambda a, y: a >> (y & 0x1F)))
+
+    def __radd__(self, other: Operand) -> Int32Array:
+        return self + other
+
+    def __rsub__(self, other: Operand) -> Int32Array:
+        return -self + other
+
+    def __rmul__(self, other: Operand) -> Int32Array:
+        return self * other
+
+    def __neg__(self) -> Int32Array:
+        return self._from_array(array(TYPECODE, [((0x80000000 - a) & 0xFFFFFFFF) - 0x80000000 for a in self.data]))
+
+    def __abs__(self) -> Int32Array:
+        return self._from_array(array(TYPECODE, [wrap32(abs(a)) for a in self.data]))
+
+    def minimum(self, other: Operand) -> Int32Array:
+        """逐元素取较小值"""
+        return self._from_array(self._map(self._operand(other), min))
+
+    def maximum(self, other: Operand) -> Int32Array:
+        """逐元素取较大值"""
+        return self._from_array(self._map(self._operand(other), max))
+
+    # ========== 原地运算 ==========
+
+    def __iadd__(self, other: Operand) -> Int32Array:
+        self.data = (self + other).data
+        return self
+
+    def __isub__(self, other: Operand) -> Int32Array:
+        self.data = (self - other).data
+        return self
+
+    def __imul__(self, other: Operand) -> Int32Array:
+        self.data = (self * other).data
+        return self
+
+    def __ifloordiv__(self, other: Operand) -> Int32Array:
+        self.data = (self // other).data
+        return self
+
+    def __imod__(self, other: Operand) -> Int32Array:
+        self.data = (self % other).data
+        return self
+
+    def __ilshift__(self, n: Operand) -> Int32Array:
+        self.data = (self << n).data
+        return self
+
+    def __irshift__(self, n: Operand) -> Int32Array:
+        self.data = (self >> n).data
+        return self
+
+    # ========== 比较运算 (返回掩码) ==========
+
+    def eq(self, other: Operand) -> list[bool]:
+        """逐元素 ==, 返回掩码"""
+        return self._compare(other, int.__eq__)
+
+    def ne(self, other: Operand) -> list[bool]:
+        """逐元素 !=, 返回掩码"""
+        return self._compare(other, int.__ne__)
+
+    def lt(self, other: Operand) -> list[bool]:
+        """逐元素 <, 返回掩码"""
+        return self._compare(other, int.__lt__)
+
+    def le(self, other: Operand) -> list[bool]:
+        """逐元素 <=, 返回掩码"""
+        return self._compare(other, int.__le__)
+
+    def gt(self, other: Operand) -> list[bool]:
+        """逐元素 >, 返回掩码"""
+        return self._compare(other, int.__gt__)
+
+    def ge(self, other: Operand) -> list[bool]:
+        """逐元素 >=, 返回掩码"""
+        return self._compare(other, int.__ge__)
+
+    def between(self, _min: Integer, _max: Integer = 2147483647) -> list[bool]:
+        """逐元素检测是否满足 _min <= x <= _max (players_test语义), 返回掩码"""
+        lo, hi = int(_min), int(_max)
+        return [lo <= a <= hi for a in self.data]
+
+    def _compare(self, other: Operand, predicate: Callable[[int, int], bool]) -> list[bool]:
+        b = self._operand(other)
+        if isinstance(b, int):
+            return [predicate(a, b) for a in self.data]
+        return [predicate(a, y) for a, y in zip(self.data, b)]
+
+    # ========== 计分板运算 ==========
+
+    def operation(self, operation: str, other: Operand) -> None:
+        """
+        以 /scoreboard players operation 的语义原地修改自身
+
+        args:
+            operation: "=", "+=", "-=", "*=", "/=", "%=", "<", ">", "><" 之一
+            other: 右值 (标量或等长向量); "><" 时必须为Int32Array, 两者内容互换
+        "/=" 向零取整, "/=" 与 "%=" 遇到除数为0的元素时保持原值不变
+        """
+        match operation:
+            case "=":
+                b = self._operand(other)
+                self.data = array(TYPECODE, [b]) * len(self.data) if isinstance(b, int) else array(TYPECODE, b)
+            case "+=":
+                self += other
+            case "-=":
+                self -= other
+            case "*=":
+                self *= other
+            case "/=":
+                self.data = self._map(self._operand(other), lambda a, y: _truncdiv(a, y) if y != 0 else a)
+            case "%=":
+                self.data = self._map(self._operand(other), lambda a, y: a % y if y != 0 else a)
+            case "<":
+                self.data = self._map(self._operand(other), min)
+            case ">":
+                self.data = self._map(self._operand(other), max)
+            case "><":
+                if not isinstance(other, Int32Array):
+                    raise UnsupportedArgument("'><' requires an Int32Array operand")
+                self._operand(other)
+                self.data, other.data = other.data, self.data
+            case _:
+                raise MalformedException(f"{operation} does not have a corresponding operation")
+
+    # ========== 容器协议 ==========
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @overload
+    def __getitem__(self, index: int) -> Int32: ...
+    @overload
+    def __getitem__(self, index: slice) -> Int32Array: ...
+    def __getitem__(self, index: Union[int, slice]) -> Union[Int32, Int32Array]:
+        if isinstance(index, slice):
+            return self._from_array(self.data[index])
+        return Int32(self.data[index])
+
+    def __setitem__(self, index: int, value: Integer) -> None:
+        self.data[index] = wrap32(int(value))
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.data)
+
+    def tolist(self) -> list[int]:
+        return self.data.tolist()
+
+    def copy(self) -> Int32Array:
+        return self._from_array(array(TYPECODE, self.data))
+
+    def sum(self) -> Int32:
+        """所有元素之和 (回绕)"""
+        return Int32(sum(self.data))
+
+    def compress(self, mask: Iterable[bool]) -> Int32Array:
+        """按掩码筛选元素"""
+        return self._from_array(array(TYPECODE, [a for a, m in zip(self.data, mask) if m]))
+
+    def __eq__(self, other: object) -> bool:
+        """结构相等; 逐元素比较请使用eq()"""
+        if isinstance(other, Int32Array):
+            return self.data == other.data
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"Int32Array({self.data.tolist()})"
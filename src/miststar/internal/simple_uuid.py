@@ -1,14 +1,149 @@
 # create by lesomras on 2025-12-23
 import uuid
-from typing import TypeVar, Generic, Optional
+import os
+import random
+import threading
+from itertools import chain, count
+from collections import deque
+from typing import TypeVar, Generic, Optional, Union, Iterator
 
 from .exceptions import UnsupportedException, MalformedException, SemanticException
 
 T = TypeVar('T')
 
+def _format(h: str) -> str:
+    """32位十六进制串 -> 8-4-4-4-12 的标准形式"""
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:32]}"
+
+# 将字节的高4位置为版本号4 / 高2位置为变体10 的转换表
+_VERSION_TABLE = bytes((i & 0x0F) | 0x40 for i in range(256))
+_VARIANT_TABLE = bytes((i & 0x3F) | 0x80 for i in range(256))
+
+def uuid_to_int(_uuid: Union[str, int]) -> int:
+    """标准形式的uuid字符串 -> 128位整数 (整数原样返回)"""
+    if isinstance(_uuid, int):
+        return _uuid
+    try:
+        return int(_uuid.replace("-", ""), 16) if len(_uuid) == 36 else int(_uuid, 16)
+    except (ValueError, AttributeError):
+        raise MalformedException(f"invalid uuid: {_uuid!r}") from None
+
+def int_to_uuid(n: int) -> str:
+    """128位整数 -> 标准形式的uuid字符串"""
+    return _format(f"{n:032x}")
+
+class UUIDGenerator(object):
+    """uuid生成器基类, 默认行为与 uuid.uuid4() 一致"""
+
+    def __call__(self) -> str:
+        return str(uuid.uuid4())
+
+    def batch(self, nums: int) -> list[str]:
+        """一次生成nums个uuid"""
+        return [self() for _ in range(nums)]
+
+    def next_int(self) -> int:
+        """以128位整数的形式生成一个uuid"""
+        return uuid.uuid4().int
+
+    def batch_int(self, nums: int) -> list[int]:
+        """以128位整数的形式一次生成nums个uuid"""
+        return [self.next_int() for _ in range(nums)]
+
+class RandomUUIDGenerator(UUIDGenerator):
+    """
+    批量随机的uuid4生成器
+
+    一次调用 os.urandom 取得 buffer_size 个uuid所需的随机字节, 用转换表一次性写入版本与变体位,
+    再整体转为十六进制后切片, 避免每个uuid单独读取系统随机源与构造 uuid.UUID 对象
+    """
+
+    def __init__(self, buffer_size: int = 4096) -> None:
+        if not isinstance(buffer_size, int) or buffer_size <= 0:
+            raise UnsupportedException(f"'buffer_size' must be a positive integer, but received {type(buffer_size)}({buffer_size}).")
+        self.buffer_size = buffer_size
+        self._buffer: list[str] = []
+
+    @staticmethod
+    def _random(nums: int) -> bytearray:
+        raw = bytearray(os.urandom(16 * nums))
+        raw[6::16] = raw[6::16].translate(_VERSION_TABLE)
+        raw[8::16] = raw[8::16].translate(_VARIANT_TABLE)
+        return raw
+
+    @classmethod
+    def _render(cls, nums: int) -> list[str]:
+        h = cls._random(nums).hex()
+        return [_format(h[i:i + 32]) for i in range(0, 32 * nums, 32)]
+
+    def next_int(self) -> int:
+        return int.from_bytes(self._random(1), "big")
+
+    def batch_int(self, nums: int) -> list[int]:
+        raw = self._random(max(nums, 0))
+        return [int.from_bytes(raw[i:i + 16], "big") for i in range(0, len(raw), 16)]
+
+    def __call__(self) -> str:
+        if not self._buffer:
+            self._buffer = self._render(self.buffer_size)
+            self._buffer.reverse()
+        return self._buffer.pop()
+
+    def batch(self, nums: int) -> list[str]:
+        return self._render(nums) if nums > 0 else []
+
+class CounterUUIDGenerator(UUIDGenerator):
+    """
+    由种子确定的计数器uuid生成器, 用于可复现的模拟
+
+    第i个uuid由 (起点 + i * 奇数常量) mod 2**122 得到, 再填入uuid4除版本与变体位以外的122位中;
+    该映射是双射, 因此在 2**122 次之内不会重复. 结果不具备密码学随机性
+    """
+    _MASK = (1 << 122) - 1
+    # 2**122 / 黄金分割比附近的奇数, 使相邻计数值的输出充分分散
+    _STEP = 0x278DDE6E5FD29F057CE73018173B721
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self.seed = seed
+        self.counter = 0
+        self._start = random.Random(seed).getrandbits(122)
+
+    def _int(self, i: int) -> int:
+        v = (self._start + i * self._STEP) & self._MASK
+        return (v >> 74) << 80 | 0x4 << 76 | ((v >> 62) & 0xFFF) << 64 | 0x2 << 62 | (v & 0x3FFFFFFFFFFFFFFF)
+
+    def __call__(self) -> str:
+        self.counter += 1
+        return int_to_uuid(self._int(self.counter - 1))
+
+    def batch(self, nums: int) -> list[str]:
+        return [int_to_uuid(i) for i in self.batch_int(nums)]
+
+    def next_int(self) -> int:
+        self.counter += 1
+        return self._int(self.counter - 1)
+
+    def batch_int(self, nums: int) -> list[int]:
+        start = self.counter
+        self.counter += max(nums, 0)
+        return [self._int(i) for i in range(start, self.counter)]
+
+_default_generator: Optional[UUIDGenerator] = None
+
+def set_default_generator(generator: Optional[UUIDGenerator]) -> None:
+    """设置new_uuid使用的生成器, 为None时恢复为 uuid.uuid4()"""
+    global _default_generator
+    if generator is not None and not isinstance(generator, UUIDGenerator):
+        raise UnsupportedException(f"'generator' must be a UUIDGenerator, but received {type(generator)}.")
+    _default_generator = generator
+
 def new_uuid() -> str:
+    if _default_generator is not None:
+        return _default_generator()
     return str(uuid.uuid4())
 
+_MASK64 = (1 << 64) - 1
+
 class UUIDSpace(Generic[T]):
     """
     管理uuid的空间
@@ -18,12 +153,140 @@ class UUIDSpace(Generic[T]):
     (2) free_uuids ∩ mapping.keys() = {}
 
     请确保你对内部状态的一切修改均符合该假设, 否则代码可能出现无法预期的行为
+
+    * generator 决定新uuid的生成方式, 为None时使用 new_uuid();
+    大量生成时可使用 RandomUUIDGenerator (批量随机) 或 CounterUUIDGenerator (可复现)
+
+    * free_order 决定 custom() 复用空闲uuid的顺序: None 为集合的任意顺序,
+    "lifo" 优先复用最近释放的uuid, "fifo" 优先复用最早释放的uuid
+
+    * checksum=True 时三个容器各自增量维护一个哈希校验和, quick_check() 以 O(1) 检测上述假设;
+    debug=True 隐含checksum, 并在每次修改后都执行该检测, 不满足时抛出 SemanticException.
+    三者均为默认值时各方法直接操作容器, 不付出空闲队列与校验和的开销
     """
 
-    def __init__(self) -> None:
+    def __init__(self, generator: Optional[UUIDGenerator] = None, free_order: Optional[str] = None,
+                 debug: bool = False, checksum: bool = False) -> None:
+        if generator is not None and not isinstance(generator, UUIDGenerator):
+            raise UnsupportedException(f"'generator' must be a UUIDGenerator, but received {type(generator)}.")
+        if free_order not in (None, "lifo", "fifo"):
+            raise MalformedException(f"'free_order' must be None, 'lifo' or 'fifo', but received {free_order!r}.")
         self.uuids: set[str] = set()
         self.free_uuids: set[str] = set()
         self.mapping: dict[str, T] = {}
+        self.generator = generator
+        self.free_order = free_order
+        # 空闲队列: (序号, uuid); _stamps 记录每个空闲uuid最近一次入队的序号, 序号不符的队列项已失效
+        self._queue: Optional[deque[tuple[int, str]]] = deque() if free_order is not None else None
+        self._stamps: dict[str, int] = {}
+        self._sequence = 0
+        # 各容器中所有uuid的哈希之和 (mod 2**64), 只在 _checksum 为True时维护
+        self._uuids_sum = 0
+        self._free_sum = 0
+        self._mapping_sum = 0
+        self._debug = debug
+        self._checksum = False
+        # 为True时走直接操作容器的快速路径
+        self._plain = False
+        self.checksum = checksum or debug
+
+    def _new_uuid(self) -> str:
+        return new_uuid() if self.generator is None else self.generator()
+
+    def _update_plain(self) -> None:
+        self._plain = self._queue is None and not self._checksum and not self._debug
+
+    @property
+    def debug(self) -> bool:
+        return self._debug
+
+    @debug.setter
+    def debug(self, value: bool) -> None:
+        self._debug = value
+        if value:
+            self.checksum = True
+        self._update_plain()
+
+    @property
+    def checksum(self) -> bool:
+        """是否维护哈希校验和; 由False改为True时按当前内容重新计算"""
+        return self._checksum
+
+    @checksum.setter
+    def checksum(self, value: bool) -> None:
+        if value and not self._checksum:
+            self._checksum = True
+            self._rebuild_sums()
+        self._checksum = value or self._debug
+        self._update_plain()
+
+    # ========== 容器原语 (同步维护校验和与空闲队列) ==========
+
+    def _uuids_add(self, _uuid: str) -> None:
+        if _uuid not in self.uuids:
+            self.uuids.add(_uuid)
+            if self._checksum:
+                self._uuids_sum = (self._uuids_sum + hash(_uuid)) & _MASK64
+
+    def _uuids_remove(self, _uuid: str) -> None:
+        if _uuid in self.uuids:
+            self.uuids.remove(_uuid)
+            if self._checksum:
+                self._uuids_sum = (self._uuids_sum - hash(_uuid)) & _MASK64
+
+    def _free_push(self, _uuid: str) -> None:
+        if _uuid in self.free_uuids:
+            return
+        self.free_uuids.add(_uuid)
+        if self._checksum:
+            self._free_sum = (self._free_sum + hash(_uuid)) & _MASK64
+        if (queue := self._queue) is not None:
+            self._sequence += 1
+            self._stamps[_uuid] = self._sequence
+            queue.append((self._sequence, _uuid))
+            if len(queue) > 2 * len(self.free_uuids) + 64:
+                stamps = self._stamps
+                self._queue = deque(i for i in queue if stamps.get(i[1]) == i[0])
+
+    def _free_discard(self, _uuid: str) -> None:
+        if _uuid in self.free_uuids:
+            self.free_uuids.remove(_uuid)
+            if self._checksum:
+                self._free_sum = (self._free_sum - hash(_uuid)) & _MASK64
+            self._stamps.pop(_uuid, None)
+
+    def _free_pop(self) -> str:
+        """按free_order取出一个空闲uuid, 调用前须保证free_uuids非空"""
+        if (queue := self._queue) is not None:
+            pop = queue.pop if self.free_order == "lifo" else queue.popleft
+            stamps, free = self._stamps, self.free_uuids
+            while queue:
+                sequence, _uuid = pop()
+                if stamps.get(_uuid) == sequence and _uuid in free:
+                    self._free_discard(_uuid)
+                    return _uuid
+        # 没有空闲队列, 或队列与集合不同步 (例如直接替换了free_uuids) 时退回到集合的任意顺序
+        _uuid = self.free_uuids.pop()
+        if self._checksum:
+            self._free_sum = (self._free_sum - hash(_uuid)) & _MASK64
+        self._stamps.pop(_uuid, None)
+        return _uuid
+
+    def _mapping_set(self, _uuid: str, _value: T) -> None:
+        if self._checksum and _uuid not in self.mapping:
+            self._mapping_sum = (self._mapping_sum + hash(_uuid)) & _MASK64
+        self.mapping[_uuid] = _value
+
+    def _mapping_pop(self, _uuid: str) -> T:
+        if self._checksum:
+            self._mapping_sum = (self._mapping_sum - hash(_uuid)) & _MASK64
+        return self.mapping.pop(_uuid)
+
+    def _verify(self) -> None:
+        if self._debug and not self.quick_check():
+            raise SemanticException("uuid space invariant violated")
+
+    # ========== 查询 ==========
 
     def has_uuid(self, _uuid: str) -> bool:
         return _uuid in self.uuids
@@ -34,64 +297,113 @@ class UUIDSpace(Generic[T]):
     def is_mapped(self, _uuid: str) -> bool:
         return _uuid in self.mapping
 
+    # ========== 修改 ==========
+    # 各方法的快速路径与加入空闲队列/校验和之前的实现相同
+
     def generate(self) -> str:
-        _uuid = new_uuid()
-        self.uuids.add(_uuid)
-        self.free_uuids.add(_uuid)
+        _uuid = self._new_uuid()
+        if self._plain:
+            self.uuids.add(_uuid)
+            self.free_uuids.add(_uuid)
+            return _uuid
+        self._uuids_add(_uuid)
+        self._free_push(_uuid)
+        self._verify()
         return _uuid
 
     def generate_uuids(self, nums: int = 1) -> list[str]:
         if not isinstance(nums, int) or nums < 0:
             raise UnsupportedException(f"'nums' must be a positive integer, but received {type(nums)}({nums}).")
 
-        result = [new_uuid() for _ in range(nums)]
-        self.uuids.update(result)
-        self.free_uuids.update(result)
+        if self.generator is None:
+            result = [new_uuid() for _ in range(nums)]
+        else:
+            result = self.generator.batch(nums)
+        if self._plain:
+            self.uuids.update(result)
+            self.free_uuids.update(result)
+            return result
+        for _uuid in result:
+            self._uuids_add(_uuid)
+            self._free_push(_uuid)
+        self._verify()
         return result
 
     def generate_and_custom(self, _value: T) -> str:
-        _uuid = new_uuid()
-        self.uuids.add(_uuid)
-        self.mapping[_uuid] = _value
+        _uuid = self._new_uuid()
+        if self._plain:
+            self.uuids.add(_uuid)
+            self.mapping[_uuid] = _value
+            return _uuid
+        self._uuids_add(_uuid)
+        self._mapping_set(_uuid, _value)
+        self._verify()
         return _uuid
 
     def custom(self, _value: T) -> str:
         if not self.free_uuids:
             return self.generate_and_custom(_value)
 
-        _uuid = self.free_uuids.pop()
-        self.mapping[_uuid] = _value
+        if self._plain:
+            _uuid = self.free_uuids.pop()
+            self.mapping[_uuid] = _value
+            return _uuid
+        _uuid = self._free_pop()
+        self._mapping_set(_uuid, _value)
+        self._verify()
         return _uuid
 
     def custom_uuid(self, _uuid: str, _value: T) -> None:
         if self.is_mapped(_uuid):
             raise MalformedException(f"uuid {_uuid} already exists in this uuid space.")
 
+        if self._plain:
+            if _uuid in self.uuids:
+                self.free_uuids.remove(_uuid)
+            else:
+                self.uuids.add(_uuid)
+            self.mapping[_uuid] = _value
+            return
         if self.has_uuid(_uuid):
-            self.free_uuids.remove(_uuid)
+            self._free_discard(_uuid)
         else:
-            self.uuids.add(_uuid)
-        self.mapping[_uuid] = _value
+            self._uuids_add(_uuid)
+        self._mapping_set(_uuid, _value)
+        self._verify()
 
     def add_uuid(self, _uuid: str) -> None:
         if not self.has_uuid(_uuid):
-            self.uuids.add(_uuid)
-            self.free_uuids.add(_uuid)
+            if self._plain:
+                self.uuids.add(_uuid)
+                self.free_uuids.add(_uuid)
+                return
+            self._uuids_add(_uuid)
+            self._free_push(_uuid)
+            self._verify()
 
     def delete_uuid(self, _uuid: str) -> None:
         self.forced_free(_uuid)
 
         if self.has_uuid(_uuid):
-            self.uuids.remove(_uuid)
-            self.free_uuids.remove(_uuid)
+            if self._plain:
+                self.uuids.remove(_uuid)
+                self.free_uuids.remove(_uuid)
+                return
+            self._uuids_remove(_uuid)
+            self._free_discard(_uuid)
+            self._verify()
 
     def forced_free(self, _uuid: str, default: Optional[T] = None) -> Optional[T]:
-        if self.is_mapped(_uuid):
-            r = self.mapping[_uuid]
-            del self.mapping[_uuid]
-            self.free_uuids.add(_uuid)
+        if _uuid in self.mapping:
+            if self._plain:
+                r = self.mapping.pop(_uuid)
+                self.free_uuids.add(_uuid)
+                return r
+            r = self._mapping_pop(_uuid)
+            self._free_push(_uuid)
+            self._verify()
             return r
-        return None
+        return default
 
     def get_value(self, _uuid: str, default: Optional[T] = None) -> Optional[T]:
         return self.mapping.get(_uuid, default)
@@ -100,6 +412,10 @@ class UUIDSpace(Generic[T]):
         self.uuids.clear()
         self.free_uuids.clear()
         self.mapping.clear()
+        self._stamps.clear()
+        if self._queue is not None:
+            self._queue.clear()
+        self._uuids_sum = self._free_sum = self._mapping_sum = 0
 
     @property
     def uuids_set(self) -> set[str]:
@@ -117,6 +433,39 @@ class UUIDSpace(Generic[T]):
     def __repr__(self) -> str:
         return f"UUIDSpace(length={len(self.uuids)})"
 
+    # ========== 一致性检测 ==========
+
+    def quick_check(self) -> bool:
+        """
+        O(1) 的一致化假设检测 (须启用checksum, 否则退回到 invariant_check)
+
+        (1)(2) 同时成立 <=> |uuids| = |free_uuids| + |mapping| 且三者互相对应;
+        后者以增量维护的哈希校验和近似检验 (误判概率约为 2**-64).
+        直接替换内部容器后须先调用 rebuild_checksums()
+        """
+        if not self._checksum:
+            return self.invariant_check()
+        return (
+            len(self.uuids) == len(self.free_uuids) + len(self.mapping) and
+            self._uuids_sum == (self._free_sum + self._mapping_sum) & _MASK64
+        )
+
+    def rebuild_checksums(self) -> None:
+        """按当前容器内容重新计算校验和 (并启用checksum) 与空闲队列 (直接修改内部容器后调用)"""
+        self._checksum = True
+        self._update_plain()
+        self._rebuild_sums()
+        self._stamps.clear()
+        if self._queue is not None:
+            self._queue = deque(enumerate(self.free_uuids, self._sequence + 1))
+            self._stamps.update((u, i) for i, u in self._queue)
+            self._sequence += len(self._queue)
+
+    def _rebuild_sums(self) -> None:
+        self._uuids_sum = sum(map(hash, self.uuids)) & _MASK64
+        self._free_sum = sum(map(hash, self.free_uuids)) & _MASK64
+        self._mapping_sum = sum(map(hash, self.mapping)) & _MASK64
+
     def invariant_check(self) -> bool:
         """一致化假设检测函数, 在测试中被使用"""
         # 检查条件1: free_uuids ∪ mapping.keys() = uuids
@@ -129,4 +478,299 @@ class UUIDSpace(Generic[T]):
         if intersection_set:
             return False
 
-        return True
\ No newline at end of file
+        return True
+
+UUIDKey = Union[str, int]
+
+class IntUUIDSpace(Generic[T]):
+    """
+    以128位整数存储uuid的空间, 接口与 UUIDSpace 对应
+
+    * 只保存 free_uuids 与 mapping 两部分, uuids 由二者的并集导出, 一致化假设 (1) 因此恒成立;
+    假设 (2) free_uuids ∩ mapping.keys() = {} 由各方法维护.
+    * 参数既可以是标准形式的字符串也可以是整数; 返回值均为整数,
+    只有 uuids_set / serialize 等边界方法才渲染为字符串 (见 int_to_uuid)
+    """
+
+    def __init__(self, generator: Optional[UUIDGenerator] = None) -> None:
+        if generator is not None and not isinstance(generator, UUIDGenerator):
+            raise UnsupportedException(f"'generator' must be a UUIDGenerator, but received {type(generator)}.")
+        self.free_uuids: set[int] = set()
+        self.mapping: dict[int, T] = {}
+        self.generator = generator if generator is not None else UUIDGenerator()
+
+    @property
+    def uuids(self) -> set[int]:
+        """所有uuid (free_uuids ∪ mapping.keys() 的快照)"""
+        return self.free_uuids.union(self.mapping)
+
+    def has_uuid(self, _uuid: UUIDKey) -> bool:
+        n = uuid_to_int(_uuid)
+        return n in self.free_uuids or n in self.mapping
+
+    def is_free(self, _uuid: UUIDKey) -> bool:
+        return uuid_to_int(_uuid) in self.free_uuids
+
+    def is_mapped(self, _uuid: UUIDKey) -> bool:
+        return uuid_to_int(_uuid) in self.mapping
+
+    def generate(self) -> int:
+        n = self.generator.next_int()
+        if n not in self.mapping:
+            self.free_uuids.add(n)
+        return n
+
+    def generate_uuids(self, nums: int = 1) -> list[int]:
+        if not isinstance(nums, int) or nums < 0:
+            raise UnsupportedException(f"'nums' must be a positive integer, but received {type(nums)}({nums}).")
+
+        result = self.generator.batch_int(nums)
+        mapping = self.mapping
+        self.free_uuids.update(i for i in result if i not in mapping)
+        return result
+
+    def generate_and_custom(self, _value: T) -> int:
+        n = self.generator.next_int()
+        self.free_uuids.discard(n)
+        self.mapping[n] = _value
+        return n
+
+    def custom(self, _value: T) -> int:
+        if not self.free_uuids:
+            return self.generate_and_custom(_value)
+
+        n = self.free_uuids.pop()
+        self.mapping[n] = _value
+        return n
+
+    def custom_uuid(self, _uuid: UUIDKey, _value: T) -> None:
+        n = uuid_to_int(_uuid)
+        if n in self.mapping:
+            raise MalformedException(f"uuid {int_to_uuid(n)} already exists in this uuid space.")
+
+        self.free_uuids.discard(n)
+        self.mapping[n] = _value
+
+    def add_uuid(self, _uuid: UUIDKey) -> None:
+        n = uuid_to_int(_uuid)
+        if n not in self.mapping:
+            self.free_uuids.add(n)
+
+    def delete_uuid(self, _uuid: UUIDKey) -> None:
+        n = uuid_to_int(_uuid)
+        self.mapping.pop(n, None)
+        self.free_uuids.discard(n)
+
+    def forced_free(self, _uuid: UUIDKey, default: Optional[T] = None) -> Optional[T]:
+        n = uuid_to_int(_uuid)
+        if n in self.mapping:
+            self.free_uuids.add(n)
+            return self.mapping.pop(n)
+        return default
+
+    def get_value(self, _uuid: UUIDKey, default: Optional[T] = None) -> Optional[T]:
+        return self.mapping.get(uuid_to_int(_uuid), default)
+
+    def clear(self) -> None:
+        self.free_uuids.clear()
+        self.mapping.clear()
+
+    @property
+    def uuids_set(self) -> set[str]:
+        """所有uuid的字符串形式"""
+        return {int_to_uuid(i) for i in self}
+
+    def serialize(self) -> dict:
+        return {
+            "free": [int_to_uuid(i) for i in self.free_uuids],
+            "mapping": {int_to_uuid(i): j for i, j in self.mapping.items()},
+        }
+
+    def __contains__(self, _uuid: UUIDKey) -> bool:
+        return self.has_uuid(_uuid)
+
+    def __len__(self) -> int:
+        return len(self.free_uuids) + len(self.mapping)
+
+    def __iter__(self) -> Iterator[int]:
+        return chain(self.free_uuids, self.mapping)
+
+    def __repr__(self) -> str:
+        return f"IntUUIDSpace(length={len(self)})"
+
+    def invariant_check(self) -> bool:
+        """一致化假设检测函数; uuids为导出值, 只需检查假设 (2), 且不构造临时集合"""
+        return self.free_uuids.isdisjoint(self.mapping)
+
+class ShardedUUIDSpace(Generic[T]):
+    """
+    线程安全的分片uuid空间
+
+    uuid按 hash(uuid) % shards 划分到若干个各自加锁的 UUIDSpace 中,
+    单个uuid上的操作 (generate, custom_uuid, forced_free, get_value 等) 只竞争一个分片的锁;
+    custom() 从当前线程的首选分片开始寻找空闲uuid. len/迭代/检测逐个分片加锁汇总, 结果不是全局原子快照.
+
+    * 给出generator时, 其调用由一个独立的锁保护 (生成器本身不保证线程安全)
+    * free_order 与 checksum 原样传给每个分片, 见 UUIDSpace
+    """
+
+    def __init__(self, shards: int = 16, generator: Optional[UUIDGenerator] = None, free_order: Optional[str] = None,
+                 checksum: bool = False) -> None:
+        if not isinstance(shards, int) or shards <= 0:
+            raise UnsupportedException(f"'shards' must be a positive integer, but received {type(shards)}({shards}).")
+        if generator is not None and not isinstance(generator, UUIDGenerator):
+            raise UnsupportedException(f"'generator' must be a UUIDGenerator, but received {type(generator)}.")
+        self.shards: list[UUIDSpace[T]] = [UUIDSpace(free_order = free_order, checksum = checksum) for _ in range(shards)]
+        self.locks = [threading.Lock() for _ in range(shards)]
+        self.generator = generator
+        self._generator_lock = threading.Lock()
+        self._local = threading.local()
+        self._next_home = count()
+
+    def _new_uuid(self) -> str:
+        if self.generator is None:
+            return new_uuid()
+        with self._generator_lock:
+            return self.generator()
+
+    def _index(self, _uuid: str) -> int:
+        return hash(_uuid) % len(self.shards)
+
+    def _home(self) -> int:
+        """当前线程的首选分片 (按线程轮流分配)"""
+        try:
+            return self._local.home
+        except AttributeError:
+            home = self._local.home = next(self._next_home) % len(self.shards)
+            return home
+
+    # ========== 查询 ==========
+
+    def has_uuid(self, _uuid: str) -> bool:
+        i = self._index(_uuid)
+        with self.locks[i]:
+            return self.shards[i].has_uuid(_uuid)
+
+    def is_free(self, _uuid: str) -> bool:
+        i = self._index(_uuid)
+        with self.locks[i]:
+            return self.shards[i].is_free(_uuid)
+
+    def is_mapped(self, _uuid: str) -> bool:
+        i = self._index(_uuid)
+        with self.locks[i]:
+            return self.shards[i].is_mapped(_uuid)
+
+    def get_value(self, _uuid: str, default: Optional[T] = None) -> Optional[T]:
+        i = self._index(_uuid)
+        with self.locks[i]:
+            return self.shards[i].get_value(_uuid, default)
+
+    # ========== 修改 ==========
+
+    def generate(self) -> str:
+        _uuid = self._new_uuid()
+        self.add_uuid(_uuid)
+        return _uuid
+
+    def generate_uuids(self, nums: int = 1) -> list[str]:
+        if not isinstance(nums, int) or nums < 0:
+            raise UnsupportedException(f"'nums' must be a positive integer, but received {type(nums)}({nums}).")
+
+        if self.generator is None:
+            result = [new_uuid() for _ in range(nums)]
+        else:
+            with self._generator_lock:
+                result = self.generator.batch(nums)
+        groups: dict[int, list[str]] = {}
+        for _uuid in result:
+            groups.setdefault(self._index(_uuid), []).append(_uuid)
+        for i, group in groups.items():
+            with self.locks[i]:
+                for _uuid in group:
+                    self.shards[i].add_uuid(_uuid)
+        return result
+
+    def generate_and_custom(self, _value: T) -> str:
+        _uuid = self._new_uuid()
+        self.custom_uuid(_uuid, _value)
+        return _uuid
+
+    def custom(self, _value: T) -> str:
+        n, home = len(self.shards), self._home()
+        for k in range(n):
+            i = (home + k) % n
+            shard = self.shards[i]
+            if not shard.free_uuids:
+                continue
+            with self.locks[i]:
+                if shard.free_uuids:
+                    return shard.custom(_value)
+        return self.generate_and_custom(_value)
+
+    def custom_uuid(self, _uuid: str, _value: T) -> None:
+        i = self._index(_uuid)
+        with self.locks[i]:
+            self.shards[i].custom_uuid(_uuid, _value)
+
+    def add_uuid(self, _uuid: str) -> None:
+        i = self._index(_uuid)
+        with self.locks[i]:
+            self.shards[i].add_uuid(_uuid)
+
+    def delete_uuid(self, _uuid: str) -> None:
+        i = self._index(_uuid)
+        with self.locks[i]:
+            self.shards[i].delete_uuid(_uuid)
+
+    def forced_free(self, _uuid: str, default: Optional[T] = None) -> Optional[T]:
+        i = self._index(_uuid)
+        with self.locks[i]:
+            return self.shards[i].forced_free(_uuid, default)
+
+    def clear(self) -> None:
+        for lock, shard in zip(self.locks, self.shards):
+            with lock:
+                shard.clear()
+
+    # ========== 汇总 ==========
+
+    @property
+    def uuids_set(self) -> set[str]:
+        result: set[str] = set()
+        for lock, shard in zip(self.locks, self.shards):
+            with lock:
+                result.update(shard.uuids)
+        return result
+
+    def __contains__(self, _uuid: str) -> bool:
+        return self.has_uuid(_uuid)
+
+    def __len__(self) -> int:
+        total = 0
+        for lock, shard in zip(self.locks, self.shards):
+            with lock:
+                total += len(shard)
+        return total
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.uuids_set)
+
+    def __repr__(self) -> str:
+        return f"ShardedUUIDSpace(shards={len(self.shards)}, length={len(self)})"
+
+    def quick_check(self) -> bool:
+        """逐个分片执行一致化假设检测, 启用checksum时每个分片为 O(1)"""
+        for lock, shard in zip(self.locks, self.shards):
+            with lock:
+                if not shard.quick_check():
+                    return False
+        return True
+
+    def invariant_check(self) -> bool:
+        """一致化假设检测函数, 同时检查每个uuid是否位于正确的分片"""
+        for i, (lock, shard) in enumerate(zip(self.locks, self.shards)):
+            with lock:
+                if not shard.invariant_check() or any(self._index(u) != i for u in shard.uuids):
+                    return False
+        return True
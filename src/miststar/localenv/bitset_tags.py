@@ -0,0 +1,299 @@
+# create by lesomras on 2026-10-17
+from __future__ import annotations
+from collections.abc import MutableSet
+from typing import Optional, Iterable, Iterator
+
+from .entity import Entity
+from .slots import SlotMap
+from .tag import LocalTags
+
+# 每个分块覆盖 2**CHUNK_SHIFT 个槽位; 分块越小, 单次置位时复制的整数越短
+CHUNK_SHIFT = 10
+CHUNK_MASK = (1 << CHUNK_SHIFT) - 1
+
+class TagView(MutableSet[str]):
+    """
+    BitsetTags 模式下 Entity.tags 的视图
+
+    标签只存放在 BitsetTags 的位掩码中, 视图记录实体的槽位, 读写都转交给 BitsetTags
+    """
+    __slots__ = ("_owner", "_entity", "_slot")
+
+    def __init__(self, owner: BitsetTags, entity: Entity, slot: int) -> None:
+        self._owner = owner
+        self._entity = entity
+        self._slot = slot
+
+    def __contains__(self, tag: object) -> bool:
+        tid = self._owner.tag_ids.get(tag)  # type: ignore[call-overload]
+        return tid is not None and (self._owner.masks[self._slot] >> tid) & 1 == 1
+
+    def __iter__(self) -> Iterator[str]:
+        names, mask = self._owner.tag_names, self._owner.masks[self._slot]
+        return iter([names[i] for i in _bits(mask)])
+
+    def __len__(self) -> int:
+        return self._owner.masks[self._slot].bit_count()
+
+    def add(self, tag: str) -> None:
+        self._owner.tag_add(self._entity, tag)
+
+    def discard(self, tag: str) -> None:
+        self._owner.tag_remove(self._entity, tag)
+
+    def __repr__(self) -> str:
+        return repr(set(self))
+
+def _bits(n: int) -> Iterator[int]:
+    """按升序遍历整数n中为1的位"""
+    while n:
+        low = n & -n
+        yield low.bit_length() - 1
+        n ^= low
+
+class BitsetTags(LocalTags):
+    """
+    以位图存储标签的 LocalTags
+
+    标签名被驻留为从0开始的整数id; 每个槽位 (与计分板共享的 SlotMap) 持有一个整数位掩码,
+    每个标签持有一个分块位图 (块号 -> 该块内的位图整数, 空块不保存).
+    tag_add/tag_remove/has_tag 均为 O(1), 且不需要对实体求哈希;
+    实体的 tags 属性被替换为 TagView, 不再单独保存一份标签集合
+    """
+
+    def __init__(self, slots: Optional[SlotMap] = None) -> None:
+        self.slots = slots if slots is not None else SlotMap()
+        # tag -> id / id -> tag
+        self.tag_ids: dict[str, int] = {}
+        self.tag_names: list[str] = []
+        # slot -> 标签位掩码
+        self.masks: list[int] = []
+        # tag id -> {块号: 位图}
+        self.bitmaps: list[dict[int, int]] = []
+        # 写时复制: masks整体共享, 各标签的位图按代复制, 见 LocalTags._own
+        self._epoch = 0
+        self._owned: dict[int, int] = {}  # type: ignore[assignment]
+        self._masks_shared = False
+        self.journal = None
+
+    # ========== 存储原语 ==========
+
+    def _intern(self, tag: str) -> int:
+        if (tid := self.tag_ids.get(tag)) is None:
+            tid = self.tag_ids[tag] = len(self.tag_names)
+            self.tag_names.append(tag)
+            self.bitmaps.append({})
+            self._owned[tid] = self._epoch
+        return tid
+
+    def _slot(self, entity: Entity) -> int:
+        """获取entity的槽位, 首次见到时分配槽位并将其 tags 替换为 TagView"""
+        tags = entity.tags
+        if isinstance(tags, TagView) and tags._owner is self:
+            return tags._slot
+
+        slot = self.slots.slot_of(entity)
+        if slot >= len(self.masks):
+            if self._masks_shared:
+                self._own_masks()
+            self.masks.extend([0] * (self.slots.capacity - len(self.masks)))
+        entity.tags = TagView(self, entity, slot)  # type: ignore[assignment]
+        for tag in tags:
+            self._set(slot, self._intern(tag))
+        return slot
+
+    def _find(self, entity: Entity) -> Optional[int]:
+        """查找entity的槽位, 未被本对象管理时返回None"""
+        tags = entity.tags
+        if isinstance(tags, TagView) and tags._owner is self:
+            return tags._slot
+        return None
+
+    def _set(self, slot: int, tid: int) -> None:
+        if self._masks_shared:
+            self._own_masks()
+        self.masks[slot] |= 1 << tid
+        bitmap = self._own_bitmap(tid)
+        chunk = slot >> CHUNK_SHIFT
+        bitmap[chunk] = bitmap.get(chunk, 0) | (1 << (slot & CHUNK_MASK))
+
+    def _unset(self, slot: int, tid: int) -> None:
+        if self._masks_shared:
+            self._own_masks()
+        self.masks[slot] &= ~(1 << tid)
+        bitmap = self._own_bitmap(tid)
+        chunk = slot >> CHUNK_SHIFT
+        if bits := bitmap[chunk] & ~(1 << (slot & CHUNK_MASK)):
+            bitmap[chunk] = bits
+        else:
+            del bitmap[chunk]
+
+    # ========== 快照 (写时复制) ==========
+
+    def _own_masks(self) -> None:
+        self.masks = list(self.masks)
+        self._masks_shared = False
+
+    def _own_bitmap(self, tid: int) -> dict[int, int]:
+        bitmap = self.bitmaps[tid]
+        if self._owned.get(tid) != self._epoch:
+            bitmap = self.bitmaps[tid] = dict(bitmap)
+            self._owned[tid] = self._epoch
+        return bitmap
+
+    def _snapshot(self) -> tuple:
+        self._epoch += 1
+        self._masks_shared = True
+        return self.masks, list(self.bitmaps)
+
+    def _restore(self, state: tuple) -> None:
+        # 标签id只增不减, 快照之后驻留的标签在恢复后没有任何实体
+        masks, bitmaps = state
+        self.masks = masks
+        self._masks_shared = True
+        self.bitmaps = list(bitmaps) + [{} for _ in range(len(self.tag_names) - len(bitmaps))]
+        self._epoch += 1
+
+    def _reattach(self, gone: Iterable[Entity], returned: Iterable[Entity]) -> None:
+        for entity in gone:
+            if self._find(entity) is not None:
+                entity.tags = set()
+        for entity in returned:
+            slot = self.slots.find(entity.uuid)
+            if slot is not None and slot < len(self.masks) and self._find(entity) is None:
+                entity.tags = TagView(self, entity, slot)  # type: ignore[assignment]
+
+    # ========== LocalTags 接口 ==========
+
+    @property
+    def tags(self) -> set[str]:  # type: ignore[override]
+        """出现过的所有标签"""
+        return set(self.tag_names)
+
+    @property
+    def entities(self) -> dict[str, set[Entity]]:  # type: ignore[override]
+        """以 tag -> 实体集合 的形式导出 (只读快照, 兼容 LocalTags)"""
+        return {
+            self.tag_names[tid]: set(self._entities_of(bitmap))
+            for tid, bitmap in enumerate(self.bitmaps) if bitmap
+        }
+
+    def has_tag(self, entity: Entity, tag: str) -> bool:
+        """检测entity上是否存在tag标签"""
+        if (slot := self._find(entity)) is None or (tid := self.tag_ids.get(tag)) is None:
+            return False
+        return (self.masks[slot] >> tid) & 1 == 1
+
+    def tag_add(self, entity: Entity, tag: str) -> None:
+        """给entity增加一个tag标签"""
+        slot, tid = self._slot(entity), self._intern(tag)
+        if not (self.masks[slot] >> tid) & 1:
+            self._set(slot, tid)
+            if self.journal is not None:
+                self.journal._tag(entity, tag, True)
+
+    def tag_remove(self, entity: Entity, tag: str) -> None:
+        """去除entity上的tag标签"""
+        if (slot := self._find(entity)) is None or (tid := self.tag_ids.get(tag)) is None:
+            return
+        if (self.masks[slot] >> tid) & 1:
+            self._unset(slot, tid)
+            if self.journal is not None:
+                self.journal._tag(entity, tag, False)
+
+    def tag_clear(self, entity: Entity) -> None:
+        """去除entity上的所有标签, 并将其 tags 还原为普通集合 (槽位随后可能被其他实体复用)"""
+        if (slot := self._find(entity)) is None:
+            return
+        for tid in _bits(self.masks[slot]):
+            self._unset(slot, tid)
+            if self.journal is not None:
+                self.journal._tag(entity, self.tag_names[tid], False)
+        entity.tags = set()
+
+    # ========== 查询 ==========
+
+    def _entities_of(self, bitmap: dict[int, int]) -> Iterator[Entity]:
+        entities = self.slots.entities
+        for chunk in sorted(bitmap):
+            base = chunk << CHUNK_SHIFT
+            for i in _bits(bitmap[chunk]):
+                # 槽位释放时其位已被清除; 仍跳过空槽, 不让残留的位产出None
+                if (entity := entities[base + i]) is not None:
+                    yield entity
+
+    def _evaluate(self, include: list[str], exclude: list[str], untagged: bool, tagged: bool, universe: Optional[Iterable[Entity]]) -> Iterator[Entity]:
+        if untagged and (tagged or include):
+            return
+        tag_ids = self.tag_ids
+        # 否定条件中不存在的标签直接忽略
+        negative = 0
+        for tag in exclude:
+            if (tid := tag_ids.get(tag)) is not None:
+                negative |= 1 << tid
+
+        if universe is not None:
+            # 逐个检查槽位掩码, 保持universe的顺序
+            positive = 0
+            for tag in include:
+                if (tid := tag_ids.get(tag)) is None:
+                    return
+                positive |= 1 << tid
+            masks = self.masks
+            for entity in universe:
+                slot = self._find(entity)
+                mask = 0 if slot is None else masks[slot]
+                if (
+                    mask & positive == positive and
+                    not mask & negative and
+                    (not untagged or not mask) and
+                    (not tagged or mask)
+                ):
+                    yield entity
+            return
+
+        if untagged:
+            # 没有universe时无法得知未打标签的实体
+            return
+
+        if include:
+            bitmaps = []
+            for tag in include:
+                if (tid := tag_ids.get(tag)) is None:
+                    return
+                bitmaps.append(self.bitmaps[tid])
+            # 从块数最少的位图开始逐块求交
+            bitmaps.sort(key = len)
+            result = dict(bitmaps[0])
+            for bitmap in bitmaps[1:]:
+                for chunk, bits in list(result.items()):
+                    if bits := bits & bitmap.get(chunk, 0):
+                        result[chunk] = bits
+                    else:
+                        del result[chunk]
+                if not result:
+                    return
+        else:
+            result = {}
+            for bitmap in self.bitmaps:
+                for chunk, bits in bitmap.items():
+                    result[chunk] = result.get(chunk, 0) | bits
+
+        for tid in _bits(negative):
+            bitmap = self.bitmaps[tid]
+            for chunk, bits in list(result.items()):
+                if chunk in bitmap:
+                    if bits := bits & ~bitmap[chunk]:
+                        result[chunk] = bits
+                    else:
+                        del result[chunk]
+
+        yield from self._entities_of(result)
+
+    def _tag_members(self) -> Iterator[tuple[str, Iterable[Entity]]]:
+        # 按槽位顺序输出, 不经过集合
+        names = self.tag_names
+        return ((names[tid], self._entities_of(bitmap)) for tid, bitmap in enumerate(self.bitmaps) if bitmap)
+
+    def __repr__(self) -> str:
+        return f"BitsetTags(tags={len(self.tag_names)}, slots={len(self.masks)})"
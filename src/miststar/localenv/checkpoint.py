@@ -0,0 +1,123 @@
+# create by lesomras on 2026-10-17
+from __future__ import annotations
+from typing import TYPE_CHECKING, Optional
+from pathlib import Path
+import json
+
+from .journal import Journal
+
+if TYPE_CHECKING:
+    from .localenv import LocalEnv
+
+def _fragment(key: str, value) -> str:
+    """{key: value} 以 indent=2 序列化后去掉外层大括号的部分, 即顶层字典中的一项"""
+    return json.dumps({key: value}, indent = 2, ensure_ascii = False)[2:-2]
+
+def _splice(fragments: list[str]) -> str:
+    """将_fragment生成的各项拼接为完整的顶层字典"""
+    if not fragments:
+        return "{}"
+    return "{\n" + ",\n".join(fragments) + "\n}"
+
+class SerializationCache(object):
+    """
+    增量序列化 LocalEnv 的状态, 用于频繁的存档
+
+    缓存每个计分项与每个实体序列化后的json片段, 并以观察者的身份 (见 Journal.watchers) 收集
+    上次存档后被修改过的计分项/实体, 只重新序列化这些部分, 其余片段直接拼接.
+    观察者只记录名称与uuid, 每次存档时清空, 不会启用日志的记录与撤销栈.
+    输出与 JsonSerializer.dumps 的结果完全一致.
+    实体名称等不经过 players_*/tag_* 的修改不会被察觉, 需要时调用invalidate; 不再使用时调用close
+    """
+
+    def __init__(self, env: LocalEnv) -> None:
+        self.env = env
+        # objective / uuid -> json片段, 不在其中即为脏
+        self.objectives: dict[str, str] = {}
+        self.entities: dict[str, str] = {}
+        # 上次存档后被修改的计分项 / 实体
+        self._dirty: tuple[set[str], set[str]] = (set(), set())
+        self._journal: Optional[Journal] = None
+        self._restores = 0
+
+    def invalidate(self) -> None:
+        """丢弃所有缓存的片段"""
+        self.objectives.clear()
+        self.entities.clear()
+
+    def close(self) -> None:
+        """注销观察者, 此后的存档将重新序列化全部内容"""
+        self.env._unwatch(self._dirty)
+        self._journal = None
+        self.invalidate()
+
+    def _collect(self) -> None:
+        """丢弃上次之后被修改过的计分项与实体的片段"""
+        env = self.env
+        objectives, entities = self._dirty
+        if env.journal is None or env.journal is not self._journal or env._restores != self._restores:
+            # 日志对象被替换过或环境被恢复到快照, 无法得知修改了什么
+            self._journal = env._watch(self._dirty)
+            self._restores = env._restores
+            self.invalidate()
+        else:
+            cache = self.objectives
+            for objective in objectives:
+                cache.pop(objective, None)
+            cache = self.entities
+            for u in entities:
+                cache.pop(u, None)
+        objectives.clear()
+        entities.clear()
+
+    # ========== 计分板 ==========
+
+    def dumps_scoreboards(self) -> str:
+        """等价于 JsonSerializer.dumps(env.scoreboard.serialize())"""
+        self._collect()
+        cache = self.objectives
+        fragments = []
+        for objective, board in self.env.scoreboard.mapping.items():
+            if (fragment := cache.get(objective)) is None:
+                fragment = cache[objective] = _fragment(*board.group_serialize())
+            fragments.append(fragment)
+        if len(cache) > len(fragments):
+            for objective in cache.keys() - self.env.scoreboard.mapping.keys():
+                del cache[objective]
+        return _splice(fragments)
+
+    def dump_scoreboards(self, file_path: str | Path) -> None:
+        """等价于 JsonSerializer.dump(env.scoreboard.serialize(), file_path)"""
+        self._write(self.dumps_scoreboards(), file_path)
+
+    # ========== 实体 ==========
+
+    def dumps_entities(self) -> str:
+        """等价于 JsonSerializer.dumps(env.serialize_entities())"""
+        self._collect()
+        cache = self.entities
+        fragments = []
+        live: set[str] = set()
+        for entity in self.env.registry:
+            if (fragment := cache.get(u := entity.uuid)) is None:
+                fragment = cache[u] = _fragment(*entity.group_serialize())
+            fragments.append(fragment)
+            live.add(u)
+        if len(cache) > len(live):
+            for u in cache.keys() - live:
+                del cache[u]
+        return _splice(fragments)
+
+    def dump_entities(self, file_path: str | Path) -> None:
+        """将dumps_entities的结果保存到文件"""
+        self._write(self.dumps_entities(), file_path)
+
+    @staticmethod
+    def _write(text: str, file_path: str | Path) -> None:
+        path = Path(file_path)
+        path.parent.mkdir(parents = True, exist_ok = True)
+        with open(path, 'w', encoding = 'utf-8') as f:
+            f.write(text)
+
+    def __repr__(self) -> str:
+        return f"SerializationCache(objectives={len(self.objectives)}, entities={len(self.entities)})"
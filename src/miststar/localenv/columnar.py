@@ -0,0 +1,252 @@
+# create by lesomras on 2026-10-17
+from __future__ import annotations
+from array import array
+from typing import Optional, Iterator, Callable, Sequence
+from random import randint
+
+from .entity import Entity
+from .scoreboard import Scoreboard
+from .slots import SlotMap
+from .score_index import ScoreIndex
+from .journal import Journal
+from miststar.internal.exceptions import ReferenceNotFoundException, MalformedException
+from miststar.internal.int32 import Int32, checking32, wrap32, Integer
+from miststar.internal.int32_array import TYPECODE
+
+class ColumnarScoreboard(Scoreboard):
+    """
+    列式存储的计分板
+
+    分数连续存放在 array('i') 中, 下标为 SlotMap 分配的槽位;
+    present 记录该槽位在本计分项中是否有分数. 每个分数只占用4字节 (外加1字节标记)
+    """
+
+    def __init__(self, objective: str, display_name: str = "", slots: Optional[SlotMap] = None) -> None:
+        self.objective = objective
+        self.display_name = display_name
+        self.slots = slots if slots is not None else SlotMap()
+        self.values = array(TYPECODE)
+        self.present = bytearray()
+        self.index: Optional[ScoreIndex] = None
+        self._shared = False
+        self.journal: Optional[Journal] = None
+
+    # ========== 存储原语 ==========
+
+    def _reserve(self, slot: int) -> None:
+        """保证数组覆盖到slot"""
+        if slot >= len(self.present):
+            n = self.slots.capacity - len(self.present)
+            self.values.frombytes(bytes(n * self.values.itemsize))
+            self.present.extend(bytes(n))
+
+    def _find(self, entity: Entity) -> Optional[int]:
+        """查找entity在本计分项中的槽位, 没有分数时返回None"""
+        slot = self.slots.find(entity.uuid)
+        if slot is None or slot >= len(self.present) or not self.present[slot]:
+            return None
+        return slot
+
+    def _store(self, entity: Entity, value: int) -> None:
+        if self._shared:
+            self._own()
+        slot = self.slots.slot_of(entity)
+        self._reserve(slot)
+        if not self.present[slot]:
+            if self.index is not None:
+                self.index.add(value, entity.uuid)
+            if self.journal is not None:
+                self.journal._score(self.objective, entity, entity.uuid, None, value)
+            self.present[slot] = 1
+            entity._objectives[self.objective] = self
+        else:
+            if self.index is not None:
+                self.index.move(entity.uuid, self.values[slot], value)
+            if self.journal is not None and self.values[slot] != value:
+                self.journal._score(self.objective, entity, entity.uuid, self.values[slot], value)
+        self.values[slot] = value
+
+    def _get_raw(self, entity: Entity) -> Optional[int]:
+        slot = self._find(entity)
+        return None if slot is None else self.values[slot]
+
+    def _set_raw(self, entity: Entity, value: int) -> None:
+        self._store(entity, value)
+
+    def iter_slots(self) -> Iterator[int]:
+        """按槽位顺序遍历本计分项中有分数的槽位"""
+        present = self.present
+        start = present.find(1)
+        while start != -1:
+            yield start
+            start = present.find(1, start + 1)
+
+    # ========== players_* ==========
+
+    def has_entity(self, entity: Entity) -> bool:
+        """检测entity是否在scoreboard中"""
+        return self._find(entity) is not None
+
+    def get_scoreboard_value(self, entity: Entity) -> Int32:
+        if (slot := self._find(entity)) is None:
+            raise ReferenceNotFoundException(f"no entity found with uuid as {entity.uuid}")
+        return Int32(self.values[slot])
+
+    def set_scoreboard_value(self, entity: Entity, value: Integer = 0) -> None:
+        if self._find(entity) is None:
+            raise ReferenceNotFoundException(f"no entity found with uuid as {entity.uuid}")
+        self._store(entity, wrap32(int(value)))
+
+    def players_set(self, entity: Entity, count: Integer = 0) -> None:
+        """直接设定entity在scoreboard中的值"""
+        if not checking32(count):
+            raise MalformedException("'count' must be a valid 32-bit integer")
+        self._store(entity, int(count))
+
+    def players_add(self, entity: Entity, count: Integer) -> None:
+        """将entity在scoreboard中存储的值与传入值相加"""
+        if not checking32(count):
+            raise MalformedException("'count' must be a valid 32-bit integer")
+        if (slot := self._find(entity)) is None:
+            self._store(entity, int(count))
+            return
+        self._store(entity, wrap32(self.values[slot] + int(count)))
+
+    def players_random(self, entity: Entity, _min: Integer, _max: Integer) -> Int32:
+        """在_min与_max随机选一个值作为entity的新值"""
+        if not checking32(_min):
+            raise MalformedException("min must be a valid 32-bit integer")
+        if not checking32(_max):
+            raise MalformedException("max must be a valid 32-bit integer")
+        if _min >= _max:
+            raise MalformedException("min must be less than max")
+        result = randint(int(_min), int(_max))
+        self._store(entity, result)
+        return Int32(result)
+
+    def players_reset(self, entity: Entity) -> None:
+        """删除entity在scoreboard中的数据条目"""
+        if (slot := self._find(entity)) is not None:
+            if self._shared:
+                self._own()
+            if self.index is not None:
+                self.index.remove(self.values[slot], entity.uuid)
+            if self.journal is not None:
+                self.journal._score(self.objective, entity, entity.uuid, self.values[slot], None)
+            self.present[slot] = 0
+            self.values[slot] = 0
+            if entity._objectives.get(self.objective) is self:
+                del entity._objectives[self.objective]
+
+    def _write_uuid(self, _uuid: str, value: Optional[int]) -> None:
+        # 列式计分板中的分数都有槽位, 实体总能由槽位找到; 找不到时也就没有分数可删
+        if (entity := self.slots.get(_uuid)) is not None:
+            if value is None:
+                self.players_reset(entity)
+            else:
+                self._store(entity, value)
+        elif value is not None:
+            raise ReferenceNotFoundException(f"no entity found with uuid as {_uuid}")
+
+    def _clear(self) -> None:
+        self.values = array(TYPECODE)
+        self.present = bytearray()
+        if self.index is not None:
+            if self._shared:
+                self.index = ScoreIndex()
+            else:
+                self.index.rebuild(())
+        self._shared = False
+
+    # ========== 批量操作 ==========
+
+    def _apply_many(self, entities: Optional[Sequence[Entity]], kernel: Callable[[int, int], Optional[int]], operand: int, track: Optional[Entity] = None) -> None:
+        """对一组entity的分数一次性应用kernel, 直接在数组列上原地计算"""
+        if self._shared:
+            self._own()
+        values, present, objective = self.values, self.present, self.objective
+        tracked = self.slots.find(track.uuid) if track is not None else None
+
+        if entities is None:
+            for slot in self.iter_slots():
+                if (r := kernel(values[slot], operand)) is not None:
+                    values[slot] = r
+                if slot == tracked:
+                    operand = values[slot]
+            return
+
+        slot_of = self.slots.slot_of
+        for entity in entities:
+            slot = slot_of(entity)
+            if slot >= len(present):
+                self._reserve(slot)
+            if not present[slot]:
+                r = kernel(0, operand)
+                values[slot] = 0 if r is None else r
+                present[slot] = 1
+                entity._objectives[objective] = self
+            elif (r := kernel(values[slot], operand)) is not None:
+                values[slot] = r
+            if slot == tracked:
+                operand = values[slot]
+
+    def _values_many(self, entities: Optional[Sequence[Entity]]) -> list[Optional[int]]:
+        values = self.values
+        if entities is None:
+            return [values[slot] for slot in self.iter_slots()]
+        return [None if (slot := self._find(e)) is None else values[slot] for e in entities]
+
+    def _index_items(self) -> Iterator[tuple[int, str]]:
+        uuids, values = self.slots.uuids, self.values
+        return ((values[i], uuids[i]) for i in self.iter_slots())
+
+    def _own(self) -> None:
+        self.values = self.values[:]
+        self.present = self.present[:]
+        if self.index is not None:
+            self.index = self.index.copy()
+        self._shared = False
+
+    def _snapshot(self) -> tuple:
+        self._shared = True
+        return self.values, self.present, self.index
+
+    def _restore(self, state: tuple) -> None:
+        self.values, self.present, self.index = state
+        self._shared = True
+
+    def _holds(self, state: tuple) -> bool:
+        return self.values is state[0]
+
+    def _members(self) -> set[str]:
+        uuids = self.slots.uuids
+        return {uuids[i] for i in self.iter_slots()}
+
+    @property
+    def mapping(self) -> dict[str, Int32]:  # type: ignore[override]
+        """以 uuid -> Int32 的形式导出分数 (只读快照, 兼容字典存储的计分板)"""
+        uuids, values = self.slots.uuids, self.values
+        return {uuids[i]: Int32(values[i]) for i in self.iter_slots()}
+
+    def __len__(self) -> int:
+        return self.present.count(1)
+
+    def serialize(self) -> dict:
+        return {
+            "objective": self.objective,
+            "display_name": self.display_name,
+            "mapping": self._serialize_mapping()
+        }
+
+    def group_serialize(self) -> tuple[str, dict]:
+        return self.objective, {
+            "display_name": self.display_name,
+            "mapping": self._serialize_mapping()
+        }
+
+    def _serialize_mapping(self) -> dict[str, int]:
+        return dict(self._iter_scores())
+
+    def _iter_scores(self) -> Iterator[tuple[str, int]]:
+        uuids, values = self.slots.uuids, self.values
+        return ((uuids[i], values[i]) for i in self.iter_slots())
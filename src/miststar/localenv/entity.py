@@ -1,15 +1,96 @@
 # create by lesomras on 2025-12-30
+from __future__ import annotations
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Iterator, Optional
+from collections.abc import MutableSet
 
-from miststar.internal.int32 import Int32
+from miststar.internal.int32 import Int32, Integer
 from miststar.internal.simple_uuid import new_uuid
 
+if TYPE_CHECKING:
+    from .scoreboard import Scoreboard
+
+class ScoreView(Mapping[str, Int32]):
+    """
+    Entity.scoreboards 的视图
+
+    分数只存放在计分板中, 实体仅记录自己加入过的计分板 (objective -> Scoreboard),
+    读取时再向计分板查询 (得到分数的副本), 因此写入分数时不需要同步实体上的副本.
+    对已有的项赋值 (如 entity.scoreboards["obj"] += 1) 等同于 players_set
+    """
+    __slots__ = ("_entity", )
+
+    def __init__(self, entity: Entity) -> None:
+        self._entity = entity
+
+    def __getitem__(self, objective: str) -> Int32:
+        entity = self._entity
+        board = (entity._boards or {})[objective]
+        if not board.has_entity(entity):
+            raise KeyError(objective)
+        return board.get_scoreboard_value(entity)
+
+    def __setitem__(self, objective: str, value: Integer) -> None:
+        entity = self._entity
+        board = (entity._boards or {})[objective]
+        if not board.has_entity(entity):
+            raise KeyError(objective)
+        board.players_set(entity, value)
+
+    def __iter__(self) -> Iterator[str]:
+        entity = self._entity
+        if not entity._boards:
+            return iter(())
+        return iter([i for i, j in entity._boards.items() if j.has_entity(entity)])
+
+    def __len__(self) -> int:
+        entity = self._entity
+        if not entity._boards:
+            return 0
+        return sum(1 for i in entity._boards.values() if i.has_entity(entity))
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
 class Entity(object):
+    """
+    本地环境中的实体
+
+    使用 __slots__ 存储; 计分板登记表与标签集合在首次使用时才分配,
+    实体类型为类属性 (子类覆盖 _type 即可)
+    """
+    __slots__ = ("name", "uuid", "_boards", "_tags")
+    _type: str = "entity"
+
     def __init__(self, name: str) -> None:
         self.name: str = name
         self.uuid: str = new_uuid()
-        self.scoreboards: dict[str, Int32] = {}
-        self.tags: set[str] = set()
-        self._type: str = "entity"
+        # objective -> Scoreboard, 仅在加入/离开计分板时写入; 为None表示尚未加入任何计分板
+        self._boards: Optional[dict[str, Scoreboard]] = None
+        self._tags: Optional[MutableSet[str]] = None
+
+    @property
+    def _objectives(self) -> dict[str, Scoreboard]:
+        """实体加入过的计分板 (objective -> Scoreboard), 首次访问时分配"""
+        if (boards := self._boards) is None:
+            boards = self._boards = {}
+        return boards
+
+    @property
+    def tags(self) -> MutableSet[str]:
+        """实体的标签集合, 首次访问时分配"""
+        if (tags := self._tags) is None:
+            tags = self._tags = set()
+        return tags
+
+    @tags.setter
+    def tags(self, value: MutableSet[str]) -> None:
+        self._tags = value
+
+    @property
+    def scoreboards(self) -> ScoreView:
+        """实体在各计分板中的分数 (只读视图)"""
+        return ScoreView(self)
 
     def serialize(self) -> dict:
         return {
@@ -17,7 +98,7 @@ class Entity(object):
             "name": self.name,
             "uuid": self.uuid,
             "scoreboards": {i: int(j) for i, j in self.scoreboards.items()},
-            "tags": list(self.tags),
+            "tags": list(self._tags or ()),
         }
 
     def group_serialize(self) -> tuple[str, dict]:
@@ -25,7 +106,7 @@ class Entity(object):
             "type": self._type,
             "name": self.name,
             "scoreboards": {i: int(j) for i, j in self.scoreboards.items()},
-            "tags": list(self.tags),
+            "tags": list(self._tags or ()),
         }
 
     def __eq__(self, other) -> bool:
@@ -35,7 +116,7 @@ class Entity(object):
             self.name == other.name and 
             self.uuid == other.uuid and 
             self.scoreboards == other.scoreboards and 
-            self.tags == other.tags
+            set(self._tags or ()) == set(other._tags or ())
         )
 
     def __hash__(self) -> int:
@@ -45,4 +126,4 @@ class Entity(object):
         return f"entity {self.name}({self.uuid})"
 
     def __repr__(self) -> str:
-        return f"entity {self.name}({self.uuid})"
\ No newline at end of file
+        return f"entity {self.name}({self.uuid})"
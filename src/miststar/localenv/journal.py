@@ -0,0 +1,277 @@
+# create by lesomras on 2026-10-17
+from __future__ import annotations
+from typing import TYPE_CHECKING, Optional, Iterable, Sequence
+
+from .entity import Entity
+from miststar.internal.exceptions import ReferenceNotFoundException, MalformedException
+from miststar.internal.int32 import checking32
+
+if TYPE_CHECKING:
+    from .localenv import LocalEnv
+    from .scoreboard import Scoreboard
+
+# 日志记录均为元组, 只保存变化前后的值:
+#   ("score", objective, uuid, old, new)    分数变化, 不存在的分数为None
+#   ("objective+", objective, display_name) 添加计分项
+#   ("objective-", objective, display_name) 移除计分项 (之前会先记录其中每个分数变为None)
+#   ("tag", uuid, tag, added)               添加/去除标签
+# 撤销栈中的 "objective-" 记录额外带有被移除的计分板对象, 撤销时原样放回 (实体对它的引用随之恢复)
+SCORE = "score"
+OBJECTIVE_ADD = "objective+"
+OBJECTIVE_REMOVE = "objective-"
+TAG = "tag"
+
+class Journal(object):
+    """
+    LocalEnv 的修改日志, 由 LocalEnv.enable_journal 创建
+
+    所有 players_*、objectives_*、tag_add/tag_remove 的实际修改都以紧凑的记录追加到 log 中
+    (undo/redo 本身也会写入log), 可用export按位置增量导出, 用replay应用到另一个环境;
+    已导出的部分用truncate/drain丢弃, 位置始终从日志创建时起算, 不因丢弃而改变.
+    checkpoint 将此前未分组的记录合为一步, undo/redo 以步为单位撤销与重做
+    实体的登记与注销 (add_entity/remove_entity) 不记录在日志中.
+    撤销时实体优先取自日志见过的实体与环境中登记的实体; 对整个计分项的操作无法得知实体时按uuid直接写入计分板
+
+    history为False时不保存log与撤销栈, 只通知watchers (见 SerializationCache)
+    """
+
+    def __init__(self, env: LocalEnv, history: bool = True) -> None:
+        self.env = env
+        self.history = history
+        # 只关心修改了哪些计分项/实体的观察者, 每个为 (计分项名称集合, uuid集合), 由观察者自行清空
+        self.watchers: list[tuple[set[str], set[str]]] = []
+        self.log: list[tuple] = []
+        # 已被truncate丢弃的记录数, 即log[0]的位置
+        self.offset = 0
+        # 已分组的步骤 / 尚未分组的记录 / 被撤销的步骤
+        self._undo: list[list[tuple]] = []
+        self._pending: list[tuple] = []
+        self._redo: list[list[tuple]] = []
+        # 执行undo/redo时为True, 此时的修改不进入撤销栈
+        self._replaying = False
+        # 撤销/重做栈中的记录涉及的实体, 用于撤销未登记在环境中的实体上的修改;
+        # _refs 为每个uuid被栈中记录引用的次数, 降为0时释放对应的实体
+        self._entities: dict[str, Entity] = {}
+        self._refs: dict[str, int] = {}
+
+    # ========== 记录 ==========
+
+    def _append(self, record: tuple, step: Optional[tuple] = None, entity: Optional[Entity] = None) -> None:
+        """record写入log; step若给出则代替record进入撤销栈; entity为record涉及的实体"""
+        if not self.history:
+            return
+        self.log.append(record)
+        if not self._replaying:
+            self._pending.append(record if step is None else step)
+            if (_uuid := _subject(record)) is not None:
+                self._refs[_uuid] = self._refs.get(_uuid, 0) + 1
+                if entity is not None:
+                    self._entities[_uuid] = entity
+            if self._redo:
+                self._release(self._redo)
+                self._redo.clear()
+
+    def _release(self, steps: list[list[tuple]]) -> None:
+        """被丢弃的步骤不再引用其中的实体"""
+        refs, entities = self._refs, self._entities
+        for step in steps:
+            for record in step:
+                if (_uuid := _subject(record)) is not None:
+                    if (n := refs[_uuid] - 1):
+                        refs[_uuid] = n
+                    else:
+                        del refs[_uuid]
+                        entities.pop(_uuid, None)
+
+    def _score(self, objective: str, entity: Optional[Entity], _uuid: str, old: Optional[int], new: Optional[int]) -> None:
+        for objectives, entities in self.watchers:
+            objectives.add(objective)
+            entities.add(_uuid)
+        self._append((SCORE, objective, _uuid, old, new), None, entity)
+
+    def _objective(self, added: bool, objective: str, display_name: str, board: Optional[Scoreboard] = None) -> None:
+        for objectives, _ in self.watchers:
+            objectives.add(objective)
+        record = (OBJECTIVE_ADD if added else OBJECTIVE_REMOVE, objective, display_name)
+        self._append(record, None if board is None else record + (board, ))
+
+    def _tag(self, entity: Entity, tag: str, added: bool) -> None:
+        for _, entities in self.watchers:
+            entities.add(entity.uuid)
+        self._append((TAG, entity.uuid, tag, added), None, entity)
+
+    # ========== 撤销与重做 ==========
+
+    def checkpoint(self) -> None:
+        """将尚未分组的记录合为一步 (例如每条命令或每个游戏刻调用一次)"""
+        if self._pending:
+            self._undo.append(self._pending)
+            self._pending = []
+
+    def undo(self) -> bool:
+        """
+        撤销最近的一步 (包括尚未分组的记录), 没有可撤销的步骤时返回False
+
+        整步记录先全部校验再应用, 无法撤销时抛出异常且环境与撤销栈均保持不变
+        """
+        self.checkpoint()
+        if not self._undo:
+            return False
+        step = self._undo[-1]
+        self._run(step[::-1], True)
+        self._redo.append(self._undo.pop())
+        return True
+
+    def redo(self) -> bool:
+        """重做最近被撤销的一步, 没有可重做的步骤时返回False; 与undo相同, 失败时不做任何修改"""
+        if not self._redo:
+            return False
+        self.checkpoint()
+        step = self._redo[-1]
+        self._run(step, False)
+        self._undo.append(self._redo.pop())
+        return True
+
+    def clear_history(self) -> None:
+        """丢弃撤销与重做栈, log不受影响"""
+        self._undo.clear()
+        self._pending = []
+        self._redo.clear()
+        self._entities.clear()
+        self._refs.clear()
+
+    def _run(self, records: list[tuple], reverse: bool) -> None:
+        self._replaying = True
+        try:
+            apply(self.env, records, reverse, self._entities, detached = True)
+        finally:
+            self._replaying = False
+
+    # ========== 增量导出 ==========
+
+    @property
+    def position(self) -> int:
+        """下一条记录的位置 (含已丢弃的记录), 可作为下一次export的起点"""
+        return self.offset + len(self.log)
+
+    def export(self, since: Optional[int] = None) -> list[list]:
+        """以可直接序列化为json的列表导出从since (默认为最早仍保留的记录) 开始的记录"""
+        since = self.offset if since is None else since
+        if not self.offset <= since <= self.position:
+            raise MalformedException(f"journal position {since} is out of range")
+        return [list(i) for i in self.log[since - self.offset:]]
+
+    def truncate(self, position: int) -> None:
+        """丢弃position之前的记录 (例如已经导出的部分), 不影响撤销与重做"""
+        if not self.offset <= position <= self.position:
+            raise MalformedException(f"journal position {position} is out of range")
+        del self.log[:position - self.offset]
+        self.offset = position
+
+    def drain(self) -> list[list]:
+        """导出并丢弃所有仍保留的记录, 适合每个游戏刻取出一次增量"""
+        records = self.export()
+        self.truncate(self.position)
+        return records
+
+    @staticmethod
+    def replay(env: LocalEnv, records: Iterable[Sequence]) -> None:
+        """将export导出的记录按顺序应用到env上, 实体按uuid在env中查找"""
+        apply(env, records)
+
+    def __len__(self) -> int:
+        return len(self.log)
+
+    def __repr__(self) -> str:
+        return f"Journal(position={self.position}, records={len(self.log)}, undo={len(self._undo) + bool(self._pending)}, redo={len(self._redo)})"
+
+def apply(env: LocalEnv, records: Iterable[Sequence], reverse: bool = False, known: Optional[dict[str, Entity]] = None, detached: bool = False) -> None:
+    """
+    将日志记录应用到env上. 所有记录先整体校验, 有任何一条无法应用时抛出异常且不做任何修改
+
+    args:
+        reverse: 为True时应用记录的逆操作 (调用方需自行倒序传入)
+        known: 额外的 uuid -> 实体 映射, 优先于env中登记的实体
+        detached: 为True时, 找不到实体的分数按uuid直接写入计分板 (列式计分板除外)
+    """
+    records = list(records)
+    _validate(env, records, reverse, known, detached)
+
+    def resolve(_uuid: str) -> Optional[Entity]:
+        if known is not None and (entity := known.get(_uuid)) is not None:
+            return entity
+        return env.get_entity(_uuid)
+
+    sc = env.scoreboard
+    for record in records:
+        kind = record[0]
+        if kind == SCORE:
+            _, objective, _uuid, old, new = record
+            value = old if reverse else new
+            board = sc.get_scoreboard(objective)
+            if (entity := resolve(_uuid)) is None:
+                board._write_uuid(_uuid, value)
+            elif value is None:
+                board.players_reset(entity)
+            else:
+                board.players_set(entity, value)
+        elif kind == TAG:
+            _, _uuid, tag, added = record
+            if (entity := resolve(_uuid)) is None:
+                raise ReferenceNotFoundException(f"no entity found with uuid as {_uuid}")
+            if added != reverse:
+                env.tag.tag_add(entity, tag)
+            else:
+                env.tag.tag_remove(entity, tag)
+        else:
+            objective, display_name = record[1], record[2]
+            if (kind == OBJECTIVE_ADD) != reverse:
+                if len(record) == 4:
+                    sc._reinstate(record[3])
+                else:
+                    sc.add_scoreboard(objective, display_name)
+            else:
+                sc.objectives_remove(objective)
+
+def _subject(record: tuple) -> Optional[str]:
+    """记录涉及的实体的uuid, 计分项记录为None"""
+    kind = record[0]
+    if kind == SCORE:
+        return record[2]
+    if kind == TAG:
+        return record[1]
+    return None
+
+def _validate(env: LocalEnv, records: list, reverse: bool, known: Optional[dict[str, Entity]], detached: bool) -> None:
+    """检查records能否依次应用到env上 (模拟计分项的增删), 不修改env"""
+    def found(_uuid) -> bool:
+        return (known is not None and _uuid in known) or env.get_entity(_uuid) is not None
+
+    sc = env.scoreboard
+    objectives = set(sc.mapping)
+    for record in records:
+        if not isinstance(record, (tuple, list)) or not record:
+            raise MalformedException(f"unknown journal record {record!r}")
+        kind = record[0]
+        if kind == SCORE and len(record) == 5:
+            _, objective, _uuid, old, new = record
+            value = old if reverse else new
+            if objective not in objectives:
+                raise ReferenceNotFoundException(f"no objective named {objective}")
+            if value is not None and not (isinstance(value, int) and checking32(value)):
+                raise MalformedException(f"invalid score {value!r} in journal record {record!r}")
+            if not found(_uuid) and value is not None and (not detached or sc.columnar):
+                raise ReferenceNotFoundException(f"no entity found with uuid as {_uuid}")
+        elif kind in (OBJECTIVE_ADD, OBJECTIVE_REMOVE) and len(record) in (3, 4):
+            objective = record[1]
+            if (kind == OBJECTIVE_ADD) != reverse:
+                if objective in objectives:
+                    raise MalformedException(f"objective {objective} already exists in this local scoreboards.")
+                objectives.add(objective)
+            else:
+                objectives.discard(objective)
+        elif kind == TAG and len(record) == 4:
+            if not found(record[1]):
+                raise ReferenceNotFoundException(f"no entity found with uuid as {record[1]}")
+        else:
+            raise MalformedException(f"unknown journal record {record!r}")
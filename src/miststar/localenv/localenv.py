@@ -1,10 +1,195 @@
 # create by lesomras on 2025-12-22
+from __future__ import annotations
+from typing import Union, Optional, Iterator
 
-from .scoreboard import LocalScoreboards
+from .entity import Entity
+from .registry import EntityRegistry
+from .scoreboard import Scoreboard, LocalScoreboards
 from .tag import LocalTags
+from .bitset_tags import BitsetTags
+from .selector import SelectorEvaluator
+from .journal import Journal
+from miststar.textcomps.components import Selector
+from miststar.internal.exceptions import MalformedException
+from miststar.serializer.stream import StreamDict, iter_json
+
+class EnvSnapshot(object):
+    """LocalEnv.snapshot 返回的快照句柄, 只能交给创建它的 LocalEnv.restore"""
+    __slots__ = ("env", "registry", "boards", "states", "tags")
+
+    def __init__(self, env: LocalEnv, registry: tuple, boards: dict[str, Scoreboard], states: dict[str, tuple], tags: tuple) -> None:
+        self.env = env
+        self.registry = registry
+        # objective -> Scoreboard / 该计分项的存储
+        self.boards = boards
+        self.states = states
+        self.tags = tags
+
+    def __repr__(self) -> str:
+        return f"EnvSnapshot(objectives={len(self.boards)})"
 
 class LocalEnv(object):
-    def __init__(self) -> None:
-        self.scoreboard = LocalScoreboards()
+    def __init__(self, columnar: bool = False, bitset_tags: bool = False) -> None:
+        """
+        args:
+            columnar: 计分板使用列式存储
+            bitset_tags: 标签使用位图存储 (BitsetTags)
+        计分板与标签共享同一个实体登记表 (self.registry)
+        """
+        self.registry = EntityRegistry()
+        self.scoreboard = LocalScoreboards(columnar, self.registry)
         self.sc = self.scoreboard
-        self.tag = LocalTags()
\ No newline at end of file
+        self.tag: LocalTags = BitsetTags(self.registry) if bitset_tags else LocalTags()
+        self.selector = SelectorEvaluator(self)
+        self.journal: Optional[Journal] = None
+        # restore的次数, 恢复不写入日志, 依赖日志的缓存据此失效 (见 SerializationCache)
+        self._restores = 0
+
+    def add_entity(self, entity: Entity) -> Entity:
+        """
+        将entity登记到本地环境中, 使其能被选择器选中
+
+        列式计分板与位图标签在首次写入时会自动登记实体
+        """
+        self.registry.register(entity)
+        return entity
+
+    def remove_entity(self, entity: Entity) -> None:
+        """从本地环境中移除entity: 清除它在所有计分项中的分数与所有标签, 并释放其槽位"""
+        for board in list(entity._objectives.values()):
+            board.players_reset(entity)
+        self.tag.tag_clear(entity)
+        self.registry.unregister(entity)
+
+    # ========== 快照 ==========
+
+    def snapshot(self) -> EnvSnapshot:
+        """
+        记录当前的实体、分数与标签, 返回可交给restore的句柄
+
+        采用写时复制: 快照只记录各容器的引用 (代价与计分项数、标签数成正比, 与分数个数无关),
+        之后第一次写入某个计分项/标签时才复制它, 未被修改的部分始终与快照共享.
+        同一个快照可以被多次restore
+        """
+        sc = self.scoreboard
+        return EnvSnapshot(
+            self,
+            self.registry._snapshot(),
+            dict(sc.mapping),
+            {i: j._snapshot() for i, j in sc.mapping.items()},
+            self.tag._snapshot()
+        )
+
+    def restore(self, snapshot: EnvSnapshot) -> None:
+        """
+        将环境恢复到snapshot记录的状态
+
+        只有快照之后被修改过的计分项与标签需要处理; 实体的 scoreboards/tags 随之同步
+        (字典计分板只能同步登记在本环境中的实体, 见 add_entity)
+        """
+        if snapshot.env is not self:
+            raise MalformedException("snapshot was not taken from this local env")
+        registry, sc = self.registry, self.scoreboard
+        boards, states = snapshot.boards, snapshot.states
+
+        # 恢复前记录被修改过的计分项中的实体, 此时uuid仍按当前登记表解析
+        changed: list[tuple[Scoreboard, dict[str, Optional[Entity]]]] = []
+        for objective, board in sc.mapping.items():
+            if boards.get(objective) is not board:
+                changed.append((board, {u: registry.get(u) for u in board._members()}))
+        for objective, board in boards.items():
+            if not board._holds(states[objective]):
+                changed.append((board, {u: registry.get(u) for u in board._members()}))
+
+        gone: list[Entity] = []
+        returned: list[Entity] = []
+        if registry.slots is not (state := snapshot.registry)[0]:
+            slots, entities = state[0], state[2]
+            gone = [e for e in registry if (i := slots.get(e.uuid)) is None or entities[i] is not e]
+            returned = [e for e in entities if e is not None and registry.get(e.uuid) is not e]
+
+        registry._restore(snapshot.registry)
+        for objective, board in boards.items():
+            board._restore(states[objective])
+        sc.mapping = dict(boards)
+        for board in boards.values():
+            board.journal = self.journal
+
+        for board, before in changed:
+            objective = board.objective
+            after = board._members() if boards.get(objective) is board else set()
+            for u in before.keys() - after:
+                if (entity := before[u]) is not None and entity._objectives.get(objective) is board:
+                    del entity._objectives[objective]
+            for u in after - before.keys():
+                if (entity := registry.get(u)) is not None:
+                    entity._objectives[objective] = board
+
+        self.tag._restore(snapshot.tags)
+        self.tag._reattach(gone, returned)
+        self._restores += 1
+        if self.journal is not None:
+            # 恢复不写入日志, 此前的步骤无法再被正确撤销
+            self.journal.clear_history()
+
+    # ========== 修改日志 ==========
+
+    def enable_journal(self) -> Journal:
+        """启用修改日志并返回它, 已启用时直接返回, 见 Journal"""
+        if (journal := self.journal) is None:
+            journal = Journal(self)
+            self._attach(journal)
+        elif not journal.history:
+            journal.history = True
+        return journal
+
+    def disable_journal(self) -> None:
+        """停用修改日志; 仍有观察者时保留日志对象, 只丢弃记录与撤销栈"""
+        if (journal := self.journal) is None or not journal.watchers:
+            self._attach(None)
+            return
+        journal.history = False
+        journal.truncate(journal.position)
+        journal.clear_history()
+
+    def _watch(self, watcher: tuple[set[str], set[str]]) -> Journal:
+        """登记修改的观察者, 未启用日志时创建一个不保存记录的日志对象"""
+        if (journal := self.journal) is None:
+            journal = Journal(self, history = False)
+            self._attach(journal)
+        if not any(i is watcher for i in journal.watchers):
+            journal.watchers.append(watcher)
+        return journal
+
+    def _unwatch(self, watcher: tuple[set[str], set[str]]) -> None:
+        if (journal := self.journal) is None:
+            return
+        journal.watchers = [i for i in journal.watchers if i is not watcher]
+        if not journal.history and not journal.watchers:
+            self._attach(None)
+
+    def _attach(self, journal: Optional[Journal]) -> None:
+        self.journal = self.scoreboard.journal = self.tag.journal = journal
+        for board in self.scoreboard.mapping.values():
+            board.journal = journal
+
+    def get_entity(self, _uuid: str) -> Optional[Entity]:
+        """按uuid查找已登记的实体, 不存在时返回None"""
+        return self.registry.get(_uuid)
+
+    @property
+    def entities(self) -> list[Entity]:
+        """按槽位顺序排列的所有实体"""
+        return list(self.registry)
+
+    def serialize_entities(self) -> dict:
+        """以 uuid -> 实体数据 的形式导出所有实体, 顺序与entities一致"""
+        return dict(i.group_serialize() for i in self.registry)
+
+    def iter_serialize_entities(self, indent: int = 2, ensure_ascii: bool = False) -> Iterator[str]:
+        """逐块生成serialize_entities()的json文本, 每次只序列化一个实体, 见 JsonSerializer.dump_stream"""
+        return iter_json(StreamDict(i.group_serialize() for i in self.registry), indent, ensure_ascii)
+
+    def select(self, selector: Union[str, Selector], executor: Optional[Entity] = None) -> list[Entity]:
+        """返回selector选中的实体, 见 SelectorEvaluator.select"""
+        return self.selector.select(selector, executor)
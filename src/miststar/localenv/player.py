@@ -3,9 +3,8 @@
 from .entity import Entity
 
 class Player(Entity):
-    def __init__(self, name: str) -> None:
-        super().__init__(name)
-        self._type = "entity::player"
+    __slots__ = ()
+    _type = "entity::player"
 
     def __str__(self) -> str:
         return f"player {self.name}({self.uuid})"
@@ -0,0 +1,86 @@
+# create by lesomras on 2026-10-17
+from __future__ import annotations
+from typing import Optional
+import heapq
+
+from .entity import Entity
+from .slots import SlotMap
+from miststar.internal.exceptions import MalformedException, ReferenceNotFoundException
+
+class EntityRegistry(SlotMap):
+    """
+    LocalEnv 的实体登记表
+
+    在 SlotMap 的基础上支持注销实体: 注销后槽位进入空闲堆, 之后登记的实体优先复用编号最小的空闲槽位,
+    使按槽位索引的数组 (列式计分板、位图标签) 保持紧凑.
+    注销前调用方须先清除该槽位上的分数与标签, 见 LocalEnv.remove_entity
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.free: list[int] = []
+        # 存储是否被快照共享, 见 _own
+        self._shared = False
+
+    def slot_of(self, entity: Entity) -> int:
+        """获取entity的槽位, 不存在时登记entity"""
+        slot = self.slots.get(entity.uuid)
+        if slot is None:
+            slot = self._allocate(entity)
+        return slot
+
+    def _allocate(self, entity: Entity) -> int:
+        if self._shared:
+            self._own()
+        if not self.free:
+            return super().slot_of(entity)
+        slot = heapq.heappop(self.free)
+        self.slots[entity.uuid] = slot
+        self.uuids[slot] = entity.uuid
+        self.entities[slot] = entity
+        return slot
+
+    def register(self, entity: Entity) -> int:
+        """登记entity并返回其槽位, uuid已被其他实体占用时抛出MalformedException"""
+        if (slot := self.slots.get(entity.uuid)) is not None:
+            if self.entities[slot] is not entity:
+                raise MalformedException(f"uuid {entity.uuid} is already registered by another entity")
+            return slot
+        return self._allocate(entity)
+
+    def unregister(self, entity: Entity) -> int:
+        """注销entity并返回它原来的槽位"""
+        if (slot := self.slots.get(entity.uuid)) is None or self.entities[slot] is not entity:
+            raise ReferenceNotFoundException(f"no entity found with uuid as {entity.uuid}")
+        if self._shared:
+            self._own()
+        del self.slots[entity.uuid]
+        self.uuids[slot] = ""
+        self.entities[slot] = None
+        heapq.heappush(self.free, slot)
+        return slot
+
+    def entity_at(self, slot: int) -> Optional[Entity]:
+        """槽位上的实体, 空闲槽位返回None"""
+        return self.entities[slot]
+
+    # ========== 快照 (写时复制) ==========
+
+    def _own(self) -> None:
+        """快照之后的第一次登记/注销前复制所有容器"""
+        self.slots = dict(self.slots)
+        self.uuids = list(self.uuids)
+        self.entities = list(self.entities)
+        self.free = list(self.free)
+        self._shared = False
+
+    def _snapshot(self) -> tuple:
+        self._shared = True
+        return self.slots, self.uuids, self.entities, self.free
+
+    def _restore(self, state: tuple) -> None:
+        self.slots, self.uuids, self.entities, self.free = state
+        self._shared = True
+
+    def __repr__(self) -> str:
+        return f"EntityRegistry(length={len(self.slots)}, free={len(self.free)})"
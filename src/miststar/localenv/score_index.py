@@ -0,0 +1,172 @@
+# create by lesomras on 2026-10-17
+from __future__ import annotations
+from bisect import bisect_left, insort
+from typing import Iterable, Iterator
+
+class ScoreIndex(object):
+    """
+    计分项的有序索引, 按 (分数, uuid) 排序
+
+    * 实现为分桶有序表: 每个桶是一个有序列表, _maxes 记录各桶的最大元素用于二分定位,
+    _tree 是桶长度上的树状数组, 用于求排名. 插入/删除/排名均为 O(log n + LOAD)
+    """
+    LOAD: int = 256
+
+    def __init__(self, items: Iterable[tuple[int, str]] = ()) -> None:
+        self._buckets: list[list[tuple[int, str]]] = []
+        self._maxes: list[tuple[int, str]] = []
+        self._tree: list[int] = []
+        self._len = 0
+        self.rebuild(items)
+
+    def rebuild(self, items: Iterable[tuple[int, str]]) -> None:
+        """以items重建索引"""
+        data = sorted(items)
+        load = self.LOAD
+        self._buckets = [data[i:i + load] for i in range(0, len(data), load)]
+        self._maxes = [i[-1] for i in self._buckets]
+        self._len = len(data)
+        self._build_tree()
+
+    def copy(self) -> ScoreIndex:
+        """复制索引 (逐桶浅复制, 不重新排序)"""
+        other = ScoreIndex.__new__(ScoreIndex)
+        other._buckets = [list(i) for i in self._buckets]
+        other._maxes = list(self._maxes)
+        other._tree = list(self._tree)
+        other._len = self._len
+        return other
+
+    # ========== 树状数组 ==========
+
+    def _build_tree(self) -> None:
+        tree = [len(i) for i in self._buckets]
+        for i in range(len(tree)):
+            j = i | (i + 1)
+            if j < len(tree):
+                tree[j] += tree[i]
+        self._tree = tree
+
+    def _tree_add(self, i: int, delta: int) -> None:
+        tree = self._tree
+        while i < len(tree):
+            tree[i] += delta
+            i |= i + 1
+
+    def _prefix(self, i: int) -> int:
+        """前i个桶的元素总数"""
+        tree, total = self._tree, 0
+        while i > 0:
+            total += tree[i - 1]
+            i &= i - 1
+        return total
+
+    def _position(self, item: tuple) -> int:
+        """item在整个有序表中的插入位置 (bisect_left)"""
+        i = bisect_left(self._maxes, item)
+        if i == len(self._buckets):
+            return self._len
+        return self._prefix(i) + bisect_left(self._buckets[i], item)
+
+    # ========== 修改 ==========
+
+    def add(self, value: int, key: str) -> None:
+        item = (value, key)
+        buckets, maxes = self._buckets, self._maxes
+        self._len += 1
+        if not buckets:
+            buckets.append([item])
+            maxes.append(item)
+            self._build_tree()
+            return
+
+        i = bisect_left(maxes, item)
+        if i == len(buckets):
+            i -= 1
+            buckets[i].append(item)
+            maxes[i] = item
+        else:
+            insort(buckets[i], item)
+
+        if len(buckets[i]) > 2 * self.LOAD:
+            bucket = buckets[i]
+            half = len(bucket) // 2
+            buckets[i:i + 1] = [bucket[:half], bucket[half:]]
+            maxes[i:i + 1] = [bucket[half - 1], bucket[-1]]
+            self._build_tree()
+        else:
+            self._tree_add(i, 1)
+
+    def remove(self, value: int, key: str) -> None:
+        item = (value, key)
+        buckets, maxes = self._buckets, self._maxes
+        i = bisect_left(maxes, item)
+        if i == len(buckets):
+            raise KeyError(item)
+        bucket = buckets[i]
+        j = bisect_left(bucket, item)
+        if j == len(bucket) or bucket[j] != item:
+            raise KeyError(item)
+
+        del bucket[j]
+        self._len -= 1
+        if not bucket:
+            del buckets[i]
+            del maxes[i]
+            self._build_tree()
+        else:
+            maxes[i] = bucket[-1]
+            self._tree_add(i, -1)
+
+    def move(self, key: str, old: int, new: int) -> None:
+        """将key的分数由old改为new"""
+        if old != new:
+            self.remove(old, key)
+            self.add(new, key)
+
+    # ========== 查询 ==========
+
+    def range(self, _min: int, _max: int) -> Iterator[tuple[int, str]]:
+        """按分数升序遍历 _min <= 分数 <= _max 的 (分数, uuid)"""
+        buckets = self._buckets
+        lower, upper = (_min, ), (_max + 1, )
+        i = bisect_left(self._maxes, lower)
+        if i == len(buckets):
+            return
+        j = bisect_left(buckets[i], lower)
+        while i < len(buckets):
+            bucket = buckets[i]
+            end = bisect_left(bucket, upper)
+            yield from bucket[j:end]
+            if end < len(bucket):
+                return
+            i, j = i + 1, 0
+
+    def count(self, _min: int, _max: int) -> int:
+        """分数在 [_min, _max] 中的元素个数"""
+        if _min > _max:
+            return 0
+        return self._position((_max + 1, )) - self._position((_min, ))
+
+    def rank(self, value: int) -> int:
+        """分数严格大于value的元素个数 + 1 (并列共享名次)"""
+        return self._len - self._position((value + 1, )) + 1
+
+    def top(self, k: int) -> list[tuple[int, str]]:
+        """分数最高的k个 (分数, uuid), 降序"""
+        result: list[tuple[int, str]] = []
+        for bucket in reversed(self._buckets):
+            if len(result) >= k:
+                break
+            result.extend(reversed(bucket[-(k - len(result)):]))
+        return result
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __iter__(self) -> Iterator[tuple[int, str]]:
+        for bucket in self._buckets:
+            yield from bucket
+
+    def __repr__(self) -> str:
+        return f"ScoreIndex(length={self._len})"
@@ -1,12 +1,29 @@
 # create by lesomras on 2025-12-22
 from __future__ import annotations
-from typing import Union
+from typing import Union, Optional, Callable, Sequence, Iterator
 from random import randint
 from functools import partial
+import math
 
 from .entity import Entity
+from .slots import SlotMap
+from .score_index import ScoreIndex
+from .journal import Journal
 from miststar.internal.exceptions import ReferenceNotFoundException, MalformedException
-from miststar.internal.int32 import Int32, checking32, build32, Integer
+from miststar.internal.int32 import Int32, checking32, wrap32, Integer
+from miststar.serializer.stream import StreamDict, iter_json
+
+# players_operation 的原始整数内核: (player_value, selector_value) -> 新值, 返回None表示不修改
+_OPERATIONS: dict[str, Callable[[int, int], Optional[int]]] = {
+    "=": lambda a, b: b,
+    "+=": lambda a, b: wrap32(a + b),
+    "-=": lambda a, b: wrap32(a - b),
+    "*=": lambda a, b: wrap32(a * b),
+    "/=": lambda a, b: wrap32(math.trunc(a / b)) if b != 0 else None,
+    "%=": lambda a, b: a % b if b != 0 else None,
+    "<": lambda a, b: b if b < a else None,
+    ">": lambda a, b: b if b > a else None,
+}
 
 class Scoreboard(object):
     def __init__(self, objective: str, display_name: str = "") -> None:
@@ -14,42 +31,72 @@ class Scoreboard(object):
         self.mapping: dict[str, Int32] = {}
         self.objective = objective
         self.display_name = display_name
+        # 可选的有序索引, 由enable_index()创建
+        self.index: Optional[ScoreIndex] = None
+        # 存储是否被快照共享, 见 _own
+        self._shared = False
+        # 修改日志, 由 LocalEnv.enable_journal 设置
+        self.journal: Optional[Journal] = None
 
     def has_entity(self, entity: Entity) -> bool:
         """检测entity是否在scoreboard中"""
         return entity.uuid in self.mapping
 
+    def _get_raw(self, entity: Entity) -> Optional[int]:
+        """以原始整数读取entity的分数, 不存在时返回None"""
+        v = self.mapping.get(entity.uuid)
+        return None if v is None else v.value
+
+    def _set_raw(self, entity: Entity, value: int) -> None:
+        """以原始整数写入entity的分数 (value须已处于32位范围内), 已存在时原地修改"""
+        if self._shared:
+            self._own()
+        if (v := self.mapping.get(u := entity.uuid)) is not None:
+            if self.index is not None:
+                self.index.move(u, v.value, value)
+            if self.journal is not None and v.value != value:
+                self.journal._score(self.objective, entity, u, v.value, value)
+            v.value = value
+            return
+        if self.index is not None:
+            self.index.add(value, u)
+        if self.journal is not None:
+            self.journal._score(self.objective, entity, u, None, value)
+        self.mapping[u] = Int32(value)
+        entity._objectives[self.objective] = self
+
     def get_scoreboard_value(self, entity: Entity) -> Int32:
         if (u := entity.uuid) not in self.mapping:
             raise ReferenceNotFoundException(f"no entity found with uuid as {entity.uuid}")
-        return self.mapping[u]
+        # 返回副本: 原地修改存放的Int32会绕过索引、日志与快照的写时复制
+        return self.mapping[u].copy()
 
     def set_scoreboard_value(self, entity: Entity, value: Integer = 0) -> None:
-        if (u := entity.uuid) not in self.mapping:
+        if self.mapping.get(entity.uuid) is None:
             raise ReferenceNotFoundException(f"no entity found with uuid as {entity.uuid}")
-        v = build32(value)
-        self.mapping[u] = v
-        entity.scoreboards[self.objective] = v
+        self._set_raw(entity, wrap32(int(value)))
 
     def players_set(self, entity: Entity, count: Integer = 0) -> None:
         """直接设定entity在scoreboard中的值"""
         if not checking32(count):
             raise MalformedException("'count' must be a valid 32-bit integer")
-        v = build32(count)
-        self.mapping[entity.uuid] = v
-        entity.scoreboards[self.objective] = v
+        self._set_raw(entity, int(count))
 
     def players_add(self, entity: Entity, count: Integer) -> None:
         """将entity在scoreboard中存储的值与传入值相加"""
         if not checking32(count):
             raise MalformedException("'count' must be a valid 32-bit integer")
-        v = build32(count)
-        if (u := entity.uuid) not in self.mapping:
-            self.mapping[u] = v
-            entity.scoreboards[self.objective] = v
+        if self._shared:
+            self._own()
+        if (v := self.mapping.get(entity.uuid)) is None:
+            self._set_raw(entity, int(count))
             return
-        self.mapping[u] += v
-        entity.scoreboards[self.objective] += v
+        new = wrap32(v.value + int(count))
+        if self.index is not None:
+            self.index.move(entity.uuid, v.value, new)
+        if self.journal is not None and v.value != new:
+            self.journal._score(self.objective, entity, entity.uuid, v.value, new)
+        v.value = new
 
     def players_remove(self, entity: Entity, count: Integer) -> None:
         """将entity在scoreboard中存储的值与传入值相减"""
@@ -63,16 +110,65 @@ class Scoreboard(object):
             raise MalformedException("max must be a valid 32-bit integer")
         if _min >= _max:
             raise MalformedException("min must be less than max")
-        result = Int32(randint(int(_min), int(_max)))
-        self.mapping[entity.uuid] = result
-        entity.scoreboards[self.objective] = result
-        return result
+        result = randint(int(_min), int(_max))
+        self._set_raw(entity, result)
+        return Int32(result)
 
     def players_reset(self, entity: Entity) -> None:
         """删除entity在scoreboard中的数据条目"""
-        if (u := entity.uuid) in self.mapping:
-            del self.mapping[u]
-            del entity.scoreboards[self.objective] 
+        if self._shared:
+            self._own()
+        if (v := self.mapping.pop(u := entity.uuid, None)) is not None:
+            if self.index is not None:
+                self.index.remove(v.value, u)
+            if self.journal is not None:
+                self.journal._score(self.objective, entity, u, v.value, None)
+            if entity._objectives.get(self.objective) is self:
+                del entity._objectives[self.objective]
+
+    def _write_uuid(self, _uuid: str, value: Optional[int]) -> None:
+        """
+        按uuid写入分数 (value为None时删除), 供日志撤销时实体未知的记录使用
+
+        不经过实体, 因此不会更新实体对计分板的引用; 只用于恢复整个计分项操作前的分数,
+        此时实体原本就在计分项中
+        """
+        if self._shared:
+            self._own()
+        old = self.mapping.get(_uuid)
+        if value is None:
+            if old is None:
+                return
+            del self.mapping[_uuid]
+            if self.index is not None:
+                self.index.remove(old.value, _uuid)
+            if self.journal is not None:
+                self.journal._score(self.objective, None, _uuid, old.value, None)
+        elif old is None:
+            self.mapping[_uuid] = Int32(value)
+            if self.index is not None:
+                self.index.add(value, _uuid)
+            if self.journal is not None:
+                self.journal._score(self.objective, None, _uuid, None, value)
+        elif old.value != value:
+            if self.index is not None:
+                self.index.move(_uuid, old.value, value)
+            if self.journal is not None:
+                self.journal._score(self.objective, None, _uuid, old.value, value)
+            old.value = value
+
+    def _clear(self) -> None:
+        """删除计分项中的所有分数 (objectives_remove时调用)"""
+        if self._shared:
+            # 快照持有的容器保持不变, 直接换用新的容器
+            self.mapping = {}
+            if self.index is not None:
+                self.index = ScoreIndex()
+            self._shared = False
+            return
+        self.mapping.clear()
+        if self.index is not None:
+            self.index.rebuild(())
 
     def players_test(self, entity: Entity, _min: Integer, _max: Integer = 2147483647) -> bool:
         """检测entity在scoreboard中的值是否在_min与_max中"""
@@ -86,13 +182,13 @@ class Scoreboard(object):
     def players_operation(player: Entity, target_objective: Scoreboard, operation: str, selector: Entity, objective: Scoreboard) -> None:
         """给定两个实体和两个scoreboard, 一个操作, 对两个实体在scoreboard中的值进行一定的操作"""
         if target_objective.has_entity(player):
-            player_value = target_objective.mapping[player.uuid].copy()
+            player_value = target_objective.get_scoreboard_value(player)
         else:
             player_value = Int32(0)
             target_objective.players_set(player, Int32(0))
 
         if objective.has_entity(selector):
-            selector_value = objective.mapping[selector.uuid].copy()
+            selector_value = objective.get_scoreboard_value(selector)
         else:
             selector_value = Int32(0)
             objective.players_set(selector, Int32(0))
@@ -126,23 +222,314 @@ class Scoreboard(object):
             case _:
                 raise MalformedException(f"{operation} does not have a corresponding operation")
 
+    @staticmethod
+    def compile_operation(target_objective: Scoreboard, operation: str, objective: Scoreboard) -> CompiledOperation:
+        """将 (计分项对, 操作符) 预编译为可重复执行的 CompiledOperation"""
+        return CompiledOperation(target_objective, operation, objective)
+
+    # ========== 批量操作 ==========
+
+    def _apply_many(self, entities: Optional[Sequence[Entity]], kernel: Callable[[int, int], Optional[int]], operand: int, track: Optional[Entity] = None) -> None:
+        """
+        对一组entity的分数一次性应用kernel
+
+        args:
+            entities: 目标实体序列, 为None时作用于整个计分项
+            kernel: 原始整数内核, 返回None表示不修改
+            operand: 传递给kernel的第二个参数
+            track: 若给出, 写入该实体后operand随之更新为它的新值 (selector同时也是目标的情况)
+        不在计分项中的entity视为0分并写入结果
+        """
+        if self._shared:
+            self._own()
+        mapping: dict[str, Int32] = self.mapping
+        tracked = track.uuid if track is not None else None
+        if entities is None:
+            for u, score in mapping.items():
+                if (r := kernel(score.value, operand)) is not None:
+                    score.value = r
+                if u == tracked:
+                    operand = score.value
+            return
+
+        objective = self.objective
+        v: Optional[Int32]
+        for entity in entities:
+            if (v := mapping.get(u := entity.uuid)) is None:
+                r = kernel(0, operand)
+                v = Int32(0 if r is None else r)
+                mapping[u] = v
+                entity._objectives[objective] = self
+            elif (r := kernel(v.value, operand)) is not None:
+                v.value = r
+            if u == tracked:
+                operand = v.value
+
+    def _apply(self, entities: Optional[Sequence[Entity]], kernel: Callable[[int, int], Optional[int]], operand: int, track: Optional[Entity] = None) -> None:
+        """调用_apply_many, 并在启用索引或日志时同步更新索引、记录变化"""
+        if self._shared:
+            self._own()
+        index, journal = self.index, self.journal
+        if index is None and journal is None:
+            self._apply_many(entities, kernel, operand, track)
+            return
+        if entities is None:
+            previous = {u: v for v, u in self._index_items()} if journal is not None else {}
+            self._apply_many(None, kernel, operand, track)
+            if index is not None:
+                # 整个计分项都可能变化, 直接重建 (加减等保序运算下近乎有序, 排序为线性)
+                index.rebuild(self._index_items())
+            if journal is not None:
+                for v, u in self._index_items():
+                    if previous[u] != v:
+                        journal._score(self.objective, None, u, previous[u], v)
+            return
+
+        before = self._values_many(entities)
+        self._apply_many(entities, kernel, operand, track)
+        after = self._values_many(entities)
+        # 同一实体出现多次时只处理第一次: before为批量操作前的值, after已是最终值
+        seen: set[str] = set()
+        for entity, old, new in zip(entities, before, after):
+            if (u := entity.uuid) in seen:
+                continue
+            seen.add(u)
+            if index is not None:
+                if old is None:
+                    index.add(new, u)  # type: ignore[arg-type]
+                else:
+                    index.move(u, old, new)  # type: ignore[arg-type]
+            if journal is not None and old != new:
+                journal._score(self.objective, entity, u, old, new)
+
+    def _values_many(self, entities: Optional[Sequence[Entity]]) -> list[Optional[int]]:
+        """获取一组entity的分数, 不在计分项中的为None; entities为None时按mapping顺序返回整个计分项"""
+        if entities is None:
+            return [v.value for v in self.mapping.values()]
+        get = self.mapping.get
+        return [None if (v := get(e.uuid)) is None else v.value for e in entities]
+
+    def players_add_many(self, entities: Optional[Sequence[Entity]], count: Integer) -> None:
+        """
+        对一组entity执行players_add, entities为None时作用于整个计分项
+
+        与逐个调用players_add的结果一致 (32位回绕), 但只做一次参数检查且不创建中间Int32
+        """
+        if not checking32(count):
+            raise MalformedException("'count' must be a valid 32-bit integer")
+        self._apply(entities, _OPERATIONS["+="], int(count))
+
+    def players_remove_many(self, entities: Optional[Sequence[Entity]], count: Integer) -> None:
+        """对一组entity执行players_remove, entities为None时作用于整个计分项"""
+        self.players_add_many(entities, -count)
+
+    def players_test_many(self, entities: Optional[Sequence[Entity]], _min: Integer, _max: Integer = 2147483647) -> list[bool]:
+        """
+        检测一组entity的值是否在_min与_max中, 返回与entities一一对应的掩码
+
+        不在计分项中的entity对应False; entities为None时掩码与mapping的键顺序一致
+        """
+        if not checking32(_min):
+            raise MalformedException("min must be a valid 32-bit integer")
+        if not checking32(_max):
+            raise MalformedException("max must be a valid 32-bit integer")
+        lo, hi = int(_min), int(_max)
+        return [v is not None and lo <= v <= hi for v in self._values_many(entities)]
+
+    @staticmethod
+    def players_operation_many(players: Optional[Sequence[Entity]], target_objective: Scoreboard, operation: str, selector: Entity, objective: Scoreboard) -> None:
+        """
+        对一组实体执行players_operation, players为None时作用于target_objective中的所有实体
+
+        与按顺序逐个调用players_operation的结果一致; '><' 需要显式给出players并逐个执行
+        """
+        if operation == "><":
+            if players is None:
+                raise MalformedException("'><' requires an explicit sequence of players")
+            for player in players:
+                Scoreboard.players_operation(player, target_objective, operation, selector, objective)
+            return
+
+        if (kernel := _OPERATIONS.get(operation)) is None:
+            raise MalformedException(f"{operation} does not have a corresponding operation")
+
+        if not objective.has_entity(selector):
+            objective.players_set(selector, 0)
+        operand = int(objective.get_scoreboard_value(selector))
+        track = selector if target_objective is objective else None
+        target_objective._apply(players, kernel, operand, track)
+
+    # ========== 有序索引 ==========
+
+    def _index_items(self) -> Iterator[tuple[int, str]]:
+        """以 (分数, uuid) 遍历整个计分项, 用于构建索引"""
+        return ((v.value, u) for u, v in self.mapping.items())
+
+    def enable_index(self) -> ScoreIndex:
+        """
+        为本计分项启用有序索引, 已启用时直接返回
+
+        启用后所有 players_* 写入 (包括批量操作) 都会增量维护索引,
+        select_range/count_range/rank_of/top 将以对数时间完成, 否则退化为全表扫描
+        """
+        if self.index is None:
+            self.index = ScoreIndex(self._index_items())
+        return self.index
+
+    def disable_index(self) -> None:
+        """停用并丢弃有序索引"""
+        self.index = None
+
+    def _checked_range(self, _min: Integer, _max: Integer) -> tuple[int, int]:
+        if not checking32(_min):
+            raise MalformedException("min must be a valid 32-bit integer")
+        if not checking32(_max):
+            raise MalformedException("max must be a valid 32-bit integer")
+        return int(_min), int(_max)
+
+    def select_range(self, _min: Integer, _max: Integer = 2147483647) -> list[str]:
+        """按分数升序返回分数在_min与_max中的所有实体uuid (对应 @a[scores={x=_min.._max}])"""
+        lo, hi = self._checked_range(_min, _max)
+        if self.index is not None:
+            return [u for _, u in self.index.range(lo, hi)]
+        return [u for _, u in sorted(i for i in self._index_items() if lo <= i[0] <= hi)]
+
+    def count_range(self, _min: Integer, _max: Integer = 2147483647) -> int:
+        """分数在_min与_max中的实体个数"""
+        lo, hi = self._checked_range(_min, _max)
+        if self.index is not None:
+            return self.index.count(lo, hi)
+        return sum(1 for v, _ in self._index_items() if lo <= v <= hi)
+
+    def rank_of(self, entity: Entity) -> int:
+        """entity的排名 (分数从高到低, 从1开始, 同分共享名次)"""
+        if (value := self._get_raw(entity)) is None:
+            raise ReferenceNotFoundException(f"no entity found with uuid as {entity.uuid}")
+        if self.index is not None:
+            return self.index.rank(value)
+        return 1 + sum(1 for v, _ in self._index_items() if v > value)
+
+    def top(self, k: int) -> list[tuple[str, int]]:
+        """分数最高的k个实体, 以 (uuid, 分数) 降序返回, 同分时按uuid降序"""
+        if self.index is not None:
+            return [(u, v) for v, u in self.index.top(k)]
+        return [(u, v) for v, u in sorted(self._index_items(), reverse = True)[:max(k, 0)]]
+
+    # ========== 快照 (写时复制) ==========
+
+    def _own(self) -> None:
+        """快照之后的第一次写入前复制存储与索引, 使快照持有的容器保持不变"""
+        self.mapping = {u: v.copy() for u, v in self.mapping.items()}
+        if self.index is not None:
+            self.index = self.index.copy()
+        self._shared = False
+
+    def _snapshot(self) -> tuple:
+        """O(1)地记录当前存储, 之后的写入会先复制存储"""
+        self._shared = True
+        return self.mapping, self.index
+
+    def _restore(self, state: tuple) -> None:
+        """换回_snapshot记录的存储, 该存储仍被快照共享"""
+        self.mapping, self.index = state
+        self._shared = True
+
+    def _holds(self, state: tuple) -> bool:
+        """当前存储是否仍是state中记录的存储 (即快照之后没有写入)"""
+        return self.mapping is state[0]
+
+    def _members(self) -> set[str]:
+        """本计分项中所有实体的uuid"""
+        return set(self.mapping)
+
+    def __len__(self) -> int:
+        return len(self.mapping)
+
     def serialize(self) -> dict:
         return {
             "objective": self.objective,
             "display_name": self.display_name,
-            "mapping": {i: int(j) for i, j in self.mapping.items()}
+            "mapping": {i: j.value for i, j in self.mapping.items()}
         }
 
     def group_serialize(self) -> tuple[str, dict]:
         return self.objective, {
             "display_name": self.display_name,
-            "mapping": {i: int(j) for i, j in self.mapping.items()}
+            "mapping": {i: j.value for i, j in self.mapping.items()}
         }
 
+    # ========== 流式序列化 ==========
+
+    def _iter_scores(self) -> Iterator[tuple[str, int]]:
+        """以 (uuid, 分数) 遍历整个计分项, 顺序与serialize一致"""
+        return ((u, v.value) for u, v in self.mapping.items())
+
+    def _stream_items(self) -> list[tuple[str, object]]:
+        """group_serialize()[1] 的流式版本"""
+        return [("display_name", self.display_name), ("mapping", StreamDict(self._iter_scores()))]
+
+    def iter_serialize(self, indent: int = 2, ensure_ascii: bool = False) -> Iterator[str]:
+        """
+        逐块生成serialize()的json文本, 不构造完整的dict, 见 JsonSerializer.dump_stream
+
+        生成过程中不应修改本计分项
+        """
+        return iter_json(StreamDict([("objective", self.objective), *self._stream_items()]), indent, ensure_ascii)
+
+class CompiledOperation(object):
+    """
+    预编译的 players_operation
+
+    编译时即确定两个计分项与操作符对应的原始整数内核, 执行时不再匹配操作符字符串,
+    也不构造partial与复制操作数. 调用方式: op(player, selector)
+    """
+    __slots__ = ("target_objective", "operation", "objective", "_kernel")
+
+    def __init__(self, target_objective: Scoreboard, operation: str, objective: Scoreboard) -> None:
+        if operation != "><" and operation not in _OPERATIONS:
+            raise MalformedException(f"{operation} does not have a corresponding operation")
+        self.target_objective = target_objective
+        self.operation = operation
+        self.objective = objective
+        self._kernel = _OPERATIONS.get(operation)
+
+    def __call__(self, player: Entity, selector: Entity) -> None:
+        target, source = self.target_objective, self.objective
+
+        if (a := target._get_raw(player)) is None:
+            a = 0
+            target._set_raw(player, 0)
+        if (b := source._get_raw(selector)) is None:
+            b = 0
+            source._set_raw(selector, 0)
+
+        if (kernel := self._kernel) is None:
+            # "><"
+            target._set_raw(player, b)
+            source._set_raw(selector, a)
+        elif (r := kernel(a, b)) is not None:
+            target._set_raw(player, r)
+
+    def many(self, players: Optional[Sequence[Entity]], selector: Entity) -> None:
+        """对一组实体执行该操作, 等价于 Scoreboard.players_operation_many"""
+        Scoreboard.players_operation_many(players, self.target_objective, self.operation, selector, self.objective)
+
+    def __repr__(self) -> str:
+        return f"CompiledOperation({self.target_objective.objective} {self.operation} {self.objective.objective})"
+
 class LocalScoreboards(object):
-    def __init__(self) -> None:
+    def __init__(self, columnar: bool = False, slots: Optional[SlotMap] = None) -> None:
+        """
+        args:
+            columnar: 为True时使用列式存储的计分板 (ColumnarScoreboard),
+                      所有计分项共享同一个 uuid -> slot 映射
+            slots: 共享的槽位映射, 为None时新建一个
+        """
         # Scoreboard.objective -> Scoreboard
         self.mapping: dict[str, Scoreboard] = {}
+        self.columnar = columnar
+        self.slots = slots if slots is not None else SlotMap()
+        self.journal: Optional[Journal] = None
 
     def has_scoreboard(self, objective: str) -> bool:
         """检测是否存在scoreboard"""
@@ -156,8 +543,16 @@ class LocalScoreboards(object):
         """动态添加scoreboard"""
         if objective in self.mapping:
             raise MalformedException(f"objective {objective} already exists in this local scoreboards.")
-        sc = Scoreboard(objective, display_name)
+        sc: Scoreboard
+        if self.columnar:
+            from .columnar import ColumnarScoreboard
+            sc = ColumnarScoreboard(objective, display_name, self.slots)
+        else:
+            sc = Scoreboard(objective, display_name)
+        sc.journal = self.journal
         self.mapping[objective] = sc
+        if self.journal is not None:
+            self.journal._objective(True, objective, display_name)
         return sc
 
     def objectives_add(self, objective: str, display_name: str = "") -> Scoreboard:
@@ -165,9 +560,29 @@ class LocalScoreboards(object):
         return self.add_scoreboard(objective, display_name)
 
     def objectives_remove(self, objective: str) -> None:
-        """动态移除scoreboard"""
+        """动态移除scoreboard, 其中的分数一并删除"""
         if objective in self.mapping:
-            del self.mapping[objective]
+            board = self.mapping.pop(objective)
+            if self.journal is not None:
+                for v, u in board._index_items():
+                    self.journal._score(objective, None, u, v, None)
+                self.journal._objective(False, objective, board.display_name, board)
+            board._clear()
+
+    def _reinstate(self, board: Scoreboard) -> None:
+        """将被objectives_remove移除的board原样放回 (撤销移除时调用), 其分数随后由日志恢复"""
+        objective = board.objective
+        if objective in self.mapping:
+            raise MalformedException(f"objective {objective} already exists in this local scoreboards.")
+        board._clear()
+        board.journal = self.journal
+        self.mapping[objective] = board
+        if self.journal is not None:
+            self.journal._objective(True, objective, board.display_name)
 
     def serialize(self) -> dict:
-        return {i: j.group_serialize()[1] for i, j in self.mapping.items()}
\ No newline at end of file
+        return {i: j.group_serialize()[1] for i, j in self.mapping.items()}
+
+    def iter_serialize(self, indent: int = 2, ensure_ascii: bool = False) -> Iterator[str]:
+        """逐块生成serialize()的json文本, 内存占用与分数总数无关, 见 JsonSerializer.dump_stream"""
+        return iter_json(StreamDict((i, StreamDict(j._stream_items())) for i, j in self.mapping.items()), indent, ensure_ascii)
\ No newline at end of file
@@ -0,0 +1,265 @@
+# create by lesomras on 2026-10-17
+from __future__ import annotations
+from typing import TYPE_CHECKING, Union, Optional, Iterable
+import random
+import re
+
+from .entity import Entity
+from miststar.internal.exceptions import MalformedException
+from miststar.internal.int32 import checking32
+from miststar.textcomps.components import Selector
+
+if TYPE_CHECKING:
+    from .localenv import LocalEnv
+
+_SELECTOR = re.compile(r"@(initiator|[aeprsn])\s*(?:\[(.*)\])?", re.S)
+_INT_MIN, _INT_MAX = -2147483648, 2147483647
+
+# 未显式给出type时默认只选择玩家的选择器
+_PLAYER_ONLY = {"a", "p", "r"}
+# 未给出c时默认只选择一个实体的选择器
+_SINGLE = {"p", "r", "n"}
+
+def _split_arguments(content: str) -> list[str]:
+    """按顶层逗号切分选择器参数 (忽略 {} 与引号内的逗号)"""
+    result: list[str] = []
+    depth, quoted, start = 0, False, 0
+    for i, char in enumerate(content):
+        if char == '"':
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+        elif char == "," and depth == 0:
+            result.append(content[start:i])
+            start = i + 1
+    if depth != 0 or quoted:
+        raise MalformedException(f"unbalanced selector arguments: {content}")
+    result.append(content[start:])
+    return [i.strip() for i in result if i.strip()]
+
+def _negated(value: str) -> tuple[bool, str]:
+    if value.startswith("!"):
+        return True, value[1:].strip()
+    return False, value
+
+def _unquote(value: str) -> str:
+    if len(value) >= 2 and value[0] == value[-1] == '"':
+        return value[1:-1]
+    return value
+
+def _parse_int(value: str) -> int:
+    try:
+        result = int(value)
+    except ValueError:
+        raise MalformedException(f"invalid integer in selector: {value!r}") from None
+    if not checking32(result):
+        raise MalformedException(f"{value} is not a valid 32-bit integer")
+    return result
+
+def parse_range(value: str) -> tuple[int, int]:
+    """
+    解析分数范围
+
+    mapping:
+        "5" -> (5, 5)
+        "1.." -> (1, 2147483647)
+        "..5" -> (-2147483648, 5)
+        "1..5" -> (1, 5)
+    """
+    if ".." not in value:
+        n = _parse_int(value)
+        return n, n
+    lo, hi = value.split("..", 1)
+    return (
+        _parse_int(lo) if lo else _INT_MIN,
+        _parse_int(hi) if hi else _INT_MAX,
+    )
+
+def _type_name(entity: Entity) -> str:
+    """实体类型名: "entity::player" -> "player" """
+    return entity._type.rsplit("::", 1)[-1]
+
+class SelectorPlan(object):
+    """
+    解析后的选择器
+
+    tags 保持 LocalTags.query 的条件格式; scores 中不取反的条件排在前面,
+    以便求值时优先用有序索引缩小候选集
+    """
+    __slots__ = ("selector", "kind", "tags", "scores", "types", "names", "count")
+
+    def __init__(self, selector: str) -> None:
+        self.selector = selector
+        if (match := _SELECTOR.fullmatch(selector.strip())) is None:
+            raise MalformedException(f"invalid selector: {selector}")
+        self.kind: str = match.group(1)
+        self.tags: list[str] = []
+        # (objective, min, max, 取反)
+        self.scores: list[tuple[str, int, int, bool]] = []
+        # (类型名, 取反)
+        self.types: list[tuple[str, bool]] = []
+        # (名字, 取反)
+        self.names: list[tuple[str, bool]] = []
+        self.count: Optional[int] = None
+
+        for argument in _split_arguments(match.group(2) or ""):
+            key, sep, value = argument.partition("=")
+            key, value = key.strip(), value.strip()
+            if not sep:
+                raise MalformedException(f"selector argument {argument!r} is missing '='")
+            match key:
+                case "tag":
+                    negated, value = _negated(value)
+                    self.tags.append(("!" if negated else "") + _unquote(value))
+                case "type":
+                    negated, value = _negated(value)
+                    name = _unquote(value)
+                    self.types.append((name.split(":", 1)[1] if name.startswith("minecraft:") else name, negated))
+                case "name":
+                    negated, value = _negated(value)
+                    self.names.append((_unquote(value), negated))
+                case "c":
+                    if self.count is not None:
+                        raise MalformedException("duplicate selector argument 'c'")
+                    if (count := _parse_int(value)) == 0:
+                        raise MalformedException("selector argument 'c' must not be 0")
+                    self.count = count
+                case "scores":
+                    self._parse_scores(value)
+                case _:
+                    raise MalformedException(f"unsupported selector argument: {key}")
+
+        self.scores.sort(key = lambda x: x[3])
+        if self.count is None and self.kind in _SINGLE:
+            self.count = 1
+        if self.kind in _PLAYER_ONLY and not self.types:
+            self.types.append(("player", False))
+
+    def _parse_scores(self, value: str) -> None:
+        if not (value.startswith("{") and value.endswith("}")):
+            raise MalformedException(f"invalid scores argument: {value}")
+        for item in _split_arguments(value[1:-1]):
+            objective, sep, spec = item.partition("=")
+            if not sep:
+                raise MalformedException(f"invalid scores argument: {item}")
+            negated, spec = _negated(spec.strip())
+            lo, hi = parse_range(spec)
+            self.scores.append((_unquote(objective.strip()), lo, hi, negated))
+
+    def __repr__(self) -> str:
+        return f"SelectorPlan({self.selector})"
+
+# 每个 SelectorEvaluator 缓存的选择器数量上限, 超出时淘汰最早加入的
+_PLANS_SIZE = 256
+
+class SelectorEvaluator(object):
+    """
+    在 LocalEnv 上解析目标选择器
+
+    选择器字符串只解析一次, 解析结果按字符串缓存 (至多 _PLANS_SIZE 个). 求值时依次:
+        1. 以标签索引 (LocalTags.query) 得到候选集
+        2. 没有肯定标签时, 若某个分数条件所在的计分项启用了有序索引, 则以范围查询得到候选集
+        3. 逐个检查剩余的分数条件、类型与名字
+        4. 按 c 截取 (@r 随机抽取)
+    候选实体的全集为 LocalEnv 中已登记的实体, 结果按槽位顺序排列
+    """
+
+    def __init__(self, env: LocalEnv) -> None:
+        self.env = env
+        self._plans: dict[str, SelectorPlan] = {}
+
+    def compile(self, selector: Union[str, Selector]) -> SelectorPlan:
+        """解析选择器 (带缓存)"""
+        if isinstance(selector, Selector):
+            selector = selector.content
+        if (plan := self._plans.get(selector)) is None:
+            if len(self._plans) >= _PLANS_SIZE:
+                del self._plans[next(iter(self._plans))]
+            plan = self._plans[selector] = SelectorPlan(selector)
+        return plan
+
+    def select(self, selector: Union[str, Selector], executor: Optional[Entity] = None) -> list[Entity]:
+        """
+        返回selector选中的实体
+
+        args:
+            selector: 选择器字符串或 Selector 组件
+            executor: 命令执行者, @s 与 @initiator 选中它
+        """
+        plan = self.compile(selector)
+        slots = self.env.scoreboard.slots
+        boards = self.env.scoreboard.mapping
+
+        # ----- 候选集 -----
+        candidates: Iterable[Entity]
+        scores = plan.scores
+        if plan.kind in ("s", "initiator"):
+            if executor is None:
+                return []
+            candidates = self.env.tag.query(*plan.tags, universe = [executor])
+        elif any(not i.startswith("!") and i != "" for i in plan.tags):
+            candidates = [i for i in self.env.tag.query(*plan.tags) if i.uuid in slots]
+        else:
+            seed = self._score_seed(plan)
+            if seed is not None:
+                uuids, scores = seed
+                index = slots.slots
+                entities = slots.entities
+                candidates = [entities[index[u]] for u in uuids if u in index]  # type: ignore[misc]
+                candidates = self.env.tag.query(*plan.tags, universe = candidates) if plan.tags else candidates
+            else:
+                candidates = self.env.tag.query(*plan.tags, universe = slots) if plan.tags else slots
+
+        # ----- 过滤: 分数 -> 类型 -> 名字 -----
+        checks = []
+        for objective, lo, hi, negated in scores:
+            if (board := boards.get(objective)) is None:
+                return []
+            checks.append((board._get_raw, lo, hi, negated))
+
+        result: list[Entity] = []
+        for entity in candidates:
+            for get, lo, hi, negated in checks:
+                if (v := get(entity)) is None or (lo <= v <= hi) == negated:
+                    break
+            else:
+                if all((_type_name(entity) == t) != n for t, n in plan.types) and all((entity.name == m) != n for m, n in plan.names):
+                    result.append(entity)
+
+        # ----- 排序与截取 -----
+        if len(result) > 1:
+            order = slots.slots
+            result.sort(key = lambda e: order[e.uuid])
+        if (count := plan.count) is None:
+            return result
+        if plan.kind == "r":
+            return random.sample(result, min(abs(count), len(result)))
+        if count > 0:
+            return result[:count]
+        return result[::-1][:-count]
+
+    def _score_seed(self, plan: SelectorPlan) -> Optional[tuple[list[str], list[tuple[str, int, int, bool]]]]:
+        """在启用了有序索引的分数条件中选出命中数最少的一个, 返回 (uuid列表, 其余分数条件)"""
+        boards = self.env.scoreboard.mapping
+        best, best_count = None, None
+        for i, (objective, lo, hi, negated) in enumerate(plan.scores):
+            if negated:
+                break
+            board = boards.get(objective)
+            if board is None or board.index is None:
+                continue
+            count = board.index.count(lo, hi)
+            if best_count is None or count < best_count:
+                best, best_count = i, count
+        if best is None:
+            return None
+        objective, lo, hi, _ = plan.scores[best]
+        rest = plan.scores[:best] + plan.scores[best + 1:]
+        return boards[objective].select_range(lo, hi), rest
+
+    def clear_cache(self) -> None:
+        self._plans.clear()
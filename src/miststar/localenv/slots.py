@@ -0,0 +1,57 @@
+# create by lesomras on 2026-10-17
+from __future__ import annotations
+from typing import Optional, Iterator
+
+from .entity import Entity
+
+class SlotMap(object):
+    """
+    uuid -> 稠密槽位(slot)的映射
+
+    槽位从0开始连续分配, 由LocalScoreboards中的所有计分项共享,
+    列式计分板以槽位作为数组下标存储分数
+    """
+
+    def __init__(self) -> None:
+        # uuid -> slot
+        self.slots: dict[str, int] = {}
+        # slot -> uuid / Entity, 空闲槽位为 "" / None
+        self.uuids: list[str] = []
+        self.entities: list[Optional[Entity]] = []
+
+    def slot_of(self, entity: Entity) -> int:
+        """获取entity的槽位, 不存在时分配一个新的槽位"""
+        slot = self.slots.get(entity.uuid)
+        if slot is None:
+            slot = len(self.uuids)
+            self.slots[entity.uuid] = slot
+            self.uuids.append(entity.uuid)
+            self.entities.append(entity)
+        return slot
+
+    def find(self, _uuid: str) -> Optional[int]:
+        """查找uuid对应的槽位, 不存在时返回None"""
+        return self.slots.get(_uuid)
+
+    def get(self, _uuid: str) -> Optional[Entity]:
+        """查找uuid对应的实体, 不存在时返回None"""
+        slot = self.slots.get(_uuid)
+        return None if slot is None else self.entities[slot]
+
+    @property
+    def capacity(self) -> int:
+        """已分配的槽位数 (包括空闲槽位), 即按槽位索引的数组应有的长度"""
+        return len(self.uuids)
+
+    def __iter__(self) -> Iterator[Entity]:
+        """按槽位顺序遍历所有实体"""
+        return (i for i in self.entities if i is not None)
+
+    def __contains__(self, _uuid: str) -> bool:
+        return _uuid in self.slots
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def __repr__(self) -> str:
+        return f"SlotMap(length={len(self.slots)})"
@@ -1,35 +1,189 @@
 # create by lesomras on 2025-12-22
+from __future__ import annotations
+from typing import Optional, Iterable, Iterator
 
 from .entity import Entity
+from .journal import Journal
+from miststar.serializer.stream import StreamDict, StreamList, iter_json
+from miststar.internal.exceptions import MalformedArgument
+
+_EMPTY: frozenset = frozenset()
 
 class LocalTags(object):
     def __init__(self) -> None:
         self.tags: set[str] = set()
         self.entities: dict[str, set[Entity]] = {}
+        # 写时复制: 每次快照使_epoch加一, _owned记录各标签的实体集合在哪一代被复制过
+        self._epoch = 0
+        self._owned: dict[str, int] = {}
+        # 修改日志, 由 LocalEnv.enable_journal 设置
+        self.journal: Optional[Journal] = None
 
     def has_tag(self, entity: Entity, tag: str) -> bool:
         """检测entity上是否存在tag标签"""
-        return tag in self.entities and entity in self.entities[tag]
+        # entity.tags 只需对tag字符串求哈希 (字符串缓存了哈希值), 作为预检可以跳过大多数不带该标签的实体;
+        # 但它可能来自其他LocalTags, 仍需确认entity属于本存储
+        return tag in entity.tags and (entities := self.entities.get(tag)) is not None and entity in entities
 
     def tag_add(self, entity: Entity, tag: str) -> None:
         """给entity增加一个tag标签"""
+        if self.journal is not None and not self.has_tag(entity, tag):
+            self.journal._tag(entity, tag, True)
         self.tags.add(tag)
         entity.tags.add(tag)
         if tag not in self.entities:
             self.entities[tag] = {entity}
+            self._owned[tag] = self._epoch
         else:
-            self.entities[tag].add(entity)
+            self._own(tag).add(entity)
 
     def tag_remove(self, entity: Entity, tag: str) -> None:
         "去除entity上的tag标签"""
         if not self.has_tag(entity, tag):
             return
 
+        if self.journal is not None:
+            self.journal._tag(entity, tag, False)
         entity.tags.remove(tag)
-        self.entities[tag].remove(entity)
-        if len(self.entities[tag]) == 0:
+        entities = self._own(tag)
+        entities.discard(entity)
+        if len(entities) == 0:
             del self.entities[tag]
 
+    def tag_clear(self, entity: Entity) -> None:
+        """去除entity上的所有标签"""
+        for tag in list(entity.tags):
+            self.tag_remove(entity, tag)
+
+    # ========== 快照 (写时复制) ==========
+
+    def _own(self, tag: str) -> set[Entity]:
+        """返回可以原地修改的tag实体集合, 若仍被快照共享则先复制"""
+        entities = self.entities[tag]
+        if self._owned.get(tag) != self._epoch:
+            entities = self.entities[tag] = set(entities)
+            self._owned[tag] = self._epoch
+        return entities
+
+    def _snapshot(self) -> tuple:
+        """记录当前标签, 只复制 tag -> 集合 的字典本身, 各集合在之后被修改时才复制"""
+        self._epoch += 1
+        return set(self.tags), dict(self.entities)
+
+    def _restore(self, state: tuple) -> None:
+        """换回_snapshot记录的标签, 并同步被修改过的标签在各实体上的 tags"""
+        tags, entities = state
+        current = self.entities
+        for tag in current.keys() | entities.keys():
+            before, after = current.get(tag, _EMPTY), entities.get(tag, _EMPTY)
+            if before is after:
+                continue
+            for entity in before - after:
+                entity.tags.discard(tag)
+            for entity in after - before:
+                entity.tags.add(tag)
+        self.tags = set(tags)
+        self.entities = dict(entities)
+        self._epoch += 1
+
+    def _reattach(self, gone: Iterable[Entity], returned: Iterable[Entity]) -> None:
+        """
+        快照恢复后修正实体自身的标签容器
+
+        gone 为恢复后不再登记的实体, returned 为恢复后重新登记的实体;
+        LocalTags 的实体标签已在_restore中同步, 无需处理
+        """
+
+    # ========== 查询 ==========
+
+    @staticmethod
+    def _split(tags: Iterable[str]) -> tuple[list[str], list[str], bool, bool]:
+        """将标签条件拆分为 (必须带有, 不能带有, 没有任何标签, 至少一个标签)"""
+        include: list[str] = []
+        exclude: list[str] = []
+        untagged = tagged = False
+        for tag in tags:
+            if not isinstance(tag, str):
+                raise MalformedArgument(f"tag condition must be a string, but received {tag!r}")
+            if tag == "":
+                untagged = True
+            elif tag == "!":
+                tagged = True
+            elif tag[0] == "!":
+                exclude.append(tag[1:])
+            else:
+                include.append(tag)
+        return include, exclude, untagged, tagged
+
+    def query(self, *tags: str, universe: Optional[Iterable[Entity]] = None) -> Iterator[Entity]:
+        """
+        按标签条件筛选实体, 对应 @e[tag=a,tag=!b,...] 中的所有tag参数 (合取)
+
+        args:
+            tags: 标签条件; "a" 表示必须带有a, "!a" 表示不能带有a,
+                  "" 表示没有任何标签, "!" 表示至少带有一个标签
+            universe: 候选实体; 为None时为当前带有任意标签的实体
+                      (此时只含否定条件或 "" 的查询无法得知未打标签的实体)
+        结果惰性生成: 调用时只检查参数, 首次迭代时才求值. 迭代过程中不应修改标签
+        """
+        return self._evaluate(*self._split(tags), universe)
+
+    def _evaluate(self, include: list[str], exclude: list[str], untagged: bool, tagged: bool, universe: Optional[Iterable[Entity]]) -> Iterator[Entity]:
+        if universe is not None and not isinstance(universe, (set, frozenset)):
+            # 任意可迭代对象: 逐个检查实体自身的标签集合, 保持universe的顺序
+            for entity in universe:
+                t = entity.tags
+                if (
+                    (not untagged or not t) and
+                    (not tagged or t) and
+                    all(i in t for i in include) and
+                    not any(i in t for i in exclude)
+                ):
+                    yield entity
+            return
+
+        entities = self.entities
+        if include:
+            # 从最小的集合开始求交集; set之间的交集与差集直接使用集合中保存的哈希值,
+            # 不会再调用 Entity.__hash__
+            sets = [entities.get(i, _EMPTY) for i in include]
+            if universe is not None:
+                sets.append(universe)
+            sets.sort(key = len)
+            result = set(sets[0])
+            for s in sets[1:]:
+                if not result:
+                    return
+                result &= s
+        elif universe is not None:
+            result = set(universe)
+        else:
+            result = set().union(*entities.values())
+
+        for i in exclude:
+            if not result:
+                return
+            if (excluded := entities.get(i)) is not None:
+                result -= excluded
+
+        if untagged and tagged:
+            return
+        if untagged:
+            yield from (i for i in result if not i.tags)
+        elif tagged:
+            yield from (i for i in result if i.tags)
+        else:
+            yield from result
+
+    # ========== 序列化 ==========
+
+    def _tag_members(self) -> Iterator[tuple[str, Iterable[Entity]]]:
+        """以 (tag, 实体) 遍历所有非空标签"""
+        return iter(self.entities.items())
+
     def serialize(self) -> dict:
-        _serializer = lambda x: [repr(i) for i in x]
-        return {i: _serializer(j) for i, j in self.entities.items()}
\ No newline at end of file
+        return {i: [repr(e) for e in j] for i, j in self._tag_members()}
+
+    def iter_serialize(self, indent: int = 2, ensure_ascii: bool = False) -> Iterator[str]:
+        """逐块生成serialize()的json文本, 见 JsonSerializer.dump_stream"""
+        return iter_json(StreamDict((i, StreamList(repr(e) for e in j)) for i, j in self._tag_members()), indent, ensure_ascii)
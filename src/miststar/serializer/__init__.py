@@ -9,6 +9,11 @@ from .json_serializer import (
     dump_json_compact,   # 快捷函数：保存紧凑JSON
     dumps_json_compact,  # 快捷函数：序列化为紧凑JSON字符串
 )
+from .stream import (
+    StreamDict,          # 流式序列化的字典
+    StreamList,          # 流式序列化的列表
+    iter_json,           # 逐块生成JSON文本
+)
 
 __all__= [
     "JsonSerializer",
@@ -19,4 +24,7 @@ __all__= [
     "dumps_json",
     "dump_json_compact",
     "dumps_json_compact",
+    "StreamDict",
+    "StreamList",
+    "iter_json",
 ]
\ No newline at end of file
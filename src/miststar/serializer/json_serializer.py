@@ -1,8 +1,10 @@
 # create by lesomras on 2025-12-18
 import json
 from pathlib import Path
+from typing import Iterator
 
 from miststar.internal.exceptions import MalformedArgument
+from .stream import StreamDict, StreamList, iter_json
 
 class JsonSerializer(object):
     """JSON序列化器"""
@@ -42,6 +44,31 @@ class JsonSerializer(object):
         with open(path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=indent, ensure_ascii=ensure_ascii)
 
+    @staticmethod
+    def dump_stream(data, file_path: str | Path, indent: int = 2, ensure_ascii: bool = False, buffer_size: int = 1 << 16) -> None:
+        """
+        流式保存到文件, 结果与dump相同
+
+        data可以包含 StreamDict/StreamList (见 miststar.serializer.stream), 也可以直接是
+        iter_json 等生成的json文本块迭代器; 文本块攒够buffer_size个字符后写入一次
+        """
+        if isinstance(data, (StreamDict, StreamList)) or not isinstance(data, Iterator):
+            data = iter_json(data, indent, ensure_ascii)
+        path = Path(file_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with open(path, 'w', encoding='utf-8') as f:
+            buffer: list[str] = []
+            size = 0
+            for chunk in data:
+                buffer.append(chunk)
+                size += len(chunk)
+                if size >= buffer_size:
+                    f.write("".join(buffer))
+                    buffer.clear()
+                    size = 0
+            f.write("".join(buffer))
+
     @staticmethod
     def is_valid_json(json_str: str) -> bool:
         """检查字符串是否为有效的JSON"""
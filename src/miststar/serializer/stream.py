@@ -0,0 +1,78 @@
+# create by lesomras on 2026-10-17
+from __future__ import annotations
+from typing import Any, Iterable, Iterator
+from json.encoder import encode_basestring, encode_basestring_ascii
+import json
+
+class StreamDict(object):
+    """以 (key, value) 迭代器表示的字典, 由iter_json逐项序列化, 不需要事先构造完整的dict"""
+    __slots__ = ("items", )
+
+    def __init__(self, items: Iterable[tuple[Any, Any]]) -> None:
+        self.items = items
+
+class StreamList(object):
+    """以迭代器表示的列表, 由iter_json逐项序列化"""
+    __slots__ = ("items", )
+
+    def __init__(self, items: Iterable[Any]) -> None:
+        self.items = items
+
+_END = object()
+
+def _key(key: Any, encode) -> str:
+    # 与json模块一致: 非字符串的键先转为json字面量再作为字符串
+    if not isinstance(key, str):
+        key = json.dumps(key)
+    return encode(key)
+
+def iter_json(value: Any, indent: int = 2, ensure_ascii: bool = False, _level: int = 0) -> Iterator[str]:
+    """
+    逐块生成value的json文本, 拼接后与 json.dumps(value, indent = indent, ensure_ascii = ensure_ascii) 完全一致
+
+    value中的 StreamDict/StreamList 会被逐项展开, 其余值整体交给json模块序列化,
+    因此内存占用只取决于单个元素的大小, 与容器的总大小无关
+    """
+    cls = value.__class__
+    if cls is int:
+        yield int.__repr__(value)
+    elif cls is str:
+        yield (encode_basestring_ascii if ensure_ascii else encode_basestring)(value)
+    elif cls is StreamDict or cls is StreamList:
+        yield from _iter_container(value, indent, ensure_ascii, _level)
+    else:
+        text = json.dumps(value, indent = indent, ensure_ascii = ensure_ascii)
+        if _level and "\n" in text:
+            # json字符串中的换行均已转义, 文本中的换行只来自缩进
+            text = text.replace("\n", "\n" + " " * (indent * _level))
+        yield text
+
+def _iter_container(value: StreamDict | StreamList, indent: int, ensure_ascii: bool, level: int) -> Iterator[str]:
+    is_dict = value.__class__ is StreamDict
+    items = iter(value.items)
+    if (first := next(items, _END)) is _END:
+        yield "{}" if is_dict else "[]"
+        return
+
+    encode = encode_basestring_ascii if ensure_ascii else encode_basestring
+    inner = "\n" + " " * (indent * (level + 1))
+    yield "{" if is_dict else "["
+    separator = inner
+    item: Any = first
+    while item is not _END:
+        if is_dict:
+            key, item = item
+            head = separator + _key(key, encode) + ": "
+        else:
+            head = separator
+        # 整数与字符串是最常见的叶子, 直接与前缀合并为一块
+        if (cls := item.__class__) is int:
+            yield head + int.__repr__(item)
+        elif cls is str:
+            yield head + encode(item)
+        else:
+            yield head
+            yield from iter_json(item, indent, ensure_ascii, level + 1)
+        separator = "," + inner
+        item = next(items, _END)
+    yield "\n" + " " * (indent * level) + ("}" if is_dict else "]")
@@ -24,14 +24,21 @@ from .components import (
     infer_type,       # 类型推断组件
 )
 
+# 解码器
+from .decoder import (
+    decode,           # 单次遍历将json数据解码为Rawtext
+)
+
 # 解析器
 from .parser import (
     Parser,         # 主要解析器
     parse_file,     # 快捷函数：从文件解析
     parse_string,   # 快捷函数：从字符串解析
+    iter_rawtext_file,  # 快捷函数：流式解析文件
     to_json_dict,   # 快捷函数：转换为JSON字典
     validate_rawtext_file,    # 快捷函数：验证文件
     validate_rawtext_string,  # 快捷函数：验证字符串
+    check_rawtext_file,       # 快捷函数：收集文件中的所有错误
     extract_components,      # 快捷函数：提取组件
 )
 
@@ -58,13 +65,18 @@ __all__ = [
     "template_analysis",
     "template_builder",
 
+    # 解码器
+    "decode",
+
     # 解析器
     "Parser",
     "parse_file",
     "parse_string",
+    "iter_rawtext_file",
     "to_json_dict",
     "validate_rawtext_file",
     "validate_rawtext_string",
+    "check_rawtext_file",
     "extract_components",
 ]
 
@@ -3,12 +3,33 @@
 from abc import ABC, abstractmethod
 from typing import Union, Optional, Callable, Literal
 
-from miststar.internal.dict_checking import is_value, list_of, matching
+from miststar.internal.dict_checking import is_value, list_of, compile_pattern, collect, join_path, Violation
 from miststar.internal.exceptions import UnsupportedArgument, MissingArgument, MalformedArgument
 
 segmentation = "[]."
 indentation = 4
 
+# from_dictionary 使用的模板及其预编译版本
+_RAWTEXT_PATTERN = {
+    "rawtext": lambda data_value, key: isinstance(data_value, list)
+}
+_TEXT_PATTERN = {
+    "text": str
+}
+_SCORE_PATTERN = {
+    "score": {
+        "name": str,
+        "objective": str
+    }
+}
+_SELECTOR_PATTERN = {
+    "selector": str
+}
+_match_rawtext = compile_pattern(_RAWTEXT_PATTERN)
+_match_text = compile_pattern(_TEXT_PATTERN)
+_match_score = compile_pattern(_SCORE_PATTERN)
+_match_selector = compile_pattern(_SELECTOR_PATTERN)
+
 class TextComponent(ABC):
     """所有文本组件的基类"""
 
@@ -51,9 +72,7 @@ class Rawtext(TextComponent):
 
     @classmethod
     def from_dictionary(cls, dictionary: dict) -> "Rawtext":
-        matching(dictionary, pattern = {
-            "rawtext": lambda data_value, key: isinstance(data_value, list)
-        })
+        _match_rawtext(dictionary)
         sequence = rawtext_lexer(dictionary["rawtext"])
         return cls(sequence)
 
@@ -177,6 +196,10 @@ class Rawtext(TextComponent):
     def __str__(self) -> str:
         return self.get_structured_str(0)
 
+    def __reduce__(self):
+        # BatchParser的进程池需要传回解析结果; 默认按__slots__序列化较慢, 而按构造参数重建又会重复检查
+        return (_rebuild_rawtext, (self._data, ))
+
     def __repr__(self) -> str:
         return self.get_structured_str(0, _repr = True)
 
@@ -240,9 +263,7 @@ class Text(TextComponent):
 
     @classmethod
     def from_dictionary(cls, dictionary: dict) -> "Text":
-        matching(dictionary, pattern = {
-            "text": str
-        })
+        _match_text(dictionary)
         return cls(dictionary["text"])
 
     @staticmethod
@@ -264,6 +285,9 @@ class Text(TextComponent):
     def __str__(self) -> str:
         return f"text  | {self.content}"
 
+    def __reduce__(self):
+        return (_rebuild_text, (self.content, ))
+
     def __repr__(self) -> str:
         return f"text<{id(self)}>  | {self.content} (text)"
 
@@ -282,12 +306,7 @@ class Score(TextComponent):
 
     @classmethod
     def from_dictionary(cls, dictionary: dict) -> "Score":
-        matching(dictionary, pattern = {
-            "score": {
-                "name": str,
-                "objective": str
-            }
-        })
+        _match_score(dictionary)
         return cls(dictionary["score"]["name"], dictionary["score"]["objective"])
 
     @staticmethod
@@ -340,6 +359,9 @@ class Score(TextComponent):
     def __str__(self) -> str:
         return f"score | {self.name} scoreboard :{self.objective}"
 
+    def __reduce__(self):
+        return (_rebuild_score, (self.name, self.objective))
+
     def __repr__(self) -> str:
         return f"score<{id(self)}> | {self.name} (name) scoreboard :{self.objective} (objective)"
 
@@ -358,9 +380,7 @@ class Selector(TextComponent):
 
     @classmethod
     def from_dictionary(cls, dictionary: dict) -> "Selector":
-        matching(dictionary, pattern = {
-            "selector": str
-        })
+        _match_selector(dictionary)
         return cls(dictionary["selector"])
 
     @staticmethod
@@ -382,6 +402,9 @@ class Selector(TextComponent):
     def __str__(self) -> str:
         return f"selector | {self.content}"
 
+    def __reduce__(self):
+        return (_rebuild_selector, (self.content, ))
+
     def __repr__(self) -> str:
         return f"selector<{id(self)}> | {self.content} (selector)"
 
@@ -533,10 +556,49 @@ class Translate(TextComponent):
     def __str__(self) -> str:
         return self.get_structured_str(0)
 
+    def __reduce__(self):
+        return (_rebuild_translate, (self.translate, self.with_content, self.string_sequence))
+
     def __repr__(self) -> str:
         return self.get_structured_str(0, _repr = True)
 
 
+# ========== pickle重建函数 ==========
+# 数据在序列化前已经过检查, 重建时直接填充__slots__
+
+def _rebuild_rawtext(data: list) -> Rawtext:
+    obj = Rawtext.__new__(Rawtext)
+    obj._data = data
+    return obj
+
+
+def _rebuild_text(content: str) -> Text:
+    obj = Text.__new__(Text)
+    obj.content = content
+    return obj
+
+
+def _rebuild_score(name: str, objective: str) -> Score:
+    obj = Score.__new__(Score)
+    obj.name = name
+    obj.objective = objective
+    return obj
+
+
+def _rebuild_selector(content: str) -> Selector:
+    obj = Selector.__new__(Selector)
+    obj.content = content
+    return obj
+
+
+def _rebuild_translate(translate: str, with_content: Optional[Rawtext], string_sequence: Optional[list[str]]) -> Translate:
+    obj = Translate.__new__(Translate)
+    obj.translate = translate
+    obj.with_content = with_content
+    obj.string_sequence = string_sequence
+    return obj
+
+
 def infer_type(sentence: str) -> tuple[Literal["text", "score", "selector"], list[str]]:
     """
     根据字符串推断构建组件类型
@@ -618,3 +680,86 @@ def rawtext_lexer(sequence: list[dict]) -> list[TextComponent]:
         else:
             raise MalformedArgument("dictionary error")
     return results
+
+
+# ========== 收集所有错误 ==========
+
+def rawtext_violations(dictionary: dict, path: str = "") -> list[Violation]:
+    """
+    一次遍历整个rawtext字典, 返回其中所有错误 (不抛出异常), 没有错误时返回空列表
+
+    判定规则与 Rawtext.from_dictionary 一致, 但遇到错误后继续检查其余部分;
+    每个错误附带json路径, 如 rawtext[412].score.name
+    """
+    return _collect_rawtext(dictionary, path, [])
+
+
+def sentence_violations(sentence: dict, path: str = "") -> list[Violation]:
+    """同 rawtext_violations, 但检查的是rawtext列表中的单个元素"""
+    return _collect_sentence(sentence, path, [])
+
+
+def _collect_rawtext(dictionary: dict, path: str, out: list[Violation]) -> list[Violation]:
+    collect(dictionary, _RAWTEXT_PATTERN, path, out)
+    sequence = dictionary.get("rawtext") if isinstance(dictionary, dict) else None
+    if isinstance(sequence, list):
+        path = join_path(path, "rawtext")
+        for i, sentence in enumerate(sequence):
+            _collect_sentence(sentence, f"{path}[{i}]", out)
+    return out
+
+
+def _collect_sentence(sentence: dict, path: str, out: list[Violation]) -> list[Violation]:
+    """与rawtext_lexer对单个元素的处理一一对应"""
+    if not isinstance(sentence, dict):
+        out.append(Violation(path, UnsupportedArgument, "dictionary error"))
+        return out
+
+    if len(sentence) > 1 and not ("translate" in sentence and "with" in sentence):
+        for key in sentence:
+            if key not in ("translate", "text", "score", "selector", None):
+                out.append(Violation(join_path(path, key), MalformedArgument, "priority dictionary error"))
+                return out
+        sentence = _array_processing(sentence)
+
+    if sentence == {}:
+        pass
+    elif "text" in sentence:
+        collect(sentence, _TEXT_PATTERN, path, out)
+    elif "score" in sentence:
+        collect(sentence, _SCORE_PATTERN, path, out)
+    elif "selector" in sentence:
+        before = len(out)
+        collect(sentence, _SELECTOR_PATTERN, path, out)
+        if len(out) == before and infer_type(sentence["selector"])[0] != "selector":
+            out.append(Violation(join_path(path, "selector"), MalformedArgument, f"invalid selector parameter: {sentence['selector']}"))
+    elif "translate" in sentence:
+        _collect_translate(sentence, path, out)
+    elif "rawtext" in sentence:
+        _collect_rawtext(sentence, path, out)
+    else:
+        out.append(Violation(path, MalformedArgument, "dictionary error"))
+    return out
+
+
+def _collect_translate(dictionary: dict, path: str, out: list[Violation]) -> None:
+    """与Translate.from_dictionary一一对应"""
+    if len(dictionary) > 2:
+        out.append(Violation(path, ValueError, "Dictionary contains extra keys"))
+        return
+    if not is_value(dictionary, "translate", str):
+        out.append(Violation(join_path(path, "translate"), UnsupportedArgument, "'translate' must be a string"))
+        return
+
+    if "with" not in dictionary:
+        if len(dictionary) > 1:
+            out.append(Violation(path, MalformedArgument, "Dictionary contains extra keys"))
+        return
+
+    with_value = dictionary["with"]
+    if isinstance(with_value, dict):
+        _collect_rawtext(with_value, join_path(path, "with"), out)
+    elif not isinstance(with_value, list):
+        out.append(Violation(join_path(path, "with"), UnsupportedArgument, "Exception parameter type"))
+    elif not all(isinstance(i, str) for i in with_value):
+        out.append(Violation(join_path(path, "with"), UnsupportedArgument, "'with' must be a list of strings or a dictionary"))
@@ -0,0 +1,157 @@
+# create by lesomras on 2026-10-17
+"""
+单次遍历的rawtext解码器
+
+rawtext_lexer 对每个节点要经过 list_of、_array_processing、逐个 in 判断以及 from_dictionary 中的模板匹配,
+大文件中每个节点会被遍历多次. 这里用预先建好的 键->处理函数 表在一次遍历中直接构造文本组件,
+只在数据不合法时才退回到各类的 from_dictionary, 以保证抛出的异常与 Parser.parse_data 完全一致
+"""
+from __future__ import annotations
+from typing import Optional
+
+from .components import TextComponent, Rawtext, Text, Score, Selector, Translate, _match_rawtext
+from .components import _rebuild_rawtext, _rebuild_text, _rebuild_score, _rebuild_translate
+from miststar.internal.exceptions import UnsupportedArgument, MalformedArgument
+
+# 与 _array_processing 相同的优先级
+_PRIORITY = {
+    "translate": 4,
+    "text": 3,
+    "score": 2,
+    "selector": 1,
+    None: 0
+}
+
+# 同时含有 translate 与 with 的元素不做优先级处理, 按 rawtext_lexer 的 in 判断顺序分派
+_ORDER = ("text", "score", "selector", "translate", "rawtext")
+
+
+def decode(data) -> Rawtext:
+    """
+    将已解码的json数据转换为Rawtext, 结果与异常均与 Parser.parse_data 一致
+
+    args:
+        data: rawtext字典, 不含 "rawtext" 键时视为单个文本组件
+    """
+    if not isinstance(data, dict):
+        raise MalformedArgument("Data must be a dictionary")
+    if "rawtext" not in data:
+        return _rebuild_rawtext(decode_sequence([data]))
+    return _rawtext(data)
+
+
+def decode_sequence(sequence: list) -> list[TextComponent]:
+    """rawtext_lexer 的单次遍历版本"""
+    if not isinstance(sequence, list):
+        raise UnsupportedArgument("Exception parameter type")
+
+    results: list[TextComponent] = []
+    append = results.append
+    handlers = _HANDLERS
+    for i, sentence in enumerate(sequence):
+        # 即 decode_sentence, 内联以省去每个元素一次函数调用
+        try:
+            if not isinstance(sentence, dict):
+                raise UnsupportedArgument("dictionary error")
+
+            if len(sentence) == 1:
+                key, = sentence
+                if (handler := handlers.get(key)) is None:
+                    raise MalformedArgument("dictionary error")
+                append(handler(sentence))
+            elif sentence:
+                append(_multiple(sentence))
+        except Exception:
+            # rawtext_lexer 在处理任何元素前先检查整个列表, 出错时按它的顺序报告
+            if i + 1 < len(sequence) and not all(isinstance(j, dict) for j in sequence[i + 1:]):
+                raise UnsupportedArgument("dictionary error") from None
+            raise
+    return results
+
+
+def decode_sentence(sentence: dict) -> Optional[TextComponent]:
+    """解码rawtext列表中的单个元素, 空字典返回None"""
+    if not isinstance(sentence, dict):
+        raise UnsupportedArgument("dictionary error")
+    if len(sentence) == 1:
+        key, = sentence
+        if (handler := _HANDLERS.get(key)) is None:
+            raise MalformedArgument("dictionary error")
+        return handler(sentence)
+    return _multiple(sentence) if sentence else None
+
+
+def _multiple(sentence: dict) -> TextComponent:
+    """处理含有多个键的元素"""
+    if not ("translate" in sentence and "with" in sentence):
+        result = None
+        for key in sentence:
+            if (p := _PRIORITY.get(key, -1)) == -1:
+                raise MalformedArgument("priority dictionary error")
+            if result is None or p >= _PRIORITY[result]:
+                result = key
+        if result is None or (handler := _HANDLERS.get(result)) is None:
+            raise MalformedArgument("dictionary error")
+        return handler({result: sentence[result]})
+
+    if len(sentence) == 2:
+        return _translate(sentence)
+    for key in _ORDER:
+        if key in sentence:
+            return _HANDLERS[key](sentence)
+    raise MalformedArgument("dictionary error")
+
+
+# ========== 处理函数 ==========
+# 快速路径只接受合法数据, 并跳过构造函数中重复的检查; 其余情况交给 from_dictionary 抛出相同的异常
+
+def _text(sentence: dict) -> TextComponent:
+    content = sentence["text"]
+    if len(sentence) != 1 or not isinstance(content, str):
+        return Text.from_dictionary(sentence)
+    return _rebuild_text(content)
+
+
+def _score(sentence: dict) -> TextComponent:
+    value = sentence["score"]
+    if (len(sentence) != 1 or not isinstance(value, dict) or len(value) != 2
+            or not isinstance(name := value.get("name"), str) or not isinstance(objective := value.get("objective"), str)):
+        return Score.from_dictionary(sentence)
+    return _rebuild_score(name, objective)
+
+
+def _selector(sentence: dict) -> TextComponent:
+    content = sentence["selector"]
+    if len(sentence) != 1 or not isinstance(content, str):
+        return Selector.from_dictionary(sentence)
+    return Selector(content)
+
+
+def _translate(sentence: dict) -> TextComponent:
+    translate = sentence["translate"]
+    if isinstance(translate, str):
+        if len(sentence) == 1:
+            return _rebuild_translate(translate, None, None)
+        if len(sentence) == 2 and "with" in sentence:
+            with_value = sentence["with"]
+            if isinstance(with_value, dict):
+                return _rebuild_translate(translate, _rawtext(with_value), None)
+            if isinstance(with_value, list) and all(isinstance(i, str) for i in with_value):
+                return _rebuild_translate(translate, None, with_value)
+    return Translate.from_dictionary(sentence)
+
+
+
+def _rawtext(dictionary: dict) -> Rawtext:
+    if len(dictionary) != 1 or not isinstance(dictionary.get("rawtext"), list):
+        _match_rawtext(dictionary)
+    return _rebuild_rawtext(decode_sequence(dictionary["rawtext"]))
+
+
+_HANDLERS = {
+    "text": _text,
+    "score": _score,
+    "selector": _selector,
+    "translate": _translate,
+    "rawtext": _rawtext,
+}
@@ -1,9 +1,13 @@
 # create by lesomras on 2025-12-14
 
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
 from pathlib import Path
-from typing import Union
+from typing import Iterator, Literal, Optional, Union
 
-from .components import rawtext_lexer, Rawtext, TextComponent
+from .decoder import decode
+from . import stream
+from .components import rawtext_lexer, Rawtext, TextComponent, rawtext_violations, sentence_violations
+from miststar.internal.dict_checking import Violation
 from miststar.internal.exceptions import MalformedArgument, UnsupportedArgument
 from miststar.serializer import JsonSerializer, CompactSerializer
 
@@ -56,6 +60,29 @@ class Parser:
 
         return Parser._parse_data(data)
 
+    @staticmethod
+    def iter_file(file_path: Union[str, Path], chunk_size: int = 1 << 16) -> Iterator[TextComponent]:
+        """
+        流式解析JSON文件, 逐个产出顶层rawtext列表中的文本组件, 内存占用与文件大小无关
+
+        Args:
+            file_path: 文件路径
+            chunk_size: 每次读取的字符数
+
+        Returns:
+            文本组件迭代器, 错误在读到出错位置时抛出
+
+        Raises:
+            FileNotFoundError: 文件不存在
+            MalformedArgument: JSON解析失败或格式错误
+        """
+        return stream.iter_file(file_path, chunk_size)
+
+    @staticmethod
+    def iter_string(json_str: str, chunk_size: int = 1 << 16) -> Iterator[TextComponent]:
+        """流式解析JSON字符串, 见iter_file"""
+        return stream.iter_string(json_str, chunk_size)
+
     @staticmethod
     def parse_data(data: dict) -> Rawtext:
         """
@@ -86,16 +113,9 @@ class Parser:
         Raises:
             MalformedArgument: 数据格式错误
         """
-        if not isinstance(data, dict):
-            raise MalformedArgument("Data must be a dictionary")
-
-        # 检查是否是有效的rawtext格式
-        if "rawtext" not in data:
-            # 如果不是rawtext格式，尝试包装成rawtext
-            # 这允许直接加载单个文本组件
-            data = {"rawtext": [data]}
-
-        return Rawtext.from_dictionary(data)
+        # 不含rawtext键的数据会被包装成rawtext, 这允许直接加载单个文本组件
+        # decode 与 Rawtext.from_dictionary 结果一致, 但只遍历一次数据
+        return decode(data)
 
     @staticmethod
     def validate_file(file_path: Union[str, Path]) -> tuple[bool, str]:
@@ -131,6 +151,51 @@ class Parser:
         except Exception as e:
             return False, str(e)
 
+    @staticmethod
+    def check_data(data) -> list[Violation]:
+        """
+        一次遍历检查字典数据, 返回其中所有错误而非第一个
+
+        Args:
+            data: 原始字典数据
+
+        Returns:
+            Violation列表, 每项包含json路径(如 rawtext[412].score.name)、异常类型与错误信息; 数据有效时为空列表
+        """
+        if not isinstance(data, dict):
+            return [Violation("", MalformedArgument, "Data must be a dictionary")]
+        if "rawtext" not in data:
+            # 与_parse_data相同, 视为单个文本组件
+            return sentence_violations(data)
+        return rawtext_violations(data)
+
+    @staticmethod
+    def check_string(json_str: str) -> list[Violation]:
+        """
+        检查JSON字符串, 返回其中所有错误 (见check_data)
+        """
+        try:
+            data = JsonSerializer.loads(json_str)
+        except Exception as e:
+            return [Violation("", MalformedArgument, f"Failed to parse string: {e}")]
+        return Parser.check_data(data)
+
+    @staticmethod
+    def check_file(file_path: Union[str, Path]) -> list[Violation]:
+        """
+        检查JSON文件, 返回其中所有错误 (见check_data)
+
+        Raises:
+            FileNotFoundError: 文件不存在
+        """
+        try:
+            data = JsonSerializer.load(file_path)
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            return [Violation("", MalformedArgument, f"Failed to parse file: {e}")]
+        return Parser.check_data(data)
+
     @staticmethod
     def extract_text_components(rawtext: Rawtext) -> list[TextComponent]:
         """
@@ -177,51 +242,67 @@ class BatchParser:
 
     @staticmethod
     def parse_directory(directory: Union[str, Path],
-                        pattern: str = "*.json") -> dict:
+                        pattern: str = "*.json",
+                        executor: Optional[Literal["thread", "process"]] = None,
+                        workers: Optional[int] = None,
+                        chunksize: int = 1) -> dict:
         """
         解析目录下的所有JSON文件
 
         Args:
             directory: 目录路径
             pattern: 文件匹配模式
+            executor, workers, chunksize: 见parse_files
 
         Returns:
-            文件名到Rawtext对象的映射
+            文件名到Rawtext对象的映射, 按文件路径排序
         """
         path = Path(directory)
         if not path.exists() or not path.is_dir():
             raise FileNotFoundError(f"Directory not found: {directory}")
 
-        results: dict = {}
-        for file_path in path.glob(pattern):
-            try:
-                rawtext = Parser.parse_file(file_path)
-                results[str(file_path)] = rawtext
-            except Exception as e:
-                results[str(file_path)] = f"Error: {e}"
-
-        return results
+        return BatchParser.parse_files(sorted(path.glob(pattern)), executor, workers, chunksize)
 
     @staticmethod
-    def parse_files(file_paths: list[Union[str, Path]]) -> dict:
+    def parse_files(file_paths: list[Union[str, Path]],
+                    executor: Optional[Literal["thread", "process"]] = None,
+                    workers: Optional[int] = None,
+                    chunksize: int = 1) -> dict:
         """
         解析多个文件
 
         Args:
             file_paths: 文件路径列表
+            executor: None为在当前线程中逐个解析; "thread"使用线程池 (适合I/O密集); "process"使用进程池 (适合CPU密集)
+            workers: 线程/进程数, None时由concurrent.futures决定
+            chunksize: 每次提交给一个进程的文件数, 文件多而小时调大可减少进程间通信 (仅对"process"有效)
 
         Returns:
-            文件名到Rawtext对象的映射
+            文件名到Rawtext对象的映射, 顺序与file_paths一致; 解析失败的文件映射为 "Error: ..." 字符串
         """
-        results: dict = {}
-        for file_path in file_paths:
-            try:
-                rawtext = Parser.parse_file(file_path)
-                results[str(file_path)] = rawtext
-            except Exception as e:
-                results[str(file_path)] = f"Error: {e}"
+        if executor is None:
+            return dict(map(_parse_one, file_paths))
+        if not isinstance(chunksize, int) or chunksize < 1:
+            raise UnsupportedArgument("chunksize must be a positive integer")
+        pool: Executor
+        if executor == "thread":
+            pool = ThreadPoolExecutor(max_workers = workers)
+        elif executor == "process":
+            pool = ProcessPoolExecutor(max_workers = workers)
+        else:
+            raise UnsupportedArgument(f"executor must be None, 'thread' or 'process', got {executor!r}")
+
+        with pool:
+            # map按提交顺序返回结果
+            return dict(pool.map(_parse_one, file_paths, chunksize = chunksize))
 
-        return results
+
+def _parse_one(file_path: Union[str, Path]) -> tuple[str, Union[Rawtext, str]]:
+    """解析单个文件, 异常转为错误字符串. 定义在模块级以便进程池序列化"""
+    try:
+        return str(file_path), Parser.parse_file(file_path)
+    except Exception as e:
+        return str(file_path), f"Error: {e}"
 
 
 # 快捷函数
@@ -235,6 +316,11 @@ def parse_string(json_str: str) -> Rawtext:
     return Parser.parse_string(json_str)
 
 
+def iter_rawtext_file(file_path: Union[str, Path]) -> Iterator[TextComponent]:
+    """流式解析JSON文件, 逐个产出文本组件（快捷函数）"""
+    return Parser.iter_file(file_path)
+
+
 def to_json_dict(obj: TextComponent) -> dict:
     """将TextComponent转换为JSON兼容的字典（快捷函数）"""
     return Parser.to_json_compatible(obj)
@@ -250,6 +336,11 @@ def validate_rawtext_string(json_str: str) -> tuple[bool, str]:
     return Parser.validate_string(json_str)
 
 
+def check_rawtext_file(file_path: Union[str, Path]) -> list[Violation]:
+    """检查文件并返回所有错误（快捷函数）"""
+    return Parser.check_file(file_path)
+
+
 def extract_components(rawtext: Rawtext) -> list[TextComponent]:
     """从Rawtext中提取所有文本组件（快捷函数）"""
     return Parser.extract_text_components(rawtext)
@@ -0,0 +1,191 @@
+# create by lesomras on 2026-10-17
+"""
+流式rawtext解析
+
+Parser.parse_file 先由 JsonSerializer.load 构建完整的 dict/list 树再转换为文本组件, 大文件需要两份内存.
+这里边读取json文本边扫描顶层的 {"rawtext": [...]}, 每次只用 json.JSONDecoder.raw_decode 解码一个元素并立即
+转换为文本组件产出, 内存占用只与单个元素和读取块的大小有关.
+
+与 Parser.parse_file 的区别:
+    - 错误在读到出错的元素时才抛出, 此前的组件已经产出
+    - 顶层对象的第一个键不是 "rawtext" (单个文本组件等非常规格式) 时退回到完整解析
+"""
+from __future__ import annotations
+import json
+from pathlib import Path
+from typing import Callable, Iterator, Union
+
+from .components import TextComponent, Rawtext, _match_rawtext
+from .decoder import decode, decode_sentence
+from miststar.internal.exceptions import MalformedArgument
+from miststar.serializer import JsonSerializer
+
+_WHITESPACE = " \t\n\r"
+_decoder = json.JSONDecoder()
+
+
+class _Reader(object):
+    """按块读取json文本的扫描器"""
+    __slots__ = ("_read", "_chunk_size", "_buffer", "_pos", "_offset", "_eof", "_context")
+
+    def __init__(self, read: Callable[[int], str], chunk_size: int, context: str) -> None:
+        self._read = read
+        self._chunk_size = chunk_size
+        self._buffer = ""
+        self._pos = 0
+        self._offset = 0    # _buffer[0] 在整个文本中的位置
+        self._eof = False
+        self._context = context
+
+    def _fill(self, size: int) -> bool:
+        """读入至少size个字符, 已到达末尾时返回False"""
+        if self._eof:
+            return False
+        if self._pos:
+            # 丢弃已经处理的部分
+            self._buffer = self._buffer[self._pos:]
+            self._offset += self._pos
+            self._pos = 0
+        chunk = self._read(max(size, self._chunk_size))
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer += chunk
+        return True
+
+    def error(self, message: str, pos: int = -1) -> MalformedArgument:
+        pos = self._pos if pos == -1 else pos
+        return MalformedArgument(f"{self._context}: {message}: char {self._offset + pos}")
+
+    def peek(self) -> str:
+        """跳过空白并返回下一个字符, 到达末尾时返回空字符串"""
+        while True:
+            buffer, pos = self._buffer, self._pos
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            self._pos = pos
+            if pos < len(buffer) or not self._fill(0):
+                return buffer[pos] if pos < len(buffer) else ""
+
+    def next(self) -> str:
+        c = self.peek()
+        self._pos += 1
+        return c
+
+    def expect(self, c: str) -> None:
+        if self.peek() != c:
+            raise self.error(f"Expecting '{c}'")
+        self._pos += 1
+
+    def value(self):
+        """解码下一个完整的json值"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                # 值可能被读取块截断, 读入更多后重试; 每次读入量翻倍, 避免超大元素的重复解码
+                if self._fill(len(self._buffer)):
+                    continue
+                raise self.error(e.msg, e.pos) from None
+            # 数字等值恰好在块末尾结束时可能并不完整
+            if end == len(self._buffer) and self._fill(len(self._buffer)):
+                continue
+            self._pos = end
+            return value
+
+
+def iter_components(read: Callable[[int], str], fallback: Callable[[], Rawtext],
+                    chunk_size: int = 1 << 16, context: str = "Failed to parse") -> Iterator[TextComponent]:
+    """
+    从read读取json文本, 逐个产出顶层rawtext列表中的文本组件
+
+    args:
+        read: 形如 file.read 的函数
+        fallback: 遇到非常规格式时, 完整解析整个文本的函数
+        chunk_size: 每次读取的字符数
+        context: 错误信息的前缀
+    """
+    reader = _Reader(read, chunk_size, context)
+    if reader.next() != "{" or reader.peek() != '"':
+        yield from fallback().get_data()
+        return
+    if reader.value() != "rawtext":
+        yield from fallback().get_data()
+        return
+    reader.expect(":")
+
+    if reader.peek() != "[":
+        _match_rawtext({"rawtext": reader.value()})
+    reader.expect("[")
+    if reader.peek() == "]":
+        reader.next()
+    else:
+        while True:
+            component = decode_sentence(reader.value())
+            if component is not None:
+                yield component
+            c = reader.next()
+            if c == "]":
+                break
+            if c != ",":
+                raise reader.error("Expecting ',' delimiter", reader._pos - 1)
+
+    # 顶层对象剩余的键
+    keys = set()
+    while (c := reader.next()) == ",":
+        key = reader.value()
+        if not isinstance(key, str):
+            raise reader.error("Expecting property name enclosed in double quotes")
+        reader.expect(":")
+        reader.value()
+        keys.add(key)
+    if c != "}":
+        raise reader.error("Expecting ',' delimiter", reader._pos - 1)
+    if reader.peek():
+        raise reader.error("Extra data")
+    if "rawtext" in keys:
+        raise MalformedArgument("Duplicate 'rawtext' key cannot be streamed")
+    if keys:
+        raise MalformedArgument(f"Unexpected parameter(s): {', '.join(keys)}")
+
+
+def iter_file(file_path: Union[str, Path], chunk_size: int = 1 << 16) -> Iterator[TextComponent]:
+    """
+    逐个产出json文件中的顶层文本组件
+
+    Raises:
+        FileNotFoundError: 文件不存在
+        MalformedArgument: JSON解析失败或格式错误
+    """
+    path = Path(file_path)
+    if not path.exists():
+        raise FileNotFoundError(f"文件不存在: {path}")
+
+    def fallback() -> Rawtext:
+        try:
+            data = JsonSerializer.load(path)
+        except Exception as e:
+            raise MalformedArgument(f"Failed to parse file: {e}") from e
+        return decode(data)
+
+    with open(path, "r", encoding = "utf-8") as f:
+        yield from iter_components(f.read, fallback, chunk_size, "Failed to parse file: 文件中的JSON无效")
+
+
+def iter_string(json_str: str, chunk_size: int = 1 << 16) -> Iterator[TextComponent]:
+    """逐个产出json字符串中的顶层文本组件"""
+    def fallback() -> Rawtext:
+        try:
+            data = JsonSerializer.loads(json_str)
+        except Exception as e:
+            raise MalformedArgument(f"Failed to parse string: {e}") from e
+        return decode(data)
+
+    pos = 0
+    def read(size: int) -> str:
+        nonlocal pos
+        pos += size
+        return json_str[pos - size:pos]
+
+    return iter_components(read, fallback, chunk_size, "Failed to parse string: 无效的JSON")
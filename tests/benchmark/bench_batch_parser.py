@@ -0,0 +1,48 @@
+# BatchParser.parse_directory 顺序解析 vs 线程池/进程池: 在生成的语料上随worker数的扩展情况
+# 运行: python tests/benchmark/bench_batch_parser.py
+from __future__ import annotations
+import json
+import os
+import tempfile
+import time
+
+from miststar.textcomps.parser import BatchParser
+
+ELEMENTS = [
+    {"text": "hello"},
+    {"score": {"name": "@p", "objective": "coins"}},
+    {"selector": "@a[tag=red]"},
+    {"translate": "chat.type.text", "with": {"rawtext": [{"text": "x"}, {"selector": "@s"}]}},
+]
+
+
+def build(directory: str, files: int, elements: int) -> None:
+    for i in range(files):
+        with open(os.path.join(directory, f"{i:05d}.json"), "w", encoding = "utf-8") as f:
+            json.dump({"rawtext": [ELEMENTS[(i + j) % len(ELEMENTS)] for j in range(elements)]}, f)
+
+
+def timeit(directory: str, **kwargs) -> float:
+    start = time.perf_counter()
+    results = BatchParser.parse_directory(directory, **kwargs)
+    elapsed = time.perf_counter() - start
+    assert not any(isinstance(v, str) for v in results.values())
+    return elapsed
+
+
+def main(files: int = 2000, elements: int = 200) -> None:
+    cores = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, cores})
+    with tempfile.TemporaryDirectory() as directory:
+        build(directory, files, elements)
+        base = timeit(directory)
+        print(f"{files} files x {elements} elements, {cores} cores")
+        print(f"{'sequential':<20}{base:>8.2f} s")
+        for executor, chunksize in (("thread", 1), ("process", 16)):
+            for workers in counts:
+                t = timeit(directory, executor = executor, workers = workers, chunksize = chunksize)
+                print(f"{f'{executor} x{workers}':<20}{t:>8.2f} s ({base / t:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
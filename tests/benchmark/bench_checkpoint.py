@@ -0,0 +1,57 @@
+# 完整序列化 vs SerializationCache 增量序列化: 每次存档之间只修改少量分数与标签
+# 运行: python tests/benchmark/bench_checkpoint.py
+from __future__ import annotations
+import random
+import time
+
+from miststar.localenv.localenv import LocalEnv
+from miststar.localenv.checkpoint import SerializationCache
+from miststar.localenv.entity import Entity
+from miststar.serializer import JsonSerializer
+
+
+def build(objectives: int, n: int) -> LocalEnv:
+    env = LocalEnv(columnar = True, bitset_tags = True)
+    entities = [env.add_entity(Entity(f"e{i}")) for i in range(n)]
+    for i in range(objectives):
+        board = env.sc.add_scoreboard(f"obj{i}")
+        for entity in entities:
+            board.players_set(entity, random.randint(0, 1000))
+    for entity in entities[::3]:
+        env.tag.tag_add(entity, "red")
+    return env
+
+
+def tick(env: LocalEnv, changes: int) -> None:
+    entities = env.entities
+    board = env.sc.get_scoreboard("obj0")
+    for entity in random.sample(entities, changes):
+        board.players_add(entity, 1)
+        env.tag.tag_add(entity, "touched")
+
+
+def main(objectives: int = 20, n: int = 5000, changes: int = 50, rounds: int = 10) -> None:
+    random.seed(0)
+    env = build(objectives, n)
+    cache = SerializationCache(env)
+    cache.dumps_scoreboards()
+    cache.dumps_entities()
+
+    full = incremental = 0.0
+    for _ in range(rounds):
+        tick(env, changes)
+        start = time.perf_counter()
+        a = JsonSerializer.dumps(env.scoreboard.serialize())
+        b = JsonSerializer.dumps({e.uuid: e.group_serialize()[1] for e in env.entities})
+        full += time.perf_counter() - start
+        start = time.perf_counter()
+        assert cache.dumps_scoreboards() == a and cache.dumps_entities() == b
+        incremental += time.perf_counter() - start
+
+    print(f"{objectives} objectives x {n} entities, {changes} changes per checkpoint")
+    print(f"full        {full / rounds * 1000:8.2f} ms/checkpoint")
+    print(f"incremental {incremental / rounds * 1000:8.2f} ms/checkpoint ({full / incremental:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+# Rawtext.from_dictionary (rawtext_lexer) vs decode (单次遍历): 解码大型rawtext数据的耗时
+# 运行: python tests/benchmark/bench_decoder.py
+from __future__ import annotations
+import time
+
+from miststar.textcomps.components import Rawtext
+from miststar.textcomps.decoder import decode
+
+ELEMENTS = [
+    {"text": "hello"},
+    {"score": {"name": "@p", "objective": "coins"}},
+    {"selector": "@a[tag=red]"},
+    {"translate": "chat.type.text", "with": ["a", "b"]},
+    {"translate": "%%s", "with": {"rawtext": [{"text": "x"}, {"selector": "@s"}]}},
+    {"text": "a", "score": {"name": "@p", "objective": "coins"}},
+]
+
+
+def timeit(function, *args, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(n: int = 100000) -> None:
+    data = {"rawtext": [ELEMENTS[i % len(ELEMENTS)] for i in range(n)]}
+    assert decode(data).to_dictionary() == Rawtext.from_dictionary(data).to_dictionary()
+    a, b = timeit(Rawtext.from_dictionary, data), timeit(decode, data)
+    print(f"{n} rawtext elements")
+    print(f"from_dictionary  {a * 1000:8.2f} ms")
+    print(f"decode           {b * 1000:8.2f} ms ({a / b:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# matching (逐次解释模板) vs compile_pattern (预编译模板): 校验rawtext元素的耗时
+# 运行: python tests/benchmark/bench_dict_checking.py
+from __future__ import annotations
+import time
+
+from miststar.internal.dict_checking import matching, compile_pattern
+from miststar.textcomps.components import rawtext_lexer
+
+ELEMENTS = [
+    {"text": "hello"},
+    {"score": {"name": "@p", "objective": "coins"}},
+    {"selector": "@a[tag=red]"},
+    {"rawtext": []},
+]
+
+
+def interpreted(elements: list[dict]) -> None:
+    # 旧实现: 每次调用都构造模板字面量并解释执行
+    for element in elements:
+        if "text" in element:
+            matching(element, pattern = {"text": str})
+        elif "score" in element:
+            matching(element, pattern = {"score": {"name": str, "objective": str}})
+        elif "selector" in element:
+            matching(element, pattern = {"selector": str})
+        else:
+            matching(element, pattern = {"rawtext": lambda data_value, key: isinstance(data_value, list)})
+
+
+def compiled(elements: list[dict]) -> None:
+    text = compile_pattern({"text": str})
+    score = compile_pattern({"score": {"name": str, "objective": str}})
+    selector = compile_pattern({"selector": str})
+    rawtext = compile_pattern({"rawtext": lambda data_value, key: isinstance(data_value, list)})
+    for element in elements:
+        if "text" in element:
+            text(element)
+        elif "score" in element:
+            score(element)
+        elif "selector" in element:
+            selector(element)
+        else:
+            rawtext(element)
+
+
+def timeit(function, *args, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(n: int = 50000) -> None:
+    elements = [ELEMENTS[i % len(ELEMENTS)] for i in range(n)]
+    a, b = timeit(interpreted, elements), timeit(compiled, elements)
+    print(f"{n} rawtext elements")
+    print(f"matching         {a * 1000:8.2f} ms")
+    print(f"compile_pattern  {b * 1000:8.2f} ms ({a / b:.1f}x)")
+    print(f"rawtext_lexer    {timeit(rawtext_lexer, elements) * 1000:8.2f} ms (end to end)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# Entity 内存占用基准
+# 运行: python tests/benchmark/bench_entity_memory.py
+#
+# LegacyEntity 复刻了旧实现的实例布局 (__dict__ + 每个实例一个dict与一个set),
+# 与当前使用 __slots__ 且延迟分配容器的 Entity 对比每个实体的平均占用
+from __future__ import annotations
+import gc
+import tracemalloc
+
+from miststar.internal.simple_uuid import new_uuid
+from miststar.localenv.entity import Entity
+from miststar.localenv.player import Player
+
+
+class LegacyEntity:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.uuid = new_uuid()
+        self._objectives: dict[str, object] = {}
+        self.tags: set[str] = set()
+        self._type = "entity"
+
+
+class LegacyPlayer(LegacyEntity):
+    def __init__(self, name: str) -> None:
+        super().__init__(name)
+        self._type = "entity::player"
+
+
+def measure(factory, n: int) -> float:
+    """创建n个实体, 返回每个实体的平均分配字节数"""
+    names = [f"entity{i}" for i in range(n)]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    entities = [factory(i) for i in names]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del entities
+    return (after - before) / n
+
+
+def main(n: int = 100000) -> None:
+    cases = [
+        ("entity", LegacyEntity, Entity),
+        ("player", LegacyPlayer, Player),
+    ]
+    print(f"{'class':<10}{'legacy (B)':>12}{'current (B)':>13}{'saved':>8}")
+    for label, legacy, current in cases:
+        a, b = measure(legacy, n), measure(current, n)
+        print(f"{label:<10}{a:>12.1f}{b:>13.1f}{1 - b / a:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
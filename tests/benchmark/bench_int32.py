@@ -0,0 +1,200 @@
+# Int32 运算微基准
+# 运行: python tests/benchmark/bench_int32.py
+#
+# LegacyInt32 复刻了旧实现的运算路径 (右值先包装为Int32, 掩码后再构造结果对象),
+# 用于与当前 miststar.internal.int32.Int32 的快速路径做对比
+from __future__ import annotations
+import timeit
+import math
+from typing import Union
+
+from miststar.internal.int32 import Int32
+
+
+class LegacyInt32:
+    __slots__ = ("value", )
+    MASK = 0xFFFFFFFF
+
+    def __init__(self, value: Union[LegacyInt32, int] = 0):
+        self.value = 0
+        if isinstance(value, LegacyInt32):
+            self.value = value.value & self.MASK
+        else:
+            self.value = int(value) & self.MASK
+        if self.value & 0x80000000:
+            self.value = self.value - 0x100000000
+
+    def _wrap(self, result):
+        result &= self.MASK
+        if result & 0x80000000:
+            result -= 0x100000000
+        return LegacyInt32(result)
+
+    def __add__(self, other):
+        if not isinstance(other, LegacyInt32):
+            other = LegacyInt32(other)
+        return self._wrap(self.value + other.value)
+
+    def __sub__(self, other):
+        if not isinstance(other, LegacyInt32):
+            other = LegacyInt32(other)
+        return self._wrap(self.value - other.value)
+
+    def __mul__(self, other):
+        if not isinstance(other, LegacyInt32):
+            other = LegacyInt32(other)
+        return self._wrap(self.value * other.value)
+
+    def __floordiv__(self, other):
+        if not isinstance(other, LegacyInt32):
+            other = LegacyInt32(other)
+        if other.value == 0:
+            raise ZeroDivisionError("division by zero")
+        return LegacyInt32(self.value // other.value)
+
+    def __mod__(self, other):
+        if not isinstance(other, LegacyInt32):
+            other = LegacyInt32(other)
+        if other.value == 0:
+            raise ZeroDivisionError("modulo by zero")
+        return LegacyInt32(self.value % other.value)
+
+    def __and__(self, other):
+        if not isinstance(other, LegacyInt32):
+            other = LegacyInt32(other)
+        return LegacyInt32(self.value & other.value)
+
+    def __or__(self, other):
+        if not isinstance(other, LegacyInt32):
+            other = LegacyInt32(other)
+        return LegacyInt32(self.value | other.value)
+
+    def __xor__(self, other):
+        if not isinstance(other, LegacyInt32):
+            other = LegacyInt32(other)
+        return LegacyInt32(self.value ^ other.value)
+
+    def __lshift__(self, n):
+        n = n & 0x1F
+        return self._wrap(self.value << n)
+
+    def __rshift__(self, n):
+        n = n & 0x1F
+        return LegacyInt32(self.value >> n)
+
+    def __radd__(self, other):
+        return self + other
+
+    def __rsub__(self, other):
+        if not isinstance(other, LegacyInt32):
+            other = LegacyInt32(other)
+        return other - self
+
+    def __neg__(self):
+        return LegacyInt32(-self.value)
+
+    def __eq__(self, other):
+        if not isinstance(other, (LegacyInt32, int)):
+            return False
+        return self.value == LegacyInt32(other).value
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __lt__(self, other):
+        if not isinstance(other, LegacyInt32):
+            other = LegacyInt32(other)
+        return self.value < other.value
+
+    def __le__(self, other):
+        if not isinstance(other, LegacyInt32):
+            other = LegacyInt32(other)
+        return self.value <= other.value
+
+    def __gt__(self, other):
+        if not isinstance(other, LegacyInt32):
+            other = LegacyInt32(other)
+        return self.value > other.value
+
+    def __ge__(self, other):
+        if not isinstance(other, LegacyInt32):
+            other = LegacyInt32(other)
+        return self.value >= other.value
+
+    def __iadd__(self, other):
+        self.value = (self + other).value
+        return self
+
+    def __isub__(self, other):
+        self.value = (self - other).value
+        return self
+
+    def __imul__(self, other):
+        self.value = (self * other).value
+        return self
+
+    def __ifloordiv__(self, other):
+        self.value = (self // other).value
+        return self
+
+    def __imod__(self, other):
+        self.value = (self % other).value
+        return self
+
+    def copy(self):
+        return LegacyInt32(self.value)
+
+    def truncdiv(self, other):
+        if not isinstance(other, LegacyInt32):
+            other = LegacyInt32(other)
+        if other.value == 0:
+            raise ZeroDivisionError("division by zero")
+        return LegacyInt32(math.trunc(self.value / other.value))
+
+
+CASES = [
+    "a + 1",
+    "a + b",
+    "1 + a",
+    "a - 1",
+    "1 - a",
+    "a * 3",
+    "a // 7",
+    "a % 7",
+    "a & 0xFF",
+    "a | 0xFF",
+    "a ^ 0xFF",
+    "a << 3",
+    "a >> 3",
+    "-a",
+    "a == 5",
+    "a != 5",
+    "a < 5",
+    "a <= 5",
+    "a > 5",
+    "a >= 5",
+    "a += 1",
+    "a -= 1",
+    "a *= 1",
+    "a //= 1",
+    "a %= 2147483647",
+    "a.copy()",
+    "a.truncdiv(7)",
+]
+
+
+def bench(stmt: str, cls: type, number: int) -> float:
+    setup = "a = cls(123456); b = cls(-654321)"
+    return min(timeit.repeat(stmt, setup, globals = {"cls": cls}, number = number, repeat = 5))
+
+
+def main(number: int = 200000) -> None:
+    print(f"{'operation':<20}{'legacy (ns)':>14}{'current (ns)':>14}{'speedup':>10}")
+    for stmt in CASES:
+        legacy = bench(stmt, LegacyInt32, number) / number * 1e9
+        current = bench(stmt, Int32, number) / number * 1e9
+        print(f"{stmt:<20}{legacy:>14.1f}{current:>14.1f}{legacy / current:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
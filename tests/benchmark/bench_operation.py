@@ -0,0 +1,43 @@
+# players_operation 派发方式基准: 逐次匹配 vs 预编译
+# 运行: python tests/benchmark/bench_operation.py
+from __future__ import annotations
+import timeit
+
+from miststar.localenv.scoreboard import Scoreboard, LocalScoreboards
+from miststar.localenv.entity import Entity
+
+OPERATIONS = ["=", "+=", "-=", "*=", "/=", "%=", "<", ">", "><"]
+
+
+def setup(columnar: bool) -> tuple[Scoreboard, Scoreboard, Entity, Entity]:
+    local = LocalScoreboards(columnar = columnar)
+    target, source = local.add_scoreboard("target"), local.add_scoreboard("source")
+    player, selector = Entity("player"), Entity("selector")
+    target.players_set(player, 123456)
+    source.players_set(selector, 7)
+    return target, source, player, selector
+
+
+def main(number: int = 100000) -> None:
+    print(f"{'backend':<10}{'operation':<10}{'match (ns)':>12}{'compiled (ns)':>15}{'speedup':>10}")
+    for columnar in (False, True):
+        backend = "columnar" if columnar else "dict"
+        for operation in OPERATIONS:
+            target, source, player, selector = setup(columnar)
+            op = Scoreboard.compile_operation(target, operation, source)
+            namespace = {
+                "Scoreboard": Scoreboard, "op": op, "operation": operation,
+                "target": target, "source": source, "player": player, "selector": selector,
+            }
+            current = min(timeit.repeat(
+                "Scoreboard.players_operation(player, target, operation, selector, source)",
+                globals = namespace, number = number, repeat = 5,
+            )) / number * 1e9
+            compiled = min(timeit.repeat(
+                "op(player, selector)", globals = namespace, number = number, repeat = 5,
+            )) / number * 1e9
+            print(f"{backend:<10}{operation:<10}{current:>12.1f}{compiled:>15.1f}{current / compiled:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
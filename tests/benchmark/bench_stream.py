@@ -0,0 +1,49 @@
+# JsonSerializer.dump(serialize()) vs dump_stream(iter_serialize()): 峰值内存与耗时
+# 运行: python tests/benchmark/bench_stream.py
+from __future__ import annotations
+import os
+import tempfile
+import time
+import tracemalloc
+
+from miststar.localenv.localenv import LocalEnv
+from miststar.localenv.entity import Entity
+from miststar.serializer import JsonSerializer
+
+
+def build(n: int) -> LocalEnv:
+    env = LocalEnv(columnar = True)
+    board = env.sc.add_scoreboard("coins")
+    for i in range(n):
+        board.players_set(env.add_entity(Entity(f"e{i}")), i)
+    return env
+
+
+def measure(dump, path: str) -> tuple[float, float]:
+    """返回 (峰值额外内存MB, 耗时秒)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    dump(path)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20, elapsed
+
+
+def main(n: int = 200000) -> None:
+    env = build(n)
+    with tempfile.TemporaryDirectory() as directory:
+        a, b = os.path.join(directory, "a.json"), os.path.join(directory, "b.json")
+        full = measure(lambda p: JsonSerializer.dump(env.scoreboard.serialize(), p), a)
+        stream = measure(lambda p: JsonSerializer.dump_stream(env.scoreboard.iter_serialize(), p), b)
+        with open(a, "rb") as x, open(b, "rb") as y:
+            assert x.read() == y.read()
+
+    print(f"{n} scores")
+    print(f"{'':<8}{'peak (MB)':>12}{'time (s)':>10}")
+    print(f"{'dump':<8}{full[0]:>12.1f}{full[1]:>10.2f}")
+    print(f"{'stream':<8}{stream[0]:>12.1f}{stream[1]:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# Parser.parse_file vs Parser.iter_file (流式): 解析大型rawtext文件的峰值内存与耗时
+# 运行: python tests/benchmark/bench_streaming_parser.py
+from __future__ import annotations
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from miststar.textcomps import Parser
+
+ELEMENTS = [
+    {"text": "hello"},
+    {"score": {"name": "@p", "objective": "coins"}},
+    {"selector": "@a[tag=red]"},
+    {"translate": "chat.type.text", "with": {"rawtext": [{"text": "x"}, {"selector": "@s"}]}},
+]
+
+
+def measure(function, path: str) -> tuple[float, float, int]:
+    """返回 (峰值额外内存MB, 耗时秒, 组件数)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = function(path)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20, elapsed, count
+
+
+def full(path: str) -> int:
+    return len(Parser.parse_file(path).get_data())
+
+
+def streaming(path: str) -> int:
+    # 逐个处理后丢弃
+    return sum(1 for _ in Parser.iter_file(path))
+
+
+def main(n: int = 200000) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "rawtext.json")
+        with open(path, "w", encoding = "utf-8") as f:
+            json.dump({"rawtext": [ELEMENTS[i % len(ELEMENTS)] for i in range(n)]}, f, indent = 2)
+        size = os.path.getsize(path) / 2 ** 20
+        a, b = measure(full, path), measure(streaming, path)
+        assert a[2] == b[2]
+
+    print(f"{n} rawtext elements ({size:.1f} MB)")
+    print(f"{'':<12}{'peak (MB)':>12}{'time (s)':>10}")
+    print(f"{'parse_file':<12}{a[0]:>12.1f}{a[1]:>10.2f}")
+    print(f"{'iter_file':<12}{b[0]:>12.1f}{b[1]:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
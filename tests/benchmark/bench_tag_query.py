@@ -0,0 +1,52 @@
+# 标签查询基准: 手写逐个过滤 vs LocalTags.query / BitsetTags.query
+# 运行: python tests/benchmark/bench_tag_query.py
+from __future__ import annotations
+import random
+import timeit
+
+from miststar.localenv.tag import LocalTags
+from miststar.localenv.bitset_tags import BitsetTags
+from miststar.localenv.entity import Entity
+
+QUERIES = [("a", ), ("a", "b"), ("a", "!b", "c"), ("rare", "a"), ("!a", "!b")]
+
+
+def setup(n: int, cls: type[LocalTags] = LocalTags) -> tuple[LocalTags, list[Entity]]:
+    rng = random.Random(0)
+    tags = cls()
+    entities = [Entity(f"e{i}") for i in range(n)]
+    for entity in entities:
+        for tag in ("a", "b", "c"):
+            if rng.random() < 0.3:
+                tags.tag_add(entity, tag)
+        if rng.random() < 0.001:
+            tags.tag_add(entity, "rare")
+    return tags, entities
+
+
+def naive(tags: LocalTags, entities: list[Entity], conditions: tuple[str, ...]) -> list[Entity]:
+    result = []
+    for entity in entities:
+        if all(
+            not tags.has_tag(entity, c[1:]) if c.startswith("!") else tags.has_tag(entity, c)
+            for c in conditions
+        ):
+            result.append(entity)
+    return result
+
+
+def main(n: int = 100000, number: int = 5) -> None:
+    tags, entities = setup(n)
+    bitset, _ = setup(n, BitsetTags)
+    universe = set(entities)
+    print(f"{'query':<20}{'naive (ms)':>12}{'set (ms)':>12}{'bitset (ms)':>13}")
+    for conditions in QUERIES:
+        namespace = {"tags": tags, "bitset": bitset, "entities": entities, "universe": universe, "c": conditions, "naive": naive}
+        before = min(timeit.repeat("naive(tags, entities, c)", globals = namespace, number = number, repeat = 3)) / number * 1e3
+        after = min(timeit.repeat("list(tags.query(*c, universe = universe))", globals = namespace, number = number, repeat = 3)) / number * 1e3
+        bits = min(timeit.repeat("list(bitset.query(*c))", globals = namespace, number = number, repeat = 3)) / number * 1e3
+        print(f"{' '.join(conditions):<20}{before:>12.3f}{after:>12.3f}{bits:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
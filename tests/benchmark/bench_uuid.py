@@ -0,0 +1,29 @@
+# uuid 生成基准: uuid.uuid4() vs RandomUUIDGenerator vs CounterUUIDGenerator
+# 运行: python tests/benchmark/bench_uuid.py
+from __future__ import annotations
+import timeit
+
+from miststar.internal.simple_uuid import UUIDSpace, UUIDGenerator, RandomUUIDGenerator, CounterUUIDGenerator
+
+GENERATORS = {
+    "uuid4": UUIDGenerator,
+    "random": RandomUUIDGenerator,
+    "counter": lambda: CounterUUIDGenerator(seed = 0),
+}
+
+
+def main(n: int = 100000) -> None:
+    print(f"{'generator':<10}{'single (ns)':>13}{'batch (ns)':>12}{'space (ns)':>12}")
+    for label, factory in GENERATORS.items():
+        gen = factory()
+        single = min(timeit.repeat("gen()", globals = {"gen": gen}, number = n, repeat = 3)) / n * 1e9
+        batch = min(timeit.repeat(f"gen.batch({n})", globals = {"gen": gen}, number = 1, repeat = 3)) / n * 1e9
+        space = min(timeit.repeat(
+            f"UUIDSpace(factory()).generate_uuids({n})",
+            globals = {"UUIDSpace": UUIDSpace, "factory": factory}, number = 1, repeat = 3,
+        )) / n * 1e9
+        print(f"{label:<10}{single:>13.1f}{batch:>12.1f}{space:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
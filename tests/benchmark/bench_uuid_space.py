@@ -0,0 +1,59 @@
+# UUIDSpace (默认 / 有序空闲队列 / 校验和) vs IntUUIDSpace: 内存占用与 custom/forced_free 延迟
+# 运行: python tests/benchmark/bench_uuid_space.py
+from __future__ import annotations
+from functools import partial
+from typing import Callable
+import gc
+import time
+import tracemalloc
+
+from miststar.internal.simple_uuid import UUIDSpace, IntUUIDSpace, CounterUUIDGenerator
+
+
+VARIANTS: dict[str, Callable] = {
+    "UUIDSpace": UUIDSpace,
+    "+lifo": partial(UUIDSpace, free_order = "lifo"),
+    "+checksum": partial(UUIDSpace, checksum = True),
+    "IntUUIDSpace": IntUUIDSpace,
+}
+
+
+def build(cls: Callable, n: int):
+    space = cls(CounterUUIDGenerator(seed = 0))
+    space.generate_uuids(n)
+    return space
+
+
+def memory(cls: Callable, n: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    space = build(cls, n)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del space
+    return (after - before) / n
+
+
+def latency(cls: Callable, n: int) -> tuple[float, float]:
+    space = build(cls, n)
+    start = time.perf_counter()
+    ids = [space.custom(i) for i in range(n)]
+    custom = time.perf_counter() - start
+    start = time.perf_counter()
+    for i in ids:
+        space.forced_free(i)
+    forced_free = time.perf_counter() - start
+    return custom / n * 1e9, forced_free / n * 1e9
+
+
+def main(n: int = 1000000) -> None:
+    print(f"{'space':<14}{'bytes/id':>10}{'custom (ns)':>13}{'forced_free (ns)':>18}")
+    for name, cls in VARIANTS.items():
+        per_id = memory(cls, n)
+        custom, forced_free = latency(cls, n)
+        print(f"{name:<14}{per_id:>10.1f}{custom:>13.1f}{forced_free:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# 多线程uuid分配基准: 全局锁包装的 UUIDSpace vs ShardedUUIDSpace
+# 运行: python tests/benchmark/bench_uuid_threads.py
+#
+# 每个线程循环执行 custom -> get_value -> forced_free; 在有GIL的解释器上分片主要减少锁竞争与排队,
+# 在自由线程 (free-threaded) 构建上各分片可以真正并行
+from __future__ import annotations
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from miststar.internal.simple_uuid import UUIDSpace, ShardedUUIDSpace
+
+
+class LockedUUIDSpace:
+    """用一把全局锁包装的 UUIDSpace (对照组)"""
+
+    def __init__(self) -> None:
+        self.space: UUIDSpace[int] = UUIDSpace()
+        self.lock = threading.Lock()
+
+    def generate_uuids(self, nums: int) -> list[str]:
+        with self.lock:
+            return self.space.generate_uuids(nums)
+
+    def custom(self, value: int) -> str:
+        with self.lock:
+            return self.space.custom(value)
+
+    def get_value(self, _uuid: str):
+        with self.lock:
+            return self.space.get_value(_uuid)
+
+    def forced_free(self, _uuid: str):
+        with self.lock:
+            return self.space.forced_free(_uuid)
+
+
+def run(space, threads: int, ops: int) -> float:
+    space.generate_uuids(threads * 64)
+
+    def worker(k: int) -> None:
+        for i in range(ops):
+            _uuid = space.custom(i)
+            space.get_value(_uuid)
+            space.forced_free(_uuid)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers = threads) as executor:
+        list(executor.map(worker, range(threads)))
+    return time.perf_counter() - start
+
+
+def main(ops: int = 50000) -> None:
+    print(f"{'threads':<9}{'global lock (ms)':>18}{'sharded (ms)':>14}{'speedup':>10}")
+    for threads in (1, 2, 4, 8):
+        locked = run(LockedUUIDSpace(), threads, ops) * 1e3
+        sharded = run(ShardedUUIDSpace(shards = 16), threads, ops) * 1e3
+        print(f"{threads:<9}{locked:>18.1f}{sharded:>14.1f}{locked / sharded:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
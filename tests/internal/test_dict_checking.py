@@ -0,0 +1,96 @@
+from miststar.internal.dict_checking import matching, compile_pattern, collect
+import pytest
+
+is_list = lambda data_value, key: isinstance(data_value, list)
+
+PATTERNS: list[dict] = [
+    {"text": str},
+    {"score": {"name": str, "objective": str}},
+    {"rawtext": is_list},
+    {"a": int, "b": float, "c": "number", "d": bool},
+    {"pos": [int, {"x": str}, "number"], "meta": {"inner": {"deep": str}, "tag": str}},
+    {"items": ("number", ), "names": (is_list, ), "empty": (), "bad": ("what", )},
+    {"weird": "pattern", "nested": {"a": {"b": int}, "c": {"d": int}}},
+]
+
+DATA: list[dict] = [
+    {},
+    {"text": "hi"},
+    {"text": 1},
+    {"text": "hi", "extra": 1, "more": 2},
+    {"score": {"name": "@p", "objective": "o"}},
+    {"score": {"name": "@p"}},
+    {"score": {"name": "@p", "objective": 1, "x": 2}},
+    {"score": "flat"},
+    {"rawtext": []},
+    {"rawtext": {}},
+    {"a": True, "b": 1.0, "c": 2, "d": False},
+    {"a": 1, "b": 1, "c": 2, "d": False},
+    {"a": 1, "b": 1.0, "c": "x", "d": False},
+    {"pos": [1, {"x": "s"}, 2.5], "meta": {"inner": {"deep": "d"}, "tag": "t"}},
+    {"pos": [1, {"x": 1}, 2.5], "meta": {"inner": {"deep": 1}, "tag": "t"}},
+    {"pos": [1, {"x": "s"}, 2.5], "meta": {"inner": {"deep": 1}, "tag": "t", "z": 0}},
+    {"pos": [1, "s", 2.5], "meta": {"inner": {}, "tag": "t"}},
+    {"pos": [1, 2], "meta": {}},
+    {"pos": "x", "meta": {}},
+    {"items": [1, 2.0], "names": [], "empty": [], "bad": []},
+    {"items": [1, "x"], "names": [], "empty": [], "bad": []},
+    {"items": [1], "names": "x", "empty": [], "bad": []},
+    {"items": [1], "names": [], "empty": "x", "bad": []},
+    {"weird": 1, "nested": {"a": {"b": 1}, "c": {"d": 1}}},
+    {"nested": {"a": {"b": "x"}, "c": {"d": "y"}}, "weird": 1},
+]
+
+
+def outcome(function, *args):
+    try:
+        function(*args)
+    except Exception as e:
+        return type(e), str(e)
+    return None
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_same_errors(pattern: dict) -> None:
+    validate = compile_pattern(pattern)
+    for data in DATA:
+        assert outcome(validate, data) == outcome(matching, data, pattern), data
+    assert outcome(validate, "not a dict") == outcome(matching, "not a dict", pattern)
+
+
+def test_cache() -> None:
+    assert compile_pattern({"text": str}) is compile_pattern({"text": str})
+    assert compile_pattern({"text": str}) is not compile_pattern({"text": int})
+    assert compile_pattern({"a": [[str]]}) is not compile_pattern({"a": [(str, )]})
+    # 不可哈希的模板项不缓存, 但仍可编译
+    unhashable = {"a": [{"b": str}], "c": {"x", "y"}}
+    assert compile_pattern(unhashable) is not compile_pattern(unhashable)
+    data = {"a": [{"b": 1}], "c": 1}
+    assert outcome(compile_pattern(unhashable), data) == outcome(matching, data, unhashable)
+    with pytest.raises(TypeError):
+        compile_pattern([str])  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("pattern", PATTERNS[:3] + [PATTERNS[4], PATTERNS[6]])
+def test_collect(pattern: dict) -> None:
+    for data in DATA:
+        violations = collect(data, pattern)
+        expected = outcome(matching, data, pattern)
+        if expected is None:
+            assert violations == []
+        else:
+            # matching抛出的错误必然在收集结果之中
+            assert expected in [(v.error, v.message) for v in violations], data
+
+
+def test_collect_paths() -> None:
+    pattern = PATTERNS[4]
+    data = {"pos": [1, {"x": 1}, "s"], "meta": {"inner": {}, "tag": 1, "z": 0}}
+    assert [v.path for v in collect(data, pattern, "root")] == [
+        "root.pos[1].x", "root.pos[2]", "root.meta.inner.deep", "root.meta.tag", "root.meta"
+    ]
+    assert [str(v) for v in collect({"items": [1, "x", None], "names": [], "empty": [], "bad": []}, {"items": ("number", )})][:2] == [
+        "items[1]: All items in list 'items' must be of type number (int or float)",
+        "items[2]: All items in list 'items' must be of type number (int or float)",
+    ]
+    assert collect("x", {"a": str})[0].path == ""  # type: ignore[arg-type]
@@ -0,0 +1,96 @@
+from miststar.internal.int32 import Int32, wrap32
+import operator
+import pickle
+import random
+import math
+import pytest
+
+random.seed(20251222)
+EDGES = [0, 1, -1, 2, -2, 7, -7, 31, 32, 33, 2147483647, -2147483648, 2147483646, -2147483647]
+VALUES = EDGES + [random.randint(-2147483648, 2147483647) for _ in range(40)]
+PAIRS = [(a, b) for a in EDGES for b in EDGES] + list(zip(VALUES, reversed(VALUES)))
+
+def ref(value: int) -> int:
+    """参考实现: 按无符号掩码后再恢复符号位"""
+    value &= 0xFFFFFFFF
+    return value - 0x100000000 if value & 0x80000000 else value
+
+
+@pytest.mark.parametrize("op, expected", [
+    [operator.add, lambda a, b: ref(a + b)],
+    [operator.sub, lambda a, b: ref(a - b)],
+    [operator.mul, lambda a, b: ref(a * b)],
+    [operator.floordiv, lambda a, b: ref(a // b)],
+    [operator.mod, lambda a, b: ref(a % b)],
+    [operator.and_, lambda a, b: ref(a & b)],
+    [operator.or_, lambda a, b: ref(a | b)],
+    [operator.xor, lambda a, b: ref(a ^ b)],
+    [operator.lshift, lambda a, b: ref(a << (b & 0x1F))],
+    [operator.rshift, lambda a, b: ref(a >> (b & 0x1F))],
+])
+def test_binary(op, expected) -> None:
+    for a, b in PAIRS:
+        if b == 0 and op in (operator.floordiv, operator.mod):
+            with pytest.raises(ZeroDivisionError):
+                op(Int32(a), b)
+            continue
+        result = expected(a, b)
+        assert op(Int32(a), b).value == result
+        assert op(Int32(a), Int32(b)).value == result
+        if op not in (operator.lshift, operator.rshift):
+            assert op(a, Int32(b)).value == result
+
+
+@pytest.mark.parametrize("op, iop", [
+    [operator.add, operator.iadd],
+    [operator.sub, operator.isub],
+    [operator.mul, operator.imul],
+    [operator.floordiv, operator.ifloordiv],
+    [operator.mod, operator.imod],
+    [operator.and_, operator.iand],
+    [operator.or_, operator.ior],
+    [operator.xor, operator.ixor],
+    [operator.lshift, operator.ilshift],
+    [operator.rshift, operator.irshift],
+])
+def test_inplace(op, iop) -> None:
+    for a, b in PAIRS:
+        if b == 0 and op in (operator.floordiv, operator.mod):
+            continue
+        x = Int32(a)
+        y = iop(x, b)
+        assert y is x
+        assert x.value == op(Int32(a), b).value
+
+
+def test_unwrapped_operands() -> None:
+    # 超出32位范围的右值先回绕
+    assert Int32(5) + 2 ** 32 == 5
+    assert Int32(5) * (2 ** 32 + 3) == 15
+    assert Int32(7) // (2 ** 32 + 2) == 3
+    assert Int32(-1) == 0xFFFFFFFF
+    assert Int32(3) < 2 ** 32 + 4
+    assert Int32(3) != "3"
+    assert Int32(1.9) == 1  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("value", EDGES)
+def test_unary(value: int) -> None:
+    assert (-Int32(value)).value == ref(-value)
+    assert abs(Int32(value)).value == ref(abs(value))
+    assert (~Int32(value)).value == ref(~value)
+
+
+def test_misc() -> None:
+    for a, b in PAIRS:
+        if b == 0:
+            continue
+        assert Int32(a).truncdiv(b).value == ref(math.trunc(a / b))
+        assert divmod(a, Int32(b)) == (Int32(a) // b, Int32(a) % b)
+        assert (Int32(a) < b) == (a < b)
+        assert (Int32(a) == Int32(b)) == (a == b)
+
+    x = Int32(-123)
+    assert pickle.loads(pickle.dumps(x)) == x
+    assert x.copy() == x and x.copy() is not x
+    assert wrap32(2147483648) == -2147483648
@@ -0,0 +1,73 @@
+from miststar.internal.int32 import Int32
+from miststar.internal.int32_array import Int32Array
+from miststar.internal.exceptions import MalformedArgument, MalformedException
+import operator
+import random
+import pytest
+
+random.seed(20251230)
+EDGES = [0, 1, -1, 7, -7, 31, 2147483647, -2147483648]
+LEFT = EDGES * len(EDGES) + [random.randint(-2147483648, 2147483647) for _ in range(64)]
+RIGHT = [b for b in EDGES for _ in EDGES] + [random.randint(-2147483648, 2147483647) for _ in range(64)]
+
+
+@pytest.mark.parametrize("op", [
+    operator.add, operator.sub, operator.mul, operator.lshift, operator.rshift,
+])
+def test_elementwise_matches_int32(op) -> None:
+    result = op(Int32Array(LEFT), Int32Array(RIGHT))
+    assert result.tolist() == [op(Int32(a), b).value for a, b in zip(LEFT, RIGHT)]
+
+    scalar = op(Int32Array(LEFT), 2147483647)
+    assert scalar.tolist() == [op(Int32(a), 2147483647).value for a in LEFT]
+
+
+@pytest.mark.parametrize("method", ["__floordiv__", "__mod__", "truncdiv"])
+def test_division(method: str) -> None:
+    divisors = [b if b != 0 else 3 for b in RIGHT]
+    result = getattr(Int32Array(LEFT), method)(divisors)
+    assert result.tolist() == [getattr(Int32(a), method)(b).value for a, b in zip(LEFT, divisors)]
+
+    with pytest.raises(ZeroDivisionError):
+        getattr(Int32Array(LEFT), method)(RIGHT)
+
+
+@pytest.mark.parametrize("operation, expected", [
+    ["=", lambda a, b: b],
+    ["+=", lambda a, b: (Int32(a) + b).value],
+    ["-=", lambda a, b: (Int32(a) - b).value],
+    ["*=", lambda a, b: (Int32(a) * b).value],
+    ["/=", lambda a, b: Int32(a).truncdiv(b).value if b != 0 else a],
+    ["%=", lambda a, b: (Int32(a) % b).value if b != 0 else a],
+    ["<", min],
+    [">", max],
+])
+def test_operation(operation: str, expected) -> None:
+    values = Int32Array(LEFT)
+    values.operation(operation, Int32Array(RIGHT))
+    assert values.tolist() == [expected(a, b) for a, b in zip(LEFT, RIGHT)]
+
+
+def test_swap_and_errors() -> None:
+    a, b = Int32Array([1, 2]), Int32Array([3, 4])
+    a.operation("><", b)
+    assert a.tolist() == [3, 4] and b.tolist() == [1, 2]
+
+    with pytest.raises(MalformedException):
+        a.operation("**=", b)
+    with pytest.raises(MalformedArgument):
+        _ = a + [1, 2, 3]
+
+
+def test_container() -> None:
+    values = Int32Array([2147483648, -1, 5])
+    assert values.tolist() == [-2147483648, -1, 5]
+    assert values[0] == Int32(-2147483648)
+    assert values[1:].tolist() == [-1, 5]
+    assert values.lt(0) == [True, True, False]
+    assert values.between(-1, 5) == [False, True, True]
+    assert values.compress(values.ge(0)).tolist() == [5]
+    assert values.minimum(0).tolist() == [-2147483648, -1, 0]
+    assert (1 - values).tolist() == [-2147483647, 2, -4]
+    assert Int32Array.full(3, 7) == Int32Array([7, 7, 7])
+    assert Int32Array.zeros(2).sum() == 0
@@ -1,5 +1,8 @@
 # test 1
-from miststar.internal.simple_uuid import new_uuid, UUIDSpace
+from miststar.internal.simple_uuid import new_uuid, UUIDSpace, RandomUUIDGenerator, CounterUUIDGenerator, set_default_generator, IntUUIDSpace, uuid_to_int, int_to_uuid, ShardedUUIDSpace
+from miststar.internal.exceptions import UnsupportedException, MalformedException, SemanticException
+from concurrent.futures import ThreadPoolExecutor
+import uuid
 import pytest
 
 @pytest.fixture
@@ -139,4 +142,159 @@ def test_delete_uuid(space: UUIDSpace) -> None:
     # case 3 不在 uuids
     space.delete_uuid("c347a9e6-b92f-4f0c-8a04-59343239748d")
     assert (not space.has_uuid("c347a9e6-b92f-4f0c-8a04-59343239748d"))
-    assert space.invariant_check()
\ No newline at end of file
+    assert space.invariant_check()
+
+@pytest.mark.parametrize("generator", [RandomUUIDGenerator(buffer_size = 3), CounterUUIDGenerator(seed = 7)])
+def test_generators(generator) -> None:
+    space: UUIDSpace[str] = UUIDSpace(generator)
+    result = space.generate_uuids(10) + [space.generate() for _ in range(10)] + [space.generate_and_custom("value")]
+    assert len(set(result)) == len(result) == len(space)
+    for i in result:
+        parsed = uuid.UUID(i)
+        assert str(parsed) == i and parsed.version == 4 and parsed.variant == uuid.RFC_4122
+    assert space.invariant_check()
+
+
+def test_counter_generator_is_reproducible() -> None:
+    a, b = CounterUUIDGenerator(seed = 42), CounterUUIDGenerator(seed = 42)
+    assert a.batch(5) + [a()] == [b() for _ in range(6)]
+    assert CounterUUIDGenerator(seed = 1)() != CounterUUIDGenerator(seed = 2)()
+
+
+def test_default_generator() -> None:
+    set_default_generator(CounterUUIDGenerator(seed = 0))
+    try:
+        assert new_uuid() == CounterUUIDGenerator(seed = 0)()
+    finally:
+        set_default_generator(None)
+    with pytest.raises(UnsupportedException):
+        UUIDSpace(generator = "fast")  # type: ignore[arg-type]
+
+
+def test_int_uuid_space() -> None:
+    space: IntUUIDSpace[str] = IntUUIDSpace(CounterUUIDGenerator(seed = 3))
+    text = "4a829248-f043-4b28-995d-071b208907d0"
+    n = uuid_to_int(text)
+    assert n == uuid.UUID(text).int and int_to_uuid(n) == text
+
+    space.custom_uuid(text, "Magical Girl")
+    assert space.is_mapped(n) and space.is_mapped(text)
+    with pytest.raises(MalformedException):
+        space.custom_uuid(n, "again")
+    free = space.generate_uuids(3)
+    assert len(space) == 4 and space.uuids == set(free) | {n}
+    assert all(space.is_free(i) for i in free)
+
+    assert space.forced_free(text) == "Magical Girl"
+    assert space.forced_free(text, default = "default") == "default"
+    assert space.is_free(n) and space.invariant_check()
+
+    taken = space.custom("value")
+    assert space.get_value(taken) == "value" and not space.is_free(taken)
+    space.delete_uuid(taken)
+    assert taken not in space and space.invariant_check()
+
+    assert space.uuids_set == {int_to_uuid(i) for i in space.uuids}
+    assert sorted(space.serialize()["free"]) == sorted(space.uuids_set)
+    with pytest.raises(MalformedException):
+        space.has_uuid("not-a-uuid")
+
+
+@pytest.mark.parametrize("order", ["lifo", "fifo"])
+def test_free_order(order: str) -> None:
+    space: UUIDSpace[int] = UUIDSpace(CounterUUIDGenerator(seed = 1), free_order = order, debug = True)
+    ids = space.generate_uuids(4)
+    space.custom_uuid(ids[1], -1)
+    space.forced_free(ids[1])
+    expected = [ids[0], ids[2], ids[3], ids[1]]
+    if order == "lifo":
+        expected.reverse()
+    assert [space.custom(i) for i in range(4)] == expected
+    assert space.quick_check() and space.invariant_check()
+
+    # 释放后再次释放同一uuid, 不会在队列中留下重复项
+    space.forced_free(ids[0])
+    space.custom_uuid(ids[0], 0)
+    space.forced_free(ids[0])
+    space.forced_free(ids[2])
+    assert [space.custom(i) for i in range(2)] == ([ids[0], ids[2]] if order == "fifo" else [ids[2], ids[0]])
+
+
+def test_quick_check(space: UUIDSpace) -> None:
+    space.rebuild_checksums()
+    assert space.quick_check()
+
+    space.debug = True
+    space.custom("Chaos Nya 2")
+    space.forced_free("4a829248-f043-4b28-995d-071b208907d0")
+    space.delete_uuid("f1710238-71e9-4ac1-88f1-2bac3ca0a199")
+    assert space.quick_check() and space.invariant_check()
+
+    space.free_uuids.add("dfa8fd0b-18e7-4ffc-8914-3fe31b354ee0")
+    assert not space.quick_check()
+    with pytest.raises(SemanticException):
+        space.generate()
+
+    with pytest.raises(MalformedException):
+        UUIDSpace(free_order = "random")
+
+
+def test_checksum_opt_in() -> None:
+    # 默认不维护校验和与空闲队列, quick_check 退回到完整检测
+    space: UUIDSpace[int] = UUIDSpace(CounterUUIDGenerator(seed = 2))
+    ids = space.generate_uuids(3)
+    space.custom(0)
+    assert space._plain and not space.checksum and space._uuids_sum == 0
+    assert space.quick_check()
+    free = space.free_uuids.copy()
+    space.free_uuids.clear()
+    assert not space.quick_check()
+    space.free_uuids = free
+
+    # 中途启用时按当前内容计算, 此后增量维护
+    space.checksum = True
+    assert not space._plain
+    space.forced_free(space.custom(1))
+    space.delete_uuid(ids[0])
+    assert space.quick_check() and space.invariant_check()
+    space.debug = True
+    space.checksum = False
+    assert space.checksum
+
+
+def test_sharded_uuid_space() -> None:
+    space: ShardedUUIDSpace[int] = ShardedUUIDSpace(shards = 4, generator = CounterUUIDGenerator(seed = 5), checksum = True)
+    free = space.generate_uuids(20)
+    assert len(space) == 20 and space.uuids_set == set(free)
+    taken = space.custom(1)
+    assert space.is_mapped(taken) and space.get_value(taken) == 1
+    assert space.forced_free(taken) == 1 and space.is_free(taken)
+    assert space.forced_free(taken, default = -1) == -1
+    space.custom_uuid(free[0], 2)
+    space.delete_uuid(free[1])
+    assert free[1] not in space and len(space) == 19
+    assert space.invariant_check() and space.quick_check()
+
+    with pytest.raises(UnsupportedException):
+        ShardedUUIDSpace(shards = 0)
+
+
+def test_sharded_uuid_space_threads() -> None:
+    space: ShardedUUIDSpace[int] = ShardedUUIDSpace(shards = 8)
+    space.generate_uuids(100)
+
+    def worker(k: int) -> list[str]:
+        taken = []
+        for i in range(200):
+            _uuid = space.custom(k * 1000 + i)
+            assert space.get_value(_uuid) == k * 1000 + i
+            taken.append(_uuid)
+            if i % 2:
+                space.forced_free(taken.pop(0))
+        return taken
+
+    with ThreadPoolExecutor(max_workers = 8) as executor:
+        kept = [i for r in executor.map(worker, range(8)) for i in r]
+    assert len(set(kept)) == len(kept) == 8 * 100
+    assert all(space.is_mapped(i) for i in kept)
+    assert space.invariant_check() and space.quick_check()
@@ -0,0 +1,118 @@
+from miststar.localenv.scoreboard import Scoreboard, LocalScoreboards
+from miststar.localenv.entity import Entity
+from miststar.internal.int32 import Int32
+from miststar.internal.exceptions import MalformedException
+import pytest
+
+VALUES = [0, 1, -7, 2147483647, -2147483648, 123456789]
+
+@pytest.fixture(params = [False, True], ids = ["dict", "columnar"])
+def scoreboards(request) -> LocalScoreboards:
+    return LocalScoreboards(columnar = request.param)
+
+
+def populate(sc: Scoreboard) -> list[Entity]:
+    entities = [Entity(f"e{i}") for i in range(len(VALUES))]
+    for entity, value in zip(entities, VALUES):
+        sc.players_set(entity, value)
+    return entities
+
+
+@pytest.mark.parametrize("count", [1, -1, 2147483647, -2147483648])
+def test_players_add_many(scoreboards: LocalScoreboards, count: int) -> None:
+    sc = scoreboards.add_scoreboard("coins")
+    entities = populate(sc)
+    newcomer = Entity("newcomer")
+
+    sc.players_add_many(entities[:3] + [newcomer], count)
+    expected = [Int32(v) + count for v in VALUES[:3]] + VALUES[3:]
+    assert [sc.get_scoreboard_value(e) for e in entities] == expected
+    assert sc.get_scoreboard_value(newcomer) == count
+    assert newcomer.scoreboards["coins"] == count
+
+    sc.players_add_many(None, count)
+    assert [sc.get_scoreboard_value(e) for e in entities] == [Int32(v) + count for v in expected]
+    assert [e.scoreboards["coins"] for e in entities] == [Int32(v) + count for v in expected]
+
+
+def test_players_test_many(scoreboards: LocalScoreboards) -> None:
+    sc = scoreboards.add_scoreboard("coins")
+    entities = populate(sc)
+    mask = sc.players_test_many(entities + [Entity("absent")], -10, 10)
+    assert mask == [True, True, True, False, False, False, False]
+    assert sc.players_test_many(None, 0) == [True, True, False, True, False, True]
+
+    with pytest.raises(MalformedException):
+        sc.players_test_many(entities, 2147483648)
+
+
+@pytest.mark.parametrize("operation", ["=", "+=", "-=", "*=", "/=", "%=", "<", ">", "><"])
+@pytest.mark.parametrize("source_value", [0, 3, -2147483648])
+def test_players_operation_many(scoreboards: LocalScoreboards, operation: str, source_value: int) -> None:
+    reference = LocalScoreboards(columnar = scoreboards.columnar)
+    results = []
+    for local, bulk in ((reference, False), (scoreboards, True)):
+        target = local.add_scoreboard("target")
+        source = local.add_scoreboard("source")
+        entities = populate(target)
+        selector = Entity("selector")
+        source.players_set(selector, source_value)
+
+        players = entities + [Entity("absent")]
+        if bulk:
+            Scoreboard.players_operation_many(players, target, operation, selector, source)
+        else:
+            for player in players:
+                Scoreboard.players_operation(player, target, operation, selector, source)
+        results.append(([int(target.get_scoreboard_value(e)) for e in players], int(source.get_scoreboard_value(selector))))
+    assert results[0] == results[1]
+
+
+@pytest.mark.parametrize("operation", ["+=", "*=", "%=", "<"])
+def test_players_operation_many_self(scoreboards: LocalScoreboards, operation: str) -> None:
+    reference = LocalScoreboards(columnar = scoreboards.columnar)
+    results = []
+    for local, bulk in ((reference, False), (scoreboards, True)):
+        sc = local.add_scoreboard("coins")
+        entities = populate(sc)
+        selector = entities[2]
+        if bulk:
+            Scoreboard.players_operation_many(None, sc, operation, selector, sc)
+        else:
+            for player in entities:
+                Scoreboard.players_operation(player, sc, operation, selector, sc)
+        results.append([int(sc.get_scoreboard_value(e)) for e in entities])
+    assert results[0] == results[1]
+
+    with pytest.raises(MalformedException):
+        Scoreboard.players_operation_many(None, sc, "><", selector, sc)
+
+
+@pytest.mark.parametrize("operation", ["=", "+=", "-=", "*=", "/=", "%=", "<", ">", "><"])
+def test_compiled_operation(scoreboards: LocalScoreboards, operation: str) -> None:
+    reference = LocalScoreboards(columnar = scoreboards.columnar)
+    results = []
+    for local, compiled in ((reference, False), (scoreboards, True)):
+        target = local.add_scoreboard("target")
+        source = local.add_scoreboard("source")
+        entities = populate(target)
+        selectors = populate(source)
+        players = entities + [Entity("absent")]
+        pairs = list(zip(players, reversed(selectors + [Entity("absent")])))
+
+        if compiled:
+            op = Scoreboard.compile_operation(target, operation, source)
+            for player, selector in pairs:
+                op(player, selector)
+        else:
+            for player, selector in pairs:
+                Scoreboard.players_operation(player, target, operation, selector, source)
+        results.append((
+            [int(target.get_scoreboard_value(e)) for e in players],
+            [int(source.get_scoreboard_value(s)) for _, s in pairs],
+            [e.scoreboards["target"] for e in players],
+        ))
+    assert results[0] == results[1]
+
+    with pytest.raises(MalformedException):
+        Scoreboard.compile_operation(target, "**=", source)
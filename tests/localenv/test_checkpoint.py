@@ -0,0 +1,105 @@
+from miststar.localenv.localenv import LocalEnv
+from miststar.localenv.checkpoint import SerializationCache
+from miststar.localenv.entity import Entity
+from miststar.localenv.player import Player
+from miststar.serializer import JsonSerializer
+import pytest
+
+
+@pytest.fixture(params = [(False, False), (True, True)], ids = ["dict", "columnar-bitset"])
+def env(request) -> LocalEnv:
+    env = LocalEnv(*request.param)
+    coins = env.sc.add_scoreboard("coins", "金币")
+    kills = env.sc.add_scoreboard("kills")
+    for i in range(5):
+        entity = env.add_entity(Player(f"玩家{i}") if i % 2 else Entity(f"e{i}"))
+        coins.players_set(entity, i)
+        if i % 2:
+            kills.players_set(entity, -i)
+            env.tag.tag_add(entity, "red")
+    return env
+
+
+def check(env: LocalEnv, cache: SerializationCache) -> None:
+    assert cache.dumps_scoreboards() == JsonSerializer.dumps(env.scoreboard.serialize())
+    entities = {e.uuid: e.group_serialize()[1] for e in env.entities}
+    assert cache.dumps_entities() == JsonSerializer.dumps(entities)
+
+
+def test_incremental(env: LocalEnv) -> None:
+    cache = SerializationCache(env)
+    check(env, cache)
+    a, b = env.entities[:2]
+    kills = cache.objectives["kills"]
+    unchanged = cache.entities[env.entities[4].uuid]
+
+    env.sc.get_scoreboard("coins").players_add(a, 10)
+    env.tag.tag_add(b, "blue")
+    assert "coins" in cache.objectives
+    cache._collect()
+    assert "coins" not in cache.objectives and cache.objectives["kills"] is kills
+    assert a.uuid not in cache.entities and b.uuid not in cache.entities
+    assert cache.entities[env.entities[4].uuid] is unchanged
+    check(env, cache)
+
+    env.sc.get_scoreboard("kills").players_add_many(None, 1)
+    env.sc.objectives_remove("coins")
+    env.sc.objectives_add("empty")
+    env.remove_entity(b)
+    env.add_entity(Entity("newcomer"))
+    check(env, cache)
+
+
+def test_invalidation(env: LocalEnv) -> None:
+    cache = SerializationCache(env)
+    check(env, cache)
+    snap = env.snapshot()
+    env.sc.get_scoreboard("coins").players_set(env.entities[0], 99)
+    check(env, cache)
+    env.restore(snap)
+    check(env, cache)
+
+    env.disable_journal()
+    env.tag.tag_add(env.entities[0], "untracked")
+    check(env, cache)
+
+    env.entities[0].name = "renamed"
+    cache.invalidate()
+    check(env, cache)
+
+
+def test_empty(tmp_path) -> None:
+    env = LocalEnv()
+    cache = SerializationCache(env)
+    assert cache.dumps_scoreboards() == "{}"
+    env.sc.add_scoreboard("coins")
+    cache.dump_scoreboards(tmp_path / "sc.json")
+    assert JsonSerializer.load(tmp_path / "sc.json") == env.scoreboard.serialize()
+
+
+def test_no_history(env: LocalEnv) -> None:
+    cache = SerializationCache(env)
+    check(env, cache)
+    journal = env.journal
+    assert journal is not None and not journal.history
+    coins = env.sc.get_scoreboard("coins")
+    for _ in range(1000):
+        coins.players_add(env.entities[0], 1)
+    assert not journal.log and not journal.undo()
+    assert cache._dirty == ({"coins"}, {env.entities[0].uuid})
+    check(env, cache)
+    assert cache._dirty == (set(), set())
+
+    # 用户启用的日志与缓存共用同一个对象, 停用后缓存仍能收到修改
+    assert env.enable_journal() is journal and journal.history
+    coins.players_set(env.entities[1], 7)
+    assert journal.undo() and len(journal.log) == 2
+    env.disable_journal()
+    assert env.journal is journal and not journal.log
+    env.tag.tag_add(env.entities[2], "blue")
+    check(env, cache)
+
+    cache.close()
+    assert env.journal is None
+    check(env, cache)
+    cache.close()
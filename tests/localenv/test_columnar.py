@@ -0,0 +1,76 @@
+from miststar.localenv.scoreboard import Scoreboard, LocalScoreboards
+from miststar.localenv.columnar import ColumnarScoreboard
+from miststar.localenv.entity import Entity
+from miststar.localenv.player import Player
+from miststar.internal.exceptions import ReferenceNotFoundException, MalformedException
+import pytest
+
+@pytest.fixture
+def scoreboards() -> LocalScoreboards:
+    return LocalScoreboards(columnar = True)
+
+
+def test_shared_slots(scoreboards: LocalScoreboards) -> None:
+    coins = scoreboards.add_scoreboard("coins")
+    kills = scoreboards.add_scoreboard("kills")
+    assert isinstance(coins, ColumnarScoreboard)
+
+    a, b = Player("a"), Entity("b")
+    kills.players_set(b, 3)
+    coins.players_set(a, 1)
+    coins.players_set(b, 2)
+    assert len(scoreboards.slots) == 2
+    assert scoreboards.slots.find(b.uuid) == 0
+    assert not kills.has_entity(a)
+    assert coins.serialize()["mapping"] == {b.uuid: 2, a.uuid: 1}
+
+
+def test_players_api(scoreboards: LocalScoreboards) -> None:
+    sc = scoreboards.add_scoreboard("coins")
+    a = Player("a")
+
+    sc.players_add(a, 2147483647)
+    sc.players_add(a, 1)
+    assert sc.get_scoreboard_value(a) == -2147483648
+    assert a.scoreboards == {"coins": -2147483648}
+
+    sc.players_remove(a, 1)
+    assert sc.get_scoreboard_value(a) == 2147483647
+    assert sc.players_test(a, 0)
+
+    with pytest.raises(MalformedException):
+        sc.players_set(a, 2147483648)
+
+    value = sc.players_random(a, -5, 5)
+    assert -5 <= value <= 5
+    assert sc.mapping == {a.uuid: value}
+
+    sc.players_reset(a)
+    assert not sc.has_entity(a)
+    assert a.scoreboards == {}
+    assert len(sc) == 0
+    with pytest.raises(ReferenceNotFoundException):
+        sc.get_scoreboard_value(a)
+
+
+@pytest.mark.parametrize("operation, expected", [
+    ["=", (7, 7)],
+    ["+=", (-2147483640, 7)],
+    ["-=", (2147483642, 7)],
+    ["%=", (6, 7)],
+    ["/=", (-306783378, 7)],
+    ["><", (7, -2147483647)],
+    ["<", (-2147483647, 7)],
+    [">", (7, 7)],
+])
+def test_players_operation(operation: str, expected: tuple[int, int]) -> None:
+    dict_target, dict_source = Scoreboard("target"), Scoreboard("source")
+    columnar = LocalScoreboards(columnar = True)
+    col_target, col_source = columnar.add_scoreboard("target"), columnar.add_scoreboard("source")
+
+    for target, source in ((dict_target, dict_source), (col_target, col_source)):
+        a, b = Entity("a"), Entity("b")
+        target.players_set(a, -2147483647)
+        source.players_set(b, 7)
+        Scoreboard.players_operation(a, target, operation, b, source)
+        assert (int(target.get_scoreboard_value(a)), int(source.get_scoreboard_value(b))) == expected
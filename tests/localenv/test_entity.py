@@ -0,0 +1,90 @@
+from miststar.localenv.scoreboard import LocalScoreboards
+from miststar.localenv.player import Player
+import pytest
+
+@pytest.fixture(params = [False, True], ids = ["dict", "columnar"])
+def scoreboards(request) -> LocalScoreboards:
+    return LocalScoreboards(columnar = request.param)
+
+
+def test_single_store(scoreboards: LocalScoreboards) -> None:
+    coins = scoreboards.add_scoreboard("coins")
+    kills = scoreboards.add_scoreboard("kills")
+    player = Player("lesomras")
+
+    coins.players_add(player, 5)
+    coins.players_add(player, 5)
+    kills.players_set(player, 1)
+    assert coins.get_scoreboard_value(player) == 10
+    assert player.scoreboards == {"coins": 10, "kills": 1}
+
+    kills.players_set(player, 3)
+    assert player.scoreboards["kills"] == 3
+    assert player.serialize() == {
+        "type": "entity::player",
+        "name": "lesomras",
+        "uuid": player.uuid,
+        "scoreboards": {"coins": 10, "kills": 3},
+        "tags": [],
+    }
+
+
+@pytest.mark.parametrize("columnar", [False, True], ids = ["dict", "columnar"])
+def test_view_assignment(columnar: bool) -> None:
+    from miststar.localenv.localenv import LocalEnv
+
+    env = LocalEnv(columnar = columnar)
+    coins = env.sc.add_scoreboard("coins")
+    coins.enable_index()
+    player = env.add_entity(Player("lesomras"))
+    coins.players_set(player, 5)
+    journal = env.enable_journal()
+    snap = env.snapshot()
+
+    # 读取得到的是副本, 原地修改不影响计分板
+    value = player.scoreboards["coins"]
+    value += 100
+    coins.get_scoreboard_value(player).__iadd__(100)
+    assert player.scoreboards["coins"] == 5
+
+    player.scoreboards["coins"] += 1
+    assert coins.get_scoreboard_value(player) == 6
+    assert coins.select_range(6, 6) == [player.uuid]
+    assert journal.log[-1][3:] == (5, 6)
+    with pytest.raises(KeyError):
+        player.scoreboards["kills"] = 1
+    env.restore(snap)
+    assert player.scoreboards["coins"] == 5 and coins.select_range(5, 5) == [player.uuid]
+
+
+def test_view_order_and_removal(scoreboards: LocalScoreboards) -> None:
+    coins = scoreboards.add_scoreboard("coins")
+    kills = scoreboards.add_scoreboard("kills")
+    player = Player("lesomras")
+
+    coins.players_set(player, 1)
+    kills.players_set(player, 2)
+    coins.players_reset(player)
+    coins.players_set(player, 3)
+    assert list(player.scoreboards) == ["kills", "coins"]
+    assert "coins" in player.scoreboards and len(player.scoreboards) == 2
+
+    scoreboards.objectives_remove("kills")
+    assert player.scoreboards == {"coins": 3}
+    with pytest.raises(KeyError):
+        player.scoreboards["kills"]
+
+
+def test_compact_entity() -> None:
+    from miststar.localenv.entity import Entity
+
+    entity, player = Entity("e"), Player("p")
+    assert not hasattr(entity, "__dict__") and not hasattr(player, "__dict__")
+    assert entity._boards is None and entity._tags is None
+    assert entity.serialize()["tags"] == [] and entity._tags is None
+    assert (entity._type, player._type) == ("entity", "entity::player")
+    assert entity.scoreboards == {}
+
+    entity.tags.add("a")
+    assert entity.tags == {"a"}
+    assert entity != player
@@ -0,0 +1,231 @@
+from miststar.localenv.localenv import LocalEnv
+from miststar.localenv.journal import Journal
+from miststar.localenv.entity import Entity
+from miststar.internal.exceptions import ReferenceNotFoundException, MalformedException
+import json
+import pytest
+
+MODES = [(False, False), (True, True)]
+IDS = ["dict", "columnar-bitset"]
+
+
+def state(env: LocalEnv) -> tuple:
+    return (
+        {i: j.group_serialize()[1] for i, j in env.sc.mapping.items()},
+        {i: sorted(e.uuid for e in j) for i, j in env.tag.entities.items()},
+        {e.uuid: sorted(e.tags) for e in env.entities},
+    )
+
+
+def build(mode: tuple, uuids: list[str]) -> LocalEnv:
+    env = LocalEnv(*mode)
+    for i, u in enumerate(uuids):
+        entity = Entity(f"e{i}")
+        entity.uuid = u
+        env.add_entity(entity)
+    return env
+
+
+@pytest.fixture(params = MODES, ids = IDS)
+def env(request) -> LocalEnv:
+    return build(request.param, [f"uuid-{i}" for i in range(4)])
+
+
+def test_records(env: LocalEnv) -> None:
+    journal = env.enable_journal()
+    assert env.enable_journal() is journal
+    a, b = env.entities[:2]
+    coins = env.sc.objectives_add("coins")
+    coins.players_set(a, 3)
+    coins.players_set(a, 3)
+    coins.players_add(a, 2)
+    coins.players_add_many([a, b, a], 1)
+    env.tag.tag_add(a, "red")
+    env.tag.tag_add(a, "red")
+    env.tag.tag_remove(b, "red")
+    coins.players_reset(b)
+    env.sc.objectives_remove("coins")
+
+    assert journal.log == [
+        ("objective+", "coins", ""),
+        ("score", "coins", a.uuid, None, 3),
+        ("score", "coins", a.uuid, 3, 5),
+        ("score", "coins", a.uuid, 5, 7),
+        ("score", "coins", b.uuid, None, 1),
+        ("tag", a.uuid, "red", True),
+        ("score", "coins", b.uuid, 1, None),
+        ("score", "coins", a.uuid, 7, None),
+        ("objective-", "coins", ""),
+    ]
+
+    env.disable_journal()
+    env.sc.objectives_add("kills")
+    assert len(journal) == 9
+
+
+def test_undo_redo(env: LocalEnv) -> None:
+    coins = env.sc.objectives_add("coins")
+    a, b, c, _ = env.entities
+    coins.players_set(a, 1)
+    journal = env.enable_journal()
+
+    states = [state(env)]
+    coins.players_set(a, 10)
+    coins.players_set(b, 20)
+    env.tag.tag_add(a, "red")
+    env.tag.tag_add(c, "red")
+    journal.checkpoint()
+    states.append(state(env))
+    coins.players_add_many(None, 5)
+    env.tag.tag_remove(c, "red")
+    env.sc.objectives_add("kills").players_set(c, 4)
+    journal.checkpoint()
+    states.append(state(env))
+    env.sc.objectives_remove("coins")
+    env.tag.tag_clear(a)
+    states.append(state(env))
+
+    for expected in reversed(states[:-1]):
+        assert journal.undo()
+        assert state(env) == expected
+    assert not journal.undo()
+    for expected in states[1:]:
+        assert journal.redo()
+        assert state(env) == expected
+    assert not journal.redo()
+
+    # 新的修改会丢弃重做栈
+    assert journal.undo()
+    coins.players_set(a, 0)
+    assert not journal.redo()
+
+
+@pytest.mark.parametrize("target", MODES, ids = IDS)
+def test_replay(env: LocalEnv, target: tuple) -> None:
+    other = build(target, [e.uuid for e in env.entities])
+    journal = env.enable_journal()
+    a, b = env.entities[:2]
+
+    coins = env.sc.objectives_add("coins", "Coins")
+    coins.players_set(a, 5)
+    env.tag.tag_add(a, "red")
+    tick = journal.position
+    # 只需传输两次导出之间的增量
+    Journal.replay(other, json.loads(json.dumps(journal.export())))
+    assert state(other) == state(env)
+
+    coins.players_operation_many(None, coins, "*=", a, coins)
+    coins.players_set(b, -1)
+    env.tag.tag_remove(a, "red")
+    delta = journal.export(tick)
+    assert len(delta) == 3
+    Journal.replay(other, delta)
+    assert state(other) == state(env)
+
+    stranger = Entity("stranger")
+    coins.players_set(stranger, 1)
+    with pytest.raises(ReferenceNotFoundException):
+        Journal.replay(other, journal.export(journal.position - 1))
+
+
+def test_drain(env: LocalEnv) -> None:
+    other = build((False, False), [e.uuid for e in env.entities])
+    journal = env.enable_journal()
+    coins = env.sc.objectives_add("coins")
+    for i in range(100):
+        coins.players_set(env.entities[i % 2], i)
+        Journal.replay(other, journal.drain())
+        assert not journal.log and journal.position == i + 2
+    assert state(other) == state(env)
+
+    # 位置不因丢弃而改变
+    tick = journal.position
+    env.tag.tag_add(env.entities[0], "red")
+    env.tag.tag_add(env.entities[1], "red")
+    journal.truncate(tick + 1)
+    assert journal.export(tick + 1) == [["tag", env.entities[1].uuid, "red", True]]
+    assert journal.export() == journal.export(journal.offset)
+    with pytest.raises(MalformedException):
+        journal.export(tick)
+    with pytest.raises(MalformedException):
+        journal.truncate(journal.position + 1)
+    assert journal.undo() and state(env)[2][env.entities[0].uuid] == []
+
+
+def test_release_entities() -> None:
+    env = LocalEnv()
+    journal = env.enable_journal()
+    coins = env.sc.add_scoreboard("coins")
+    kept, dropped = Entity("kept"), Entity("dropped")
+    coins.players_set(kept, 1)
+    journal.checkpoint()
+    coins.players_set(dropped, 2)
+    coins.players_set(dropped, 3)
+    assert journal._entities.keys() == {kept.uuid, dropped.uuid}
+
+    # 被撤销的步骤在新的修改后被丢弃, 只有它引用的实体随之释放
+    assert journal.undo()
+    coins.players_set(kept, 4)
+    assert journal._entities.keys() == {kept.uuid} and journal._refs == {kept.uuid: 2}
+    assert journal.undo() and journal.undo()
+    assert not coins.has_entity(kept)
+    journal.clear_history()
+    assert not journal._entities and not journal._refs
+
+
+def test_undo_unregistered_entities() -> None:
+    # 字典计分板上通过players_set写入的实体不会登记到环境中
+    env = LocalEnv()
+    coins = env.sc.add_scoreboard("coins")
+    a, b = Entity("a"), Entity("b")
+    coins.players_set(a, 1)
+    coins.players_set(b, 2)
+    journal = env.enable_journal()
+    before = state(env)
+
+    coins.players_add_many(None, 5)
+    journal.checkpoint()
+    env.sc.objectives_remove("coins")
+    assert journal.undo()
+    assert env.sc.get_scoreboard("coins") is coins
+    assert journal.undo()
+    assert state(env) == before
+    assert journal.redo() and journal.redo()
+    assert not env.sc.has_scoreboard("coins")
+    assert journal.undo() and journal.undo()
+    assert state(env) == before
+
+    # 实体对计分板的引用仍然有效
+    assert a._objectives["coins"] is coins
+    coins.players_reset(a)
+    assert not coins.has_entity(a)
+
+
+@pytest.mark.parametrize("mode", MODES, ids = IDS)
+def test_undo_is_atomic(mode: tuple) -> None:
+    env = build(mode, ["uuid-0"])
+    a = env.entities[0]
+    journal = env.enable_journal()
+    coins = env.sc.add_scoreboard("coins")
+    journal.checkpoint()
+    coins.players_set(a, 3)
+    env.tag.tag_add(a, "red")
+    env.sc.objectives_remove("coins")
+    journal.checkpoint()
+
+    # 在日志之外重新创建了同名计分项, 撤销移除会失败
+    env.disable_journal()
+    env.sc.add_scoreboard("coins")
+    env._attach(journal)
+    expected = state(env)
+    with pytest.raises(MalformedException):
+        journal.undo()
+    assert state(env) == expected
+    assert len(journal._undo) == 2 and not journal._redo
+
+    # 失败的replay同样不做任何修改
+    other = build(mode, ["uuid-0"])
+    records = journal.export() + [["tag", "stranger", "red", True]]
+    with pytest.raises(ReferenceNotFoundException):
+        Journal.replay(other, records)
+    assert state(other) == state(build(mode, ["uuid-0"]))
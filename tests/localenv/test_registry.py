@@ -0,0 +1,58 @@
+from miststar.localenv.registry import EntityRegistry
+from miststar.localenv.localenv import LocalEnv
+from miststar.localenv.entity import Entity
+from miststar.internal.exceptions import MalformedException, ReferenceNotFoundException
+import pytest
+
+
+def test_registry_reuses_slots() -> None:
+    registry = EntityRegistry()
+    entities = [Entity(f"e{i}") for i in range(5)]
+    assert [registry.register(e) for e in entities] == [0, 1, 2, 3, 4]
+    assert registry.get(entities[2].uuid) is entities[2]
+    assert registry.find(entities[2].uuid) == 2
+
+    assert registry.unregister(entities[3]) == 3
+    assert registry.unregister(entities[1]) == 1
+    assert len(registry) == 3 and registry.capacity == 5
+    assert list(registry) == [entities[0], entities[2], entities[4]]
+    assert registry.get(entities[1].uuid) is None
+
+    a, b, c = Entity("a"), Entity("b"), Entity("c")
+    assert [registry.slot_of(a), registry.register(b), registry.register(c)] == [1, 3, 5]
+    assert registry.entity_at(3) is b
+    assert registry.register(b) == 3
+
+    clone = Entity("clone")
+    clone.uuid = a.uuid
+    with pytest.raises(MalformedException):
+        registry.register(clone)
+    with pytest.raises(ReferenceNotFoundException):
+        registry.unregister(clone)
+
+
+@pytest.mark.parametrize("mode", [(False, False), (True, True)], ids = ["dict", "columnar-bitset"])
+def test_remove_entity(mode) -> None:
+    env = LocalEnv(*mode)
+    coins = env.sc.add_scoreboard("coins")
+    coins.enable_index()
+    old, keep = env.add_entity(Entity("old")), env.add_entity(Entity("keep"))
+    coins.players_set(old, 5)
+    coins.players_set(keep, 7)
+    env.tag.tag_add(old, "red")
+    env.tag.tag_add(keep, "red")
+
+    env.remove_entity(old)
+    assert env.get_entity(old.uuid) is None
+    assert not coins.has_entity(old)
+    assert dict(old.scoreboards) == {}
+    assert set(old.tags) == set()
+    assert coins.select_range(0, 10) == [keep.uuid]
+    assert env.select("@e[tag=red]") == [keep]
+
+    new = env.add_entity(Entity("new"))
+    assert env.registry.find(new.uuid) == 0
+    assert not coins.has_entity(new)
+    assert not env.tag.has_tag(new, "red")
+    assert env.select("@e") == [new, keep]
+    assert env.get_entity(new.uuid) is new
@@ -0,0 +1,120 @@
+from miststar.localenv.scoreboard import Scoreboard, LocalScoreboards
+from miststar.localenv.score_index import ScoreIndex
+from miststar.localenv.entity import Entity
+from miststar.internal.exceptions import ReferenceNotFoundException
+from typing import Any
+import random
+import pytest
+
+@pytest.fixture(params = [False, True], ids = ["dict", "columnar"])
+def scoreboards(request) -> LocalScoreboards:
+    return LocalScoreboards(columnar = request.param)
+
+
+def brute_range(sc: Scoreboard, lo: int, hi: int) -> list[str]:
+    return [u for v, u in sorted((int(v), u) for u, v in sc.mapping.items()) if lo <= v <= hi]
+
+
+def check(sc: Scoreboard) -> None:
+    assert sc.index is not None
+    assert list(sc.index) == sorted((int(v), u) for u, v in sc.mapping.items())
+    for lo, hi in [(-5, 5), (0, 0), (-2147483648, 2147483647), (10, 3), (-50, -10)]:
+        assert sc.select_range(lo, hi) == brute_range(sc, lo, hi)
+        assert sc.count_range(lo, hi) == len(brute_range(sc, lo, hi))
+
+
+def test_score_index_basic() -> None:
+    index = ScoreIndex()
+    index.LOAD = 4
+    items = [(random.randint(-20, 20), f"u{i}") for i in range(200)]
+    for v, u in items:
+        index.add(v, u)
+    assert list(index) == sorted(items)
+    assert len(index) == 200
+
+    for v, u in items[::2]:
+        index.remove(v, u)
+    rest = sorted(items[1::2])
+    assert list(index) == rest
+    assert list(index.range(-3, 3)) == [i for i in rest if -3 <= i[0] <= 3]
+    assert index.count(-3, 3) == len([i for i in rest if -3 <= i[0] <= 3])
+    assert index.rank(0) == 1 + len([i for i in rest if i[0] > 0])
+    assert index.top(7) == sorted(rest, reverse = True)[:7]
+    assert index.top(0) == []
+
+    with pytest.raises(KeyError):
+        index.remove(100, "missing")
+
+
+def test_incremental_updates(scoreboards: LocalScoreboards) -> None:
+    rng = random.Random(7)
+    sc = scoreboards.add_scoreboard("coins")
+    other = scoreboards.add_scoreboard("kills")
+    entities = [Entity(f"e{i}") for i in range(60)]
+    for e in entities[:30]:
+        sc.players_set(e, rng.randint(-50, 50))
+    sc.enable_index()
+    assert sc.index is not None
+    sc.index.LOAD = 4
+    check(sc)
+
+    for _ in range(400):
+        e = rng.choice(entities)
+        match rng.randrange(6):
+            case 0:
+                sc.players_set(e, rng.randint(-50, 50))
+            case 1:
+                sc.players_add(e, rng.randint(-10, 10))
+            case 2:
+                sc.players_reset(e)
+            case 3:
+                sc.players_random(e, -50, 50)
+            case 4:
+                sc.players_add_many(rng.sample(entities, 5) + [e, e], rng.randint(-3, 3))
+            case 5:
+                other.players_set(e, rng.randint(-5, 5))
+                Scoreboard.players_operation(e, sc, rng.choice(["=", "+=", "%=", "><", "<"]), rng.choice(entities), rng.choice([sc, other]))
+    check(sc)
+
+    sc.players_add_many(None, 3)
+    check(sc)
+    Scoreboard.players_operation_many(entities[:10], sc, "*=", entities[0], sc)
+    check(sc)
+    sc.compile_operation(sc, ">", other)(entities[1], entities[2])
+    check(sc)
+
+
+def test_queries_without_index(scoreboards: LocalScoreboards) -> None:
+    sc = scoreboards.add_scoreboard("kills")
+    entities = [Entity(f"e{i}") for i in range(5)]
+    for e, v in zip(entities, [5, 9, 5, -1, 9]):
+        sc.players_set(e, v)
+
+    expected: dict[str, Any] = {
+        "range": sc.select_range(0, 8),
+        "count": sc.count_range(0, 8),
+        "ranks": [sc.rank_of(e) for e in entities],
+        "top": sc.top(3),
+    }
+    assert [sc.rank_of(e) for e in entities] == [3, 1, 3, 5, 1]
+    assert sorted(expected["range"]) == sorted([entities[0].uuid, entities[2].uuid])
+    assert [v for _, v in sc.top(3)] == [9, 9, 5]
+
+    sc.enable_index()
+    assert sc.select_range(0, 8) == expected["range"]
+    assert sc.count_range(0, 8) == expected["count"]
+    assert [sc.rank_of(e) for e in entities] == expected["ranks"]
+    assert sc.top(3) == expected["top"]
+
+    with pytest.raises(ReferenceNotFoundException):
+        sc.rank_of(Entity("absent"))
+
+
+def test_clear_resets_index(scoreboards: LocalScoreboards) -> None:
+    sc = scoreboards.add_scoreboard("coins")
+    index = sc.enable_index()
+    sc.players_set(Entity("a"), 3)
+    scoreboards.objectives_remove("coins")
+    assert len(index) == 0
+    sc.disable_index()
+    assert sc.index is None
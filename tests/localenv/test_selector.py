@@ -0,0 +1,94 @@
+from miststar.localenv.localenv import LocalEnv
+from miststar.localenv.selector import SelectorPlan, parse_range
+from miststar.localenv.entity import Entity
+from miststar.localenv.player import Player
+from miststar.textcomps.components import Selector
+from miststar.internal.exceptions import MalformedException
+import pytest
+
+@pytest.fixture(params = [(False, False), (True, True)], ids = ["dict", "columnar-bitset"])
+def env(request) -> LocalEnv:
+    env = LocalEnv(*request.param)
+    coins = env.sc.add_scoreboard("coins")
+    env.sc.add_scoreboard("kills")
+    for i in range(12):
+        entity = env.add_entity(Player(f"p{i}") if i % 2 == 0 else Entity(f"e{i}"))
+        coins.players_set(entity, i * 5)
+        if i % 3 == 0:
+            env.tag.tag_add(entity, "red")
+        if i % 4 == 0:
+            env.tag.tag_add(entity, "blue")
+    return env
+
+
+def names(entities: list[Entity]) -> list[str]:
+    return [e.name for e in entities]
+
+
+def test_parse() -> None:
+    plan = SelectorPlan('@e[type=!player, tag=a, tag=!b, scores={coins=1..5,kills=!3}, name="x y", c=2]')
+    assert plan.kind == "e"
+    assert plan.tags == ["a", "!b"]
+    assert plan.scores == [("coins", 1, 5, False), ("kills", 3, 3, True)]
+    assert plan.types == [("player", True)]
+    assert plan.names == [("x y", False)]
+    assert plan.count == 2
+    assert SelectorPlan("@a").types == [("player", False)]
+    assert SelectorPlan("@p").count == 1
+    assert parse_range("..5") == (-2147483648, 5)
+    assert parse_range("3..") == (3, 2147483647)
+
+    for invalid in ["@x", "@e[c=0]", "@e[foo=1]", "@e[scores={a=1..b}]", "@e[tag]", "@e[scores={a=1]"]:
+        with pytest.raises(MalformedException):
+            SelectorPlan(invalid)
+
+
+@pytest.mark.parametrize("indexed", [False, True])
+def test_select(env: LocalEnv, indexed: bool) -> None:
+    if indexed:
+        env.sc.get_scoreboard("coins").enable_index()
+    everyone = env.entities
+
+    assert env.select("@e") == everyone
+    assert env.select("@a") == [e for e in everyone if isinstance(e, Player)]
+    assert env.select("@e[type=!player]") == [e for e in everyone if not isinstance(e, Player)]
+    assert names(env.select("@e[tag=red]")) == ["p0", "e3", "p6", "e9"]
+    assert names(env.select("@e[tag=red,tag=!blue]")) == ["e3", "p6", "e9"]
+    assert names(env.select("@e[tag=!red,tag=!blue]")) == ["e1", "p2", "e5", "e7", "p10", "e11"]
+    assert names(env.select("@e[tag=]")) == ["e1", "p2", "e5", "e7", "p10", "e11"]
+    assert names(env.select("@e[scores={coins=10..25}]")) == ["p2", "e3", "p4", "e5"]
+    assert names(env.select("@e[scores={coins=!..40}]")) == ["e9", "p10", "e11"]
+    assert names(env.select("@a[scores={coins=10..25},tag=!red]")) == ["p2", "p4"]
+    assert names(env.select("@e[scores={coins=10..,kills=0}]")) == []
+    assert names(env.select("@e[scores={missing=1}]")) == []
+    assert names(env.select("@e[name=e3]")) == ["e3"]
+    assert names(env.select("@e[name=!e3,tag=red]")) == ["p0", "p6", "e9"]
+    assert names(env.select("@e[c=2]")) == ["p0", "e1"]
+    assert names(env.select("@e[c=-2]")) == ["e11", "p10"]
+    assert names(env.select("@p")) == ["p0"]
+    assert names(env.select("@n[type=!player]")) == ["e1"]
+    assert names(env.select(Selector("@e[tag=blue]"))) == ["p0", "p4", "p8"]
+
+    picked = env.select("@r[c=3]")
+    assert len(picked) == 3 and all(isinstance(e, Player) for e in picked)
+
+
+def test_select_executor(env: LocalEnv) -> None:
+    executor = env.entities[3]
+    assert env.select("@s", executor) == [executor]
+    assert env.select("@s[tag=blue]", executor) == []
+    assert env.select("@initiator[tag=red]", executor) == [executor]
+    assert env.select("@s") == []
+
+
+def test_plan_cache(env: LocalEnv) -> None:
+    plan = env.selector.compile("@e[tag=red]")
+    assert env.selector.compile("@e[tag=red]") is plan
+    env.tag.tag_add(env.entities[1], "red")
+    assert names(env.select("@e[tag=red]")) == ["p0", "e1", "e3", "p6", "e9"]
+
+    # 缓存有上限, 随调用变化的选择器不会无限累积
+    for i in range(1000):
+        env.selector.compile(f"@e[name=n{i}]")
+    assert len(env.selector._plans) == 256
+    assert env.selector.compile("@e[name=n999]") is env.selector.compile("@e[name=n999]")
@@ -0,0 +1,100 @@
+from miststar.localenv.localenv import LocalEnv
+from miststar.localenv.entity import Entity
+from miststar.internal.exceptions import MalformedException
+import pytest
+
+MODES = [(False, False), (True, True), (True, False), (False, True)]
+IDS = ["dict", "columnar-bitset", "columnar", "bitset"]
+
+
+def state(env: LocalEnv) -> tuple:
+    """环境中可观察到的全部状态"""
+    return (
+        [e.uuid for e in env.entities],
+        {i: j.group_serialize()[1]["mapping"] for i, j in env.sc.mapping.items()},
+        {i: sorted(e.uuid for e in j) for i, j in env.tag.entities.items()},
+        {e.uuid: (sorted(e.tags), {i: int(j) for i, j in e.scoreboards.items()}) for e in env.entities},
+    )
+
+
+@pytest.fixture(params = MODES, ids = IDS)
+def env(request) -> LocalEnv:
+    env = LocalEnv(*request.param)
+    coins = env.sc.add_scoreboard("coins")
+    env.sc.add_scoreboard("kills")
+    coins.enable_index()
+    for i in range(6):
+        entity = env.add_entity(Entity(f"e{i}"))
+        coins.players_set(entity, i * 10)
+        if i % 2 == 0:
+            env.tag.tag_add(entity, "even")
+    return env
+
+
+def test_restore(env: LocalEnv) -> None:
+    before = state(env)
+    snap = env.snapshot()
+    coins, kills = env.sc.get_scoreboard("coins"), env.sc.get_scoreboard("kills")
+    e0, e1, e2 = env.entities[:3]
+
+    coins.players_add(e0, 5)
+    coins.players_add_many(None, 1)
+    coins.players_reset(e1)
+    kills.players_set(e2, 3)
+    env.tag.tag_add(e1, "even")
+    env.tag.tag_remove(e2, "even")
+    env.tag.tag_add(e0, "new")
+    env.remove_entity(env.entities[3])
+    newcomer = env.add_entity(Entity("newcomer"))
+    coins.players_set(newcomer, 99)
+    env.tag.tag_add(newcomer, "even")
+    env.sc.objectives_remove("kills")
+    env.sc.add_scoreboard("extra").players_set(e0, 1)
+    changed = state(env)
+    assert changed != before
+
+    env.restore(snap)
+    assert state(env) == before
+    assert coins.select_range(0, 100) == [e.uuid for e in env.entities]
+    assert env.sc.get_scoreboard("kills") is kills
+    assert not env.tag.has_tag(newcomer, "even")
+    assert "extra" not in dict(e0.scoreboards)
+    assert env.select("@e[tag=even]") == [env.entities[i] for i in (0, 2, 4)]
+
+    # 同一个快照可以反复恢复, 恢复后的修改不会影响快照
+    coins.players_set(e0, -1)
+    env.tag.tag_add(e1, "even")
+    env.restore(snap)
+    assert state(env) == before
+
+
+def test_nested(env: LocalEnv) -> None:
+    coins = env.sc.get_scoreboard("coins")
+    e0 = env.entities[0]
+    first = env.snapshot()
+    coins.players_set(e0, 1)
+    second = env.snapshot()
+    coins.players_set(e0, 2)
+    env.tag.tag_add(e0, "red")
+
+    env.restore(second)
+    assert int(coins.get_scoreboard_value(e0)) == 1
+    assert not env.tag.has_tag(e0, "red")
+    env.restore(first)
+    assert int(coins.get_scoreboard_value(e0)) == 0
+    env.restore(second)
+    assert int(coins.get_scoreboard_value(e0)) == 1
+
+
+def test_copy_on_write(env: LocalEnv) -> None:
+    coins, kills = env.sc.get_scoreboard("coins"), env.sc.get_scoreboard("kills")
+    snap = env.snapshot()
+    assert coins._holds(snap.states["coins"]) and kills._holds(snap.states["kills"])
+    coins.players_set(env.entities[0], 7)
+    assert not coins._holds(snap.states["coins"])
+    assert kills._holds(snap.states["kills"])
+
+
+def test_foreign_snapshot() -> None:
+    with pytest.raises(MalformedException):
+        LocalEnv().restore(LocalEnv().snapshot())
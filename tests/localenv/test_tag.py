@@ -0,0 +1,141 @@
+from miststar.localenv.tag import LocalTags
+from miststar.localenv.bitset_tags import BitsetTags, TagView
+from miststar.localenv.localenv import LocalEnv
+from miststar.localenv.entity import Entity
+from miststar.internal.exceptions import MalformedArgument
+import random
+import pytest
+
+TAGS = ["a", "b", "c", "d"]
+
+@pytest.fixture(params = [LocalTags, BitsetTags], ids = ["set", "bitset"])
+def world(request) -> tuple[LocalTags, list[Entity]]:
+    rng = random.Random(3)
+    tags = request.param()
+    entities = [Entity(f"e{i}") for i in range(80)]
+    for entity in entities:
+        for tag in TAGS:
+            if rng.random() < 0.4:
+                tags.tag_add(entity, tag)
+    return tags, entities
+
+
+def brute(entities: list[Entity], conditions: tuple[str, ...]) -> set[Entity]:
+    result = set()
+    for e in entities:
+        ok = True
+        for c in conditions:
+            if c == "":
+                ok &= not e.tags
+            elif c == "!":
+                ok &= bool(e.tags)
+            elif c.startswith("!"):
+                ok &= c[1:] not in e.tags
+            else:
+                ok &= c in e.tags
+        if ok:
+            result.add(e)
+    return result
+
+
+def test_has_tag(world) -> None:
+    tags, entities = world
+    for e in entities:
+        for t in TAGS:
+            assert tags.has_tag(e, t) == (e in tags.entities.get(t, ()))
+    e = entities[0]
+    tags.tag_add(e, "x")
+    assert tags.has_tag(e, "x")
+    tags.tag_remove(e, "x")
+    assert not tags.has_tag(e, "x")
+    assert "x" not in tags.entities
+    assert "x" not in e.tags
+
+
+def test_has_tag_other_store(world) -> None:
+    # 实体在另一个存储中获得的标签不属于本存储
+    tags, entities = world
+    other = type(tags)()
+    a, b = entities[0], entities[1]
+    tags.tag_add(a, "x")
+    other.tag_add(b, "x")
+    assert not tags.has_tag(b, "x")
+    tags.tag_remove(b, "x")
+    assert tags.has_tag(a, "x") and other.has_tag(b, "x")
+    assert list(tags.query("x")) == [a]
+
+
+@pytest.mark.parametrize("conditions", [
+    ("a", ),
+    ("a", "b"),
+    ("a", "!b", "c"),
+    ("!a", "!b"),
+    ("", ),
+    ("!", ),
+    ("!", "!d"),
+    ("a", "missing"),
+    ("!missing", ),
+    ("", "!"),
+])
+def test_query(world, conditions: tuple[str, ...]) -> None:
+    tags, entities = world
+    expected = brute(entities, conditions)
+    assert set(tags.query(*conditions, universe = entities)) == expected
+    assert list(tags.query(*conditions, universe = entities)) == [e for e in entities if e in expected]
+    assert set(tags.query(*conditions, universe = set(entities))) == expected
+
+    tagged = [e for e in entities if e.tags]
+    assert set(tags.query(*conditions)) == brute(tagged, conditions)
+
+
+def test_query_is_lazy(world) -> None:
+    tags, entities = world
+    result = tags.query("a")
+    tags.tag_add(entities[0], "a")
+    assert entities[0] in set(result)
+
+    with pytest.raises(MalformedArgument):
+        tags.query(1)
+
+
+def test_bitset_tags_view() -> None:
+    tags = BitsetTags()
+    entity = Entity("e")
+    entity.tags.add("old")
+    tags.tag_add(entity, "new")
+    assert isinstance(entity.tags, TagView)
+    assert entity.tags == {"old", "new"}
+    assert tags.entities == {"old": {entity}, "new": {entity}}
+
+    entity.tags.discard("old")
+    assert not tags.has_tag(entity, "old")
+    entity.tags.add("x")
+    assert tags.has_tag(entity, "x")
+    assert sorted(entity.serialize()["tags"]) == ["new", "x"]
+    assert not tags.has_tag(Entity("other"), "x")
+
+
+def test_bitset_tags_chunks() -> None:
+    tags = BitsetTags()
+    entities = [Entity(f"e{i}") for i in range(3000)]
+    for i, e in enumerate(entities):
+        if i % 3 == 0:
+            tags.tag_add(e, "a")
+        if i % 5 == 0:
+            tags.tag_add(e, "b")
+    assert list(tags.query("a", "b")) == [e for i, e in enumerate(entities) if i % 15 == 0]
+    assert list(tags.query("a", "!b")) == [e for i, e in enumerate(entities) if i % 3 == 0 and i % 5]
+    for e in entities:
+        tags.tag_remove(e, "a")
+    assert tags.bitmaps[tags.tag_ids["a"]] == {}
+    assert list(tags.query("a")) == []
+
+
+def test_localenv_shares_slots() -> None:
+    env = LocalEnv(columnar = True, bitset_tags = True)
+    entity = Entity("e")
+    env.tag.tag_add(entity, "a")
+    env.sc.add_scoreboard("coins").players_set(entity, 1)
+    assert isinstance(env.tag, BitsetTags)
+    assert env.tag.slots is env.sc.slots
+    assert len(env.sc.slots) == 1
@@ -0,0 +1,57 @@
+from miststar.serializer import JsonSerializer, StreamDict, StreamList, iter_json
+from miststar.localenv.localenv import LocalEnv
+from miststar.localenv.entity import Entity
+from miststar.localenv.player import Player
+import json
+import pytest
+
+VALUES = [
+    {},
+    [],
+    {"a": 1, "b": [1, 2.5, None, True], "c": {"d": {}, "e": "中文\n\"x\""}, "f": []},
+    [{"x": [[]]}, "s", -3, {1: 2, None: 3, True: 4}],
+]
+
+
+def stream(value):
+    """将value中的dict/list全部替换为流式容器"""
+    if isinstance(value, dict):
+        return StreamDict((k, stream(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return StreamList(stream(i) for i in value)
+    return value
+
+
+@pytest.mark.parametrize("value", VALUES)
+@pytest.mark.parametrize("indent, ensure_ascii", [(2, False), (4, True), (0, False)])
+def test_iter_json(value, indent: int, ensure_ascii: bool) -> None:
+    expected = json.dumps(value, indent = indent, ensure_ascii = ensure_ascii)
+    assert "".join(iter_json(value, indent, ensure_ascii)) == expected
+    assert "".join(iter_json(stream(value), indent, ensure_ascii)) == expected
+    # 嵌套的流式容器
+    wrapped = StreamDict([("outer", StreamList([stream(value)]))])
+    assert "".join(iter_json(wrapped, indent, ensure_ascii)) == json.dumps({"outer": [value]}, indent = indent, ensure_ascii = ensure_ascii)
+
+
+@pytest.mark.parametrize("mode", [(False, False), (True, True)], ids = ["dict", "columnar-bitset"])
+def test_localenv(mode, tmp_path) -> None:
+    env = LocalEnv(*mode)
+    env.sc.add_scoreboard("empty")
+    coins = env.sc.add_scoreboard("coins", "金币")
+    for i in range(20):
+        entity = env.add_entity(Player(f"玩家{i}") if i % 2 else Entity(f"e{i}"))
+        coins.players_set(entity, i - 10)
+        if i % 3:
+            env.tag.tag_add(entity, "red")
+
+    assert "".join(env.scoreboard.iter_serialize()) == JsonSerializer.dumps(env.scoreboard.serialize())
+    assert "".join(coins.iter_serialize()) == JsonSerializer.dumps(coins.serialize())
+    assert "".join(env.tag.iter_serialize()) == JsonSerializer.dumps(env.tag.serialize())
+    assert "".join(env.iter_serialize_entities(4, True)) == JsonSerializer.dumps(env.serialize_entities(), 4, True)
+
+    JsonSerializer.dump_stream(env.scoreboard.iter_serialize(), tmp_path / "a.json", buffer_size = 16)
+    JsonSerializer.dump(env.scoreboard.serialize(), tmp_path / "b.json")
+    assert (tmp_path / "a.json").read_bytes() == (tmp_path / "b.json").read_bytes()
+
+    JsonSerializer.dump_stream(StreamDict(env.serialize_entities().items()), tmp_path / "c.json")
+    assert JsonSerializer.load(tmp_path / "c.json") == env.serialize_entities()
@@ -0,0 +1,68 @@
+"""textcomps 各测试共用的rawtext数据, 以带参数的fixture提供"""
+import pytest
+
+VALID = [
+    {"rawtext": []},
+    {"rawtext": [{"text": "a"}, {}, {"score": {"name": "@p", "objective": "o"}}, {"selector": "@a[tag=x]"}]},
+    {"rawtext": [{"translate": "k", "with": ["a", "b"]}, {"translate": "k", "with": {"rawtext": [{"text": "x"}]}}, {"translate": "k"}]},
+    {"rawtext": [{"rawtext": [{"rawtext": [{"text": "deep"}]}]}, {"text": "a", "score": {"name": "@p", "objective": "o"}}]},
+    {"text": "single"},
+    {},
+]
+
+INVALID = [
+    "not a dict",
+    {"rawtext": {}},
+    {"rawtext": [], "extra": 1},
+    {"rawtext": [1]},
+    {"rawtext": [{"text": 1}]},
+    {"rawtext": [{"score": {"name": "@p"}}]},
+    {"rawtext": [{"score": "x"}]},
+    {"rawtext": [{"selector": "plain"}]},
+    {"rawtext": [{"selector": 1}]},
+    {"rawtext": [{"translate": 1}]},
+    {"rawtext": [{"translate": "k", "with": 1}]},
+    {"rawtext": [{"translate": "k", "with": [1]}]},
+    {"rawtext": [{"translate": "k", "with": {"rawtext": [{"text": 1}]}}]},
+    {"rawtext": [{"translate": "k", "with": [], "text": "x"}]},
+    {"rawtext": [{"text": "a", "bogus": 1}]},
+    {"rawtext": [{"bogus": 1}]},
+    {"rawtext": [{"rawtext": [{"text": None}]}]},
+    {"score": {"name": 1, "objective": 2}},
+]
+
+# 解码器与流式解析额外覆盖的边界情况
+EXTRA = [
+    {"rawtext": [{"text": 1}, 2]},
+    {"rawtext": [{"rawtext": [{"text": 1}, 2]}, {"text": "ok"}]},
+    {"rawtext": [{"text": "a", "rawtext": []}]},
+    {"rawtext": [{None: 1}]},
+    {"rawtext": [{None: 1, "text": "a"}]},
+    {"rawtext": [{"translate": "k", "with": {}}]},
+    {"rawtext": [{"translate": "k", "with": {"rawtext": [], "x": 1}}]},
+    {"rawtext": [{"translate": "k", "with": ["a"], "score": {}}]},
+    {"rawtext": [{"score": {"name": "@p", "objective": "o", "x": 1}}]},
+    {"rawtext": [{"score": {"objective": "o", "name": "@p"}}, {"selector": "@initiator"}]},
+    {"rawtext": [{"translate": "k", "with": {"rawtext": [{"translate": "j", "with": {"rawtext": [{"text": "x"}]}}]}}]},
+]
+
+
+@pytest.fixture(params = VALID)
+def valid(request) -> dict:
+    return request.param
+
+
+@pytest.fixture(params = INVALID)
+def invalid(request):
+    return request.param
+
+
+@pytest.fixture(params = VALID + INVALID + EXTRA)
+def rawtext_data(request):
+    return request.param
+
+
+# INVALID[0] 不是json对象, 无法作为流式解析的输入; 另加一个跨越多个读取块且带多余键的文本
+@pytest.fixture(params = VALID + EXTRA + INVALID[1:] + [{"rawtext": [{"text": "é" * 50}] * 20, "x": [1, {"y": 2}]}])
+def streamable(request) -> dict:
+    return request.param
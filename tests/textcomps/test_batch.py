@@ -0,0 +1,52 @@
+from miststar.textcomps.parser import BatchParser
+from miststar.internal.exceptions import UnsupportedArgument
+import json
+import pytest
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    for i in range(12):
+        data = {"rawtext": [{"text": f"file{i}"}, {"score": {"name": "@p", "objective": str(i)}}]}
+        (tmp_path / f"{i:02d}.json").write_text(json.dumps(data), encoding = "utf-8")
+    (tmp_path / "05.json").write_text("{", encoding = "utf-8")
+    (tmp_path / "07.json").write_text('{"rawtext": [{"text": 1}]}', encoding = "utf-8")
+    (tmp_path / "note.txt").write_text("x", encoding = "utf-8")
+    return tmp_path
+
+
+def flatten(results: dict) -> list:
+    return [(k, v if isinstance(v, str) else v.to_dictionary()) for k, v in results.items()]
+
+
+@pytest.mark.parametrize("executor, workers, chunksize", [("thread", 4, 1), ("thread", None, 3), ("process", 2, 1), ("process", 2, 5)])
+def test_parallel_same_as_sequential(corpus, executor, workers, chunksize) -> None:
+    expected = BatchParser.parse_directory(corpus)
+    assert list(expected) == sorted(str(p) for p in corpus.glob("*.json"))
+    assert expected[str(corpus / "05.json")].startswith("Error: Failed to parse file")
+    assert expected[str(corpus / "07.json")].startswith("Error: ")
+    assert flatten(BatchParser.parse_directory(corpus, executor = executor, workers = workers, chunksize = chunksize)) == flatten(expected)
+
+    paths = [corpus / "11.json", str(corpus / "missing.json"), corpus / "00.json"]
+    results = BatchParser.parse_files(paths, executor, workers, chunksize)
+    assert list(results) == [str(p) for p in paths]
+    assert results[str(corpus / "missing.json")].startswith("Error: ")
+    assert flatten(results) == flatten(BatchParser.parse_files(paths))
+
+
+def test_arguments(corpus) -> None:
+    with pytest.raises(UnsupportedArgument):
+        BatchParser.parse_files([], executor = "fiber")  # type: ignore[arg-type]
+    with pytest.raises(UnsupportedArgument):
+        BatchParser.parse_files([], executor = "thread", chunksize = 0)
+    with pytest.raises(FileNotFoundError):
+        BatchParser.parse_directory(corpus / "missing", executor = "thread")
+
+
+def test_pickle() -> None:
+    from miststar.textcomps import Parser
+    import pickle
+    data = {"rawtext": [{"text": "a"}, {"score": {"name": "@p", "objective": "o"}}, {"selector": "@s"},
+                        {"translate": "k", "with": ["x"]}, {"translate": "k", "with": {"rawtext": [{"text": "b"}]}}, {"translate": "k"}]}
+    rawtext = pickle.loads(pickle.dumps(Parser.parse_data(data)))
+    assert rawtext.to_dictionary() == data
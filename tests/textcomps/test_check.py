@@ -0,0 +1,42 @@
+from miststar.textcomps import Parser, Rawtext
+import json
+import pytest
+
+
+def outcome(data):
+    try:
+        Parser.parse_data(data)
+    except Exception as e:
+        return type(e), str(e)
+    return None
+
+
+def test_valid(valid: dict) -> None:
+    assert outcome(valid) is None
+    assert Parser.check_data(valid) == []
+
+
+def test_invalid(invalid) -> None:
+    # 只有一处错误时, 收集结果与parse_data抛出的异常一致
+    violations = Parser.check_data(invalid)
+    assert len(violations) >= 1
+    assert (violations[0].error, violations[0].message) == outcome(invalid)
+
+
+def test_collects_all(tmp_path) -> None:
+    sequence: list[dict] = [{"text": "ok"}] * 500
+    sequence[3] = {"text": 1}
+    sequence[412] = {"score": {"name": 2, "objective": "o"}}
+    sequence[499] = {"translate": "k", "with": {"rawtext": [{"selector": "x"}]}}
+    data = {"rawtext": sequence}
+    assert [v.path for v in Parser.check_data(data)] == [
+        "rawtext[3].text", "rawtext[412].score.name", "rawtext[499].with.rawtext[0].selector"
+    ]
+    path = tmp_path / "a.json"
+    path.write_text(json.dumps(data), encoding = "utf-8")
+    assert Parser.check_file(path) == Parser.check_data(data)
+    assert Parser.check_string(json.dumps(data)) == Parser.check_data(data)
+    assert Parser.check_string("{")[0].path == ""
+    with pytest.raises(FileNotFoundError):
+        Parser.check_file(tmp_path / "missing.json")
+    assert isinstance(Parser.parse_data({"rawtext": [{"text": "ok"}] * 3}), Rawtext)
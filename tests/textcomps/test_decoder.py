@@ -0,0 +1,62 @@
+from miststar.textcomps import decode, Rawtext, Text, Score, Selector, Translate
+from miststar.internal.exceptions import MalformedArgument
+import random
+import pytest
+
+def reference(data):
+    """Parser.parse_data 原先的实现"""
+    if not isinstance(data, dict):
+        raise MalformedArgument("Data must be a dictionary")
+    if "rawtext" not in data:
+        data = {"rawtext": [data]}
+    return Rawtext.from_dictionary(data)
+
+
+def outcome(function, data):
+    try:
+        result = function(data)
+    except Exception as e:
+        return type(e), str(e)
+    return [(type(i), i.to_dictionary()) for i in result.get_data()]
+
+
+def test_same_as_from_dictionary(rawtext_data) -> None:
+    assert outcome(decode, rawtext_data) == outcome(reference, rawtext_data)
+
+
+def mutate(rng: random.Random, depth: int = 0):
+    """随机生成(可能不合法的)rawtext元素"""
+    choice = rng.randrange(12 if depth < 3 else 9)
+    return [
+        lambda: {"text": rng.choice(["a", 1])},
+        lambda: {"score": rng.choice([{"name": "@p", "objective": "o"}, {"name": "@p"}, "x"])},
+        lambda: {"selector": rng.choice(["@a", "@s[tag=x]", "plain", 0])},
+        lambda: {"translate": rng.choice(["k", 1])},
+        lambda: {"translate": "k", "with": rng.choice([["a"], [1], 1])},
+        lambda: {"text": "a", "score": {"name": "@p", "objective": "o"}},
+        lambda: {"text": "a", "bogus": 1},
+        lambda: {},
+        lambda: rng.choice([1, "s", None, {"bogus": 1}]),
+        lambda: {"rawtext": [mutate(rng, depth + 1) for _ in range(rng.randrange(4))]},
+        lambda: {"translate": "k", "with": {"rawtext": [mutate(rng, depth + 1) for _ in range(rng.randrange(4))]}},
+        lambda: {"rawtext": [mutate(rng, depth + 1)], "x": rng.choice([1, None])},
+    ][choice]()
+
+
+def test_random() -> None:
+    rng = random.Random(0)
+    for _ in range(3000):
+        data = {"rawtext": [mutate(rng) for _ in range(rng.randrange(5))]}
+        assert outcome(decode, data) == outcome(reference, data), data
+        element = mutate(rng)
+        assert outcome(decode, element) == outcome(reference, element), element
+
+
+def test_components() -> None:
+    data = {"rawtext": [{"text": "a"}, {"score": {"name": "@p", "objective": "o"}}, {"selector": "@a"}, {"translate": "k", "with": ["x"]}]}
+    result = decode(data)
+    assert [type(i) for i in result.get_data()] == [Text, Score, Selector, Translate]
+    assert result.to_dictionary() == data
+    assert isinstance(last := result.add(Text("b")).get_data()[-1], Text) and last.content == "b"
+    with pytest.raises(MalformedArgument, match = "Data must be a dictionary"):
+        decode([])
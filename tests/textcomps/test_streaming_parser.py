@@ -0,0 +1,59 @@
+from miststar.textcomps import Parser, Rawtext, iter_rawtext_file
+from miststar.internal.exceptions import MalformedArgument
+import json
+import pytest
+
+
+def outcome(function, *args):
+    try:
+        result = function(*args)
+        components = result.get_data() if hasattr(result, "get_data") else list(result)
+    except Exception as e:
+        return type(e), str(e)
+    return [(type(i), i.to_dictionary()) for i in components]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 64, 1 << 16])
+@pytest.mark.parametrize("indent", [None, 2])
+def test_same_as_parse(streamable: dict, chunk_size: int, indent, tmp_path) -> None:
+    text = json.dumps(streamable, indent = indent, ensure_ascii = False)
+    expected = outcome(Parser.parse_string, text)
+    actual = outcome(Parser.iter_string, text, chunk_size)
+    if isinstance(expected, list):
+        assert actual == expected
+    else:
+        # 流式解析在出错前可能已产出组件, 但异常类型与信息相同
+        assert actual[0] is expected[0]
+        if not expected[1].startswith("Unexpected parameter(s)") and not expected[1] == "dictionary error":
+            assert actual == expected
+
+    path = tmp_path / "a.json"
+    path.write_text(text, encoding = "utf-8")
+    assert outcome(Parser.iter_file, path, chunk_size) == actual
+
+
+def test_incremental() -> None:
+    chunks = []
+    def read(size: int) -> str:
+        chunks.append(size)
+        return "" if len(chunks) > 3 else ['{"rawtext": [{"text": "a"}', ', {"text": "b"}', ']}'][len(chunks) - 1]
+    def fallback() -> Rawtext:
+        raise AssertionError("fallback should not be used")
+    from miststar.textcomps.stream import iter_components
+    iterator = iter_components(read, fallback = fallback, chunk_size = 4)
+    assert next(iterator).to_dictionary() == {"text": "a"}
+    assert len(chunks) == 2
+    assert [i.to_dictionary() for i in iterator] == [{"text": "b"}]
+
+
+def test_errors(tmp_path) -> None:
+    with pytest.raises(MalformedArgument, match = "char 27"):
+        list(Parser.iter_string('{"rawtext": [{"text": "a"} {"text": "b"}]}', 4))
+    with pytest.raises(MalformedArgument, match = "Extra data"):
+        list(Parser.iter_string('{"rawtext": []} []'))
+    with pytest.raises(MalformedArgument, match = "Duplicate"):
+        list(Parser.iter_string('{"rawtext": [], "rawtext": []}'))
+    with pytest.raises(MalformedArgument):
+        list(Parser.iter_string('{"rawtext": [{"text": "a"'))
+    with pytest.raises(FileNotFoundError):
+        list(iter_rawtext_file(tmp_path / "missing.json"))